@@ -47,6 +47,9 @@ class AdventureGame {
         this.puzzles = [];
         this.episodeCorrelations = {};
 
+        // Rendered section HTML by fragment URL (shared by panel and timewarp)
+        this.sectionHtmlCache = new Map();
+
         // Quest state
         this.pendingQuest = null;  // Quest currently being offered
 
@@ -78,12 +81,17 @@ class AdventureGame {
         this.terminal.print('Loading C++ Standard Adventure...');
 
         try {
-            // Load world data
+            // Load world manifest (realms load as the player reaches them)
             await this.world.load();
 
             // Initialize ISHML parser with world data
             this.parser.init(this.world.worldData);
 
+            // Register every section name with the parser once the directory arrives (non-blocking)
+            this.world.loadDirectory()
+                .then(directory => this.parser.registerSections(directory))
+                .catch(error => console.warn('Section directory not available:', error.message));
+
             // Load additional game data
             await Promise.all([
                 this.loadNPCs(),
@@ -99,8 +107,8 @@ class AdventureGame {
             // Apply animation speed setting from saved preferences
             this.updateAnimationClass();
 
-            // Validate player location exists
-            if (!this.world.getSection(this.player.currentLocation)) {
+            // Validate player location exists (loading its realm)
+            if (!(await this.world.ensureSection(this.player.currentLocation))) {
                 this.player.state.currentLocation = 'intro';
                 this.player.save();
             }
@@ -131,7 +139,7 @@ class AdventureGame {
                 this.cmdTimeshift([eraParam]);
             }
 
-            if (sectionParam && this.world.getSection(sectionParam)) {
+            if (sectionParam && (await this.world.ensureSection(sectionParam))) {
                 this.terminal.print(`> goto ${sectionParam}`);
                 this.cmdGoto([sectionParam]);
             } else {
@@ -259,6 +267,8 @@ class AdventureGame {
             'map': () => this.cmdMap(),
             'where': () => this.cmdWhere(),
             'whereami': () => this.cmdWhere(),
+            'route': (args) => this.cmdRoute(args),
+            'directions': (args) => this.cmdRoute(args),
 
             // Time travel
             'timeshift': (args) => this.cmdTimeshift(args),
@@ -345,7 +355,7 @@ class AdventureGame {
             await this.commands[verb](args);
         } else {
             // Fallback: maybe it's a section name for goto
-            if (this.world.getSection(input.trim())) {
+            if (await this.world.ensureSection(input.trim())) {
                 await this.cmdGoto([input.trim()]);
             } else {
                 this.terminal.print(`Unknown command: ${verb}`);
@@ -456,7 +466,13 @@ class AdventureGame {
      * @param {boolean} scrollToTop - Whether to scroll content panel to top (default true)
      */
     async showLocation(scrollToTop = true) {
-        const section = this.world.getSection(this.player.currentLocation);
+        let section;
+        try {
+            section = await this.world.ensureSection(this.player.currentLocation);
+        } catch (error) {
+            this.terminal.print(`Error loading location: ${error.message}`);
+            return;
+        }
         if (!section) {
             this.terminal.print('Error: Location not found.');
             return;
@@ -632,23 +648,14 @@ class AdventureGame {
             titleEl.textContent = `${section.displayName} [${section.stableName}]`;
         }
 
-        // Fetch markdown content
-        const chapter = section.chapter;
-        const era = this.player.currentEra;
-        const url = `/${era}/${chapter}.md`;
-
         try {
-            const response = await fetch(url);
-            if (!response.ok) {
+            const html = await this.fetchSectionHtml(section, this.player.currentEra);
+            if (html === null) {
                 this.contentPanel.innerHTML = '<p>Content not available in this era.</p>';
                 return;
             }
 
-            const markdown = await response.text();
-            const sectionContent = this.extractSectionContent(markdown, section.stableName);
-
-            // Render markdown
-            this.contentPanel.innerHTML = this.renderMarkdown(sectionContent || 'Section content not found.');
+            this.contentPanel.innerHTML = html;
 
             // Apply syntax highlighting to code blocks
             if (typeof Prism !== 'undefined') {
@@ -667,6 +674,60 @@ class AdventureGame {
         }
     }
 
+    /**
+     * Wait for the section directory used by search, goto and warp
+     *
+     * If it can't be loaded, lookups fall back to the realms loaded so far.
+     */
+    async loadSectionDirectory() {
+        try {
+            await this.world.loadDirectory();
+        } catch (error) {
+            console.warn('Section directory not available:', error.message);
+        }
+    }
+
+    /**
+     * Fetch a section's rendered HTML for an era
+     *
+     * Uses the section's prerendered fragment (a few KB, shared across eras
+     * where the text is unchanged). Every era with the section gets one, so a
+     * missing fragment means the section is absent there. Only data built
+     * without fragments falls back to fetching the whole chapter markdown.
+     * @returns {Promise<string|null>} HTML, or null if not available in the era
+     */
+    async fetchSectionHtml(section, era) {
+        const hash = section.fragments?.[era];
+        if (!hash && this.world.hasFragments) return null;
+
+        const format = this.world.fragmentFormat;
+        const url = hash
+            ? `/data/game/sections/${hash}.${format}`
+            : `/${era}/${section.chapter}.md`;
+        const key = hash ? url : `${url}#${section.stableName}`;
+
+        if (this.sectionHtmlCache.has(key)) {
+            return this.sectionHtmlCache.get(key);
+        }
+
+        const response = await fetch(url);
+        if (!response.ok) return null;
+
+        const text = await response.text();
+        let html;
+        if (hash && format === 'html') {
+            html = text;
+        } else if (hash) {
+            html = this.renderMarkdown(text);
+        } else {
+            const sectionContent = this.extractSectionContent(text, section.stableName);
+            html = this.renderMarkdown(sectionContent || 'Section content not found.');
+        }
+
+        this.sectionHtmlCache.set(key, html);
+        return html;
+    }
+
     /**
      * Extract section content from markdown
      */
@@ -927,7 +988,7 @@ class AdventureGame {
         }
     }
 
-    cmdWarp(args) {
+    async cmdWarp(args) {
         if (args.length === 0) {
             this.terminal.print('Warp where? Usage: warp <location>');
             this.terminal.print(`You have visited ${this.player.state.sectionsVisited.length} locations.`);
@@ -935,6 +996,7 @@ class AdventureGame {
         }
 
         const target = args.join(' ');
+        await this.loadSectionDirectory();
         const result = this.world.warp(
             target,
             this.player.currentEra,
@@ -950,7 +1012,7 @@ class AdventureGame {
         }
     }
 
-    cmdGoto(args) {
+    async cmdGoto(args) {
         if (args.length === 0) {
             this.terminal.print('Goto where? Usage: goto <stable.name>');
             this.terminal.print('Example: goto class.copy, goto expr.prim.lambda');
@@ -961,14 +1023,15 @@ class AdventureGame {
         let target = args.join('.');
         // Strip brackets if present (e.g., "[class.copy]" -> "class.copy")
         target = target.replace(/^\[+|\]+$/g, '');
-        const section = this.world.getSection(target);
+        const section = await this.world.ensureSection(target);
 
         if (!section) {
             // Try partial match
-            const allSections = Object.keys(this.world.sections);
+            await this.loadSectionDirectory();
+            const allSections = this.world.getSectionNames();
             const matches = allSections.filter(s =>
                 s.includes(target) ||
-                this.world.sections[s].displayName.toLowerCase().includes(target.toLowerCase())
+                this.world.getSection(s).displayName.toLowerCase().includes(target.toLowerCase())
             );
 
             if (matches.length === 0) {
@@ -1013,7 +1076,7 @@ class AdventureGame {
         this.checkQuestProgress({ section: target });
     }
 
-    cmdSearch(args) {
+    async cmdSearch(args) {
         if (args.length === 0) {
             this.terminal.print('Search for what? Usage: search <term>');
             return;
@@ -1021,11 +1084,12 @@ class AdventureGame {
 
         const term = args.join(' ');
         const termLower = term.toLowerCase();
-        const allSections = Object.keys(this.world.sections);
+        await Promise.all([this.loadSectionDirectory(), this.world.loadLibraryIndex()]);
+        const allSections = this.world.getSectionNames();
 
         // Search in stable names and titles
         const sectionMatches = allSections.filter(s => {
-            const section = this.world.sections[s];
+            const section = this.world.getSection(s);
             return s.toLowerCase().includes(termLower) ||
                    section.title?.toLowerCase().includes(termLower) ||
                    section.displayName?.toLowerCase().includes(termLower);
@@ -1105,6 +1169,61 @@ class AdventureGame {
         });
     }
 
+    async cmdRoute(args) {
+        if (args.length === 0) {
+            this.terminal.print('Route to where? Usage: route <stable.name or realm>');
+            return;
+        }
+
+        // Destination realm: a realm key, or the realm of a section
+        const target = args.join('.').replace(/^\[+|\]+$/g, '');
+        let targetRealm = this.world.getRealm(target) ? target : null;
+        if (!targetRealm) {
+            await this.loadSectionDirectory();
+            targetRealm = this.world.getSection(target)?.realm || null;
+        }
+        if (!targetRealm) {
+            this.terminal.print(`Section "${target}" not found.`);
+            return;
+        }
+
+        const section = await this.world.ensureSection(this.player.currentLocation);
+        try {
+            await this.world.loadRoutes();
+        } catch (error) {
+            this.terminal.print('Routes are not available.');
+            return;
+        }
+
+        const realmName = key => this.world.getRealm(key)?.name || key;
+        const route = this.world.realmRoute(section.realm, targetRealm);
+        if (!route) {
+            this.terminal.print(`No known route to ${realmName(targetRealm)}.`);
+            return;
+        }
+        if (route.length === 1) {
+            this.terminal.print(`You are already in ${realmName(targetRealm)}.`);
+            return;
+        }
+
+        this.terminal.print('');
+        this.terminal.print(`Route to ${realmName(targetRealm)} (${route.length - 1} realms away):`);
+        this.terminal.print(`  ${route.map(realmName).join(' → ')}`);
+
+        // First step, from what is known about the current realm
+        const nextRealm = route[1];
+        const move = this.world.moveToward(section.stableName, nextRealm);
+        if (move) {
+            this.terminal.print(`From here: ${move}`);
+        } else {
+            const gateway = this.world.findGateway(section.realm, nextRealm);
+            if (gateway) {
+                const gatewaySection = this.world.getSection(gateway);
+                this.terminal.print(`Head for [[${gateway}]] - ${gatewaySection?.displayName || gateway}, then ${this.world.moveToward(gateway, nextRealm)}.`);
+            }
+        }
+    }
+
     cmdWhere() {
         const section = this.world.getSection(this.player.currentLocation);
         if (!section) {
@@ -1342,17 +1461,8 @@ class AdventureGame {
     async getRenderedSectionHtml(section, era) {
         if (!section) return null;
 
-        const chapter = section.chapter;
-        const url = `/${era}/${chapter}.md`;
-
         try {
-            const response = await fetch(url);
-            if (!response.ok) return null;
-
-            const markdown = await response.text();
-            const sectionContent = this.extractSectionContent(markdown, section.stableName);
-
-            return this.renderMarkdown(sectionContent || 'Section content not found.');
+            return await this.fetchSectionHtml(section, era);
         } catch (error) {
             return null;
         }
@@ -1691,6 +1801,7 @@ NAVIGATION
   warp <location>    - Fast travel to visited location
   map                - Show current realm overview
   where              - Show location in hierarchy
+  route <name>       - Show the way to a section or realm
 
 TIME TRAVEL
   timeshift <era>    - Travel to era (cpp11/14/17/20/23/26)
@@ -2,7 +2,8 @@
  * parser.js - ISHML-based natural language parser for C++ Standard Adventure
  *
  * Uses the ISHML library (https://github.com/bikibird/ishml) to parse player commands.
- * Builds a custom lexicon from world-map.json section names and game vocabulary.
+ * Builds a custom lexicon from game vocabulary and section names, which are
+ * registered as the world's section directory loads.
  */
 
 class AdventureParser {
@@ -15,7 +16,7 @@ class AdventureParser {
 
     /**
      * Initialize the parser with world data
-     * @param {Object} worldData - world-map.json data with sections
+     * @param {Object} worldData - World manifest, optionally with sections
      */
     init(worldData) {
         if (typeof ishml === 'undefined') {
@@ -57,6 +58,10 @@ class AdventureParser {
             .register('warp')
             .as({ key: 'warp', type: 'verb', category: 'navigation' });
 
+        this.lexicon
+            .register('route', 'directions')
+            .as({ key: 'route', type: 'verb', category: 'navigation' });
+
         this.lexicon
             .register('look', 'l', 'view')
             .as({ key: 'look', type: 'verb', category: 'observation' });
@@ -175,28 +180,39 @@ class AdventureParser {
 
         // Register section names from world data
         if (worldData && worldData.sections) {
-            for (const [stableName, section] of Object.entries(worldData.sections)) {
-                this.sectionNames.add(stableName);
-
-                // Register the stable name as a section
-                this.lexicon.register(stableName).as({
-                    key: stableName,
-                    type: 'section',
-                    displayName: section.displayName || stableName,
-                    chapter: section.chapter
-                });
-
-                // Also register display name if different
-                if (section.displayName && section.displayName !== stableName) {
-                    const normalizedDisplay = section.displayName.toLowerCase().replace(/[^a-z0-9]/g, '');
-                    if (normalizedDisplay.length > 2) {
-                        this.lexicon.register(normalizedDisplay).as({
-                            key: stableName,
-                            type: 'section',
-                            displayName: section.displayName,
-                            chapter: section.chapter
-                        });
-                    }
+            this.registerSections(worldData.sections);
+        }
+    }
+
+    /**
+     * Add sections to the lexicon (stable names and display names)
+     * @param {Object} sections - Map of stable names to sections or section stubs
+     */
+    registerSections(sections) {
+        if (!this.lexicon) return;
+
+        for (const [stableName, section] of Object.entries(sections)) {
+            if (this.sectionNames.has(stableName)) continue;
+            this.sectionNames.add(stableName);
+
+            // Register the stable name as a section
+            this.lexicon.register(stableName).as({
+                key: stableName,
+                type: 'section',
+                displayName: section.displayName || stableName,
+                chapter: section.chapter
+            });
+
+            // Also register display name if different
+            if (section.displayName && section.displayName !== stableName) {
+                const normalizedDisplay = section.displayName.toLowerCase().replace(/[^a-z0-9]/g, '');
+                if (normalizedDisplay.length > 2) {
+                    this.lexicon.register(normalizedDisplay).as({
+                        key: stableName,
+                        type: 'section',
+                        displayName: section.displayName,
+                        chapter: section.chapter
+                    });
                 }
             }
         }
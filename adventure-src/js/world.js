@@ -2,7 +2,7 @@
  * world.js - World map and navigation for the C++ Standard Adventure Game
  *
  * Handles:
- * - Loading and storing world map data
+ * - Loading the world manifest, and realm shards as the player reaches them
  * - Section lookups and navigation
  * - Era availability checks
  * - Realm information
@@ -11,62 +11,303 @@
 class World {
     constructor() {
         this.worldMap = null;
-        this.sections = {};
+        this.sections = {};           // Full sections of loaded realms
+        this.stubs = {};              // Names, titles and eras of sections elsewhere
         this.realms = {};
         this.eras = {};
         this.stableNameAliases = {};  // Maps stable names to their aliases
         this.libraryIndex = {};       // Maps library entities to sections
         this.loaded = false;
+
+        // In-flight or finished loads, so each file is fetched once
+        this.realmLoads = new Map();
+        this.directoryLoad = null;
+        this.libraryIndexLoad = null;
+        this.routesLoad = null;
+        this.routes = null;
     }
 
     /**
      * Get the raw world data (for parser initialization)
-     * @returns {object} World map data with sections
+     * @returns {object} World manifest (sections are registered as they load)
      */
     get worldData() {
         return this.worldMap;
     }
 
     /**
-     * Load world map data from JSON file
+     * Load the world manifest (realms, eras, entry points)
+     *
+     * Realm sections are loaded by loadRealm() when first needed and the
+     * section directory by loadDirectory(), so startup only waits for this.
      * @returns {Promise<void>}
      */
     async load() {
         try {
-            const response = await fetch('/data/game/world-map.json');
+            const response = await fetch('/data/game/world/index.json');
             if (!response.ok) {
                 throw new Error(`Failed to load world map: ${response.status}`);
             }
-            this.worldMap = await response.json();
-            this.sections = this.worldMap.sections || {};
+            this.worldMap = World.decode(await response.json());
             this.realms = this.worldMap.realms || {};
             this.eras = this.worldMap.eras || {};
-            this.stableNameAliases = this.worldMap.stableNameAliases || {};
             this.cppstdmdSha = this.worldMap.cppstdmdSha || '';
+            // Data built before fragments existed has no fragmentFormat
+            this.hasFragments = Boolean(this.worldMap.fragmentFormat);
+            this.fragmentFormat = this.worldMap.fragmentFormat || 'md';
             this.loaded = true;
-
-            // Load library index (non-blocking)
-            this.loadLibraryIndex();
         } catch (error) {
             console.error('Failed to load world map:', error);
             throw error;
         }
     }
 
+    /**
+     * Decode a world file written with the compact encoding
+     *
+     * Compact files replace stable names with indexes into a string table,
+     * store section maps as lists and omit empty fields; this restores the
+     * plain shape, so the rest of the game sees the same objects either way.
+     * @param {object} data - Parsed world file (plain files are returned as-is)
+     * @returns {object}
+     */
+    static decode(data) {
+        if (!data || data.encoding !== 'compact-1') {
+            return data;
+        }
+
+        const strings = data.strings;
+        const sectionDefaults = {
+            parent: null,
+            children: [],
+            connections: {},
+            availableIn: [],
+            npcs: [],
+            items: [],
+            puzzles: [],
+        };
+        const stubDefaults = { parent: null, availableIn: [] };
+        const decodeSection = (encoded, defaults) => {
+            const section = { ...defaults, ...encoded };
+            for (const field of ['stableName', 'parent', 'realm']) {
+                if (typeof encoded[field] === 'number') {
+                    section[field] = strings[encoded[field]];
+                }
+            }
+            if (section.children) {
+                section.children = section.children.map(id => strings[id]);
+            }
+            if (section.connections) {
+                section.connections = Object.fromEntries(
+                    Object.entries(section.connections).map(([direction, id]) => [direction, strings[id]])
+                );
+            }
+            return section;
+        };
+
+        const decoded = {};
+        for (const [key, value] of Object.entries(data)) {
+            if (key === 'encoding' || key === 'strings') continue;
+            if (key === 'sections' || key === 'neighbors' || key === 'stubs') {
+                const defaults = key === 'sections' ? sectionDefaults : stubDefaults;
+                decoded[key] = {};
+                for (const encoded of value) {
+                    const section = decodeSection(encoded, defaults);
+                    decoded[key][section.stableName] = section;
+                }
+            } else if (key === 'aliases') {
+                decoded[key] = Object.fromEntries(
+                    value.map(([name, aliases]) => [strings[name], aliases.map(id => strings[id])])
+                );
+            } else {
+                decoded[key] = value;
+            }
+        }
+        return decoded;
+    }
+
+    /**
+     * Realm key for a stable name (its first component)
+     * @param {string} stableName - The section's stable name
+     * @returns {string}
+     */
+    realmKeyFor(stableName) {
+        return stableName.split('.')[0];
+    }
+
+    /**
+     * Load a realm's shard: its sections, their aliases and neighbour stubs
+     * @param {string} realmKey - The realm key
+     * @returns {Promise<boolean>} Whether the realm is loaded
+     */
+    loadRealm(realmKey) {
+        if (!this.realms[realmKey]) {
+            return Promise.resolve(false);
+        }
+        if (!this.realmLoads.has(realmKey)) {
+            const load = (async () => {
+                const response = await fetch(`/data/game/world/realms/${encodeURIComponent(realmKey)}.json`);
+                if (!response.ok) {
+                    throw new Error(`Failed to load realm ${realmKey}: ${response.status}`);
+                }
+                const shard = World.decode(await response.json());
+                Object.assign(this.sections, shard.sections || {});
+                Object.assign(this.stableNameAliases, shard.aliases || {});
+                for (const [name, stub] of Object.entries(shard.neighbors || {})) {
+                    this.stubs[name] = this.stubs[name] || stub;
+                }
+                this.realms[realmKey].sections = Object.keys(shard.sections || {});
+                return true;
+            })();
+            // Let a failed load be retried
+            load.catch(() => this.realmLoads.delete(realmKey));
+            this.realmLoads.set(realmKey, load);
+        }
+        return this.realmLoads.get(realmKey);
+    }
+
+    /**
+     * Load the realm containing a section and return the section
+     * @param {string} stableName - The section's stable name
+     * @returns {Promise<object|null>} Full section data or null if not found
+     */
+    async ensureSection(stableName) {
+        if (!this.sections[stableName]) {
+            await this.loadRealm(this.realmKeyFor(stableName));
+        }
+        return this.sections[stableName] || null;
+    }
+
+    /**
+     * Load the directory of every section (for search, goto and the parser)
+     * @returns {Promise<object>} Map of stable names to section stubs
+     */
+    loadDirectory() {
+        if (!this.directoryLoad) {
+            this.directoryLoad = (async () => {
+                const response = await fetch('/data/game/world/sections.json');
+                if (!response.ok) {
+                    throw new Error(`Failed to load section directory: ${response.status}`);
+                }
+                const directory = World.decode(await response.json()).stubs || {};
+                Object.assign(this.stubs, directory);
+                return directory;
+            })();
+            this.directoryLoad.catch(() => { this.directoryLoad = null; });
+        }
+        return this.directoryLoad;
+    }
+
+    /**
+     * Get all known stable names (complete once loadDirectory() resolves)
+     * @returns {string[]}
+     */
+    getSectionNames() {
+        return Object.keys({ ...this.stubs, ...this.sections });
+    }
+
+    /**
+     * Load the navigation index (next realm on a shortest path between realms)
+     * @returns {Promise<void>}
+     */
+    loadRoutes() {
+        if (!this.routesLoad) {
+            this.routesLoad = (async () => {
+                const response = await fetch('/data/game/world/routes.json');
+                if (!response.ok) {
+                    throw new Error(`Failed to load routes: ${response.status}`);
+                }
+                const data = World.decode(await response.json());
+                // Rows are run-length encoded as [realm index, count, ...]
+                const next = data.next.map(row => {
+                    const hops = [];
+                    for (let i = 0; i < row.length; i += 2) {
+                        for (let n = 0; n < row[i + 1]; n++) hops.push(row[i]);
+                    }
+                    return hops;
+                });
+                this.routes = {
+                    realms: data.realms,
+                    positions: new Map(data.realms.map((key, i) => [key, i])),
+                    next,
+                };
+            })();
+            this.routesLoad.catch(() => { this.routesLoad = null; });
+        }
+        return this.routesLoad;
+    }
+
+    /**
+     * Realms passed through on a shortest route (requires loadRoutes())
+     * @param {string} fromRealm - Starting realm key
+     * @param {string} toRealm - Destination realm key
+     * @returns {string[]|null} Realm keys from start to destination, or null if unreachable
+     */
+    realmRoute(fromRealm, toRealm) {
+        const { realms, positions, next } = this.routes;
+        const target = positions.get(toRealm);
+        let current = positions.get(fromRealm);
+        if (current === undefined || target === undefined) return null;
+
+        const route = [realms[current]];
+        while (current !== target) {
+            current = next[current][target];
+            if (current === -1) return null;
+            route.push(realms[current]);
+        }
+        return route;
+    }
+
+    /**
+     * The command that moves from a section straight into a realm, if any
+     * @param {string} stableName - The section's stable name
+     * @param {string} realmKey - Realm to move into
+     * @returns {string|null} e.g. "go east", "exit", "enter Range access"
+     */
+    moveToward(stableName, realmKey) {
+        const section = this.getSection(stableName);
+        if (!section) return null;
+
+        const inRealm = name => this.getSection(name)?.realm === realmKey;
+        for (const [direction, target] of Object.entries(section.connections || {})) {
+            if (target && inRealm(target)) return `go ${direction}`;
+        }
+        if (section.parent && inRealm(section.parent)) return 'exit';
+        const child = (section.children || []).find(inRealm);
+        if (child) return `enter ${this.getSection(child)?.displayName || child}`;
+        return null;
+    }
+
+    /**
+     * A section of a loaded realm with a move into another realm
+     * @param {string} realmKey - Loaded realm to search
+     * @param {string} nextRealm - Realm to move into
+     * @returns {string|null} Stable name of the section, or null
+     */
+    findGateway(realmKey, nextRealm) {
+        const sections = this.getSectionsInRealm(realmKey);
+        return sections.find(name => this.moveToward(name, nextRealm)) || null;
+    }
+
     /**
      * Load library entity index for search functionality
      * @returns {Promise<void>}
      */
-    async loadLibraryIndex() {
-        try {
-            const response = await fetch('/data/game/library-index.json');
-            if (response.ok) {
-                this.libraryIndex = await response.json();
-            }
-        } catch (error) {
-            console.warn('Library index not available:', error.message);
-            // Not fatal - search will just not include library entities
+    loadLibraryIndex() {
+        if (!this.libraryIndexLoad) {
+            this.libraryIndexLoad = (async () => {
+                try {
+                    const response = await fetch('/data/game/library-index.json');
+                    if (response.ok) {
+                        this.libraryIndex = await response.json();
+                    }
+                } catch (error) {
+                    console.warn('Library index not available:', error.message);
+                    // Not fatal - search will just not include library entities
+                }
+            })();
         }
+        return this.libraryIndexLoad;
     }
 
     /**
@@ -100,11 +341,14 @@ class World {
 
     /**
      * Get a section by stable name
+     *
+     * Sections of unloaded realms are stubs (names, realm, chapter and eras);
+     * use ensureSection() when connections, children or content are needed.
      * @param {string} stableName - The section's stable name
      * @returns {object|null} Section data or null if not found
      */
     getSection(stableName) {
-        return this.sections[stableName] || null;
+        return this.sections[stableName] || this.stubs[stableName] || null;
     }
 
     /**
@@ -334,7 +578,7 @@ class World {
         const targetLower = targetName.toLowerCase();
 
         // Exact match first
-        if (this.sections[targetName]) {
+        if (this.getSection(targetName)) {
             if (!visitedSections.has(targetName)) {
                 return { success: false, message: `You haven't discovered ${targetName} yet.` };
             }
@@ -30,8 +30,25 @@ from adventure_content_validator import validate_content
 # Add src to path so we can import from cpp_std_converter
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from cpp_std_converter.utils import iter_section_headings
 from cpp_std_converter.library_indexer import LibraryIndexer
+from cpp_std_converter.markdown_scanner import VersionIndex, scan_markdown_file, scan_version_dir
+from cpp_std_converter.precompress import available_formats, invalidate_stale, precompress_tree
+from cpp_std_converter.section_fragments import fragment_format, write_section_fragments
+from cpp_std_converter.world_shards import (
+    COMPACT_ENCODING,
+    WORLD_DIR,
+    json_text,
+    write_world_shards,
+)
+
+# Written last by generate_adventure_data(): its mtime marks a complete run and
+# it records the JSON encoding, since world files are only rewritten when changed
+BUILD_STAMP_FILENAME = ".build-stamp.json"
+
+
+def data_encoding(compact: bool) -> str:
+    """Encoding name recorded in the build stamp for a --compact setting."""
+    return COMPACT_ENCODING if compact else "json"
 
 
 def get_cppstdmd_sha() -> dict[str, str]:
@@ -141,30 +158,22 @@ def extract_sections_from_markdown(
 ) -> dict[str, dict[str, Any]]:
     """Extract all sections with metadata from markdown files.
 
-    Uses the centralized iter_section_headings() from utils.py to correctly
-    handle titles containing < characters (like `<initializer_list>`).
+    Uses the shared chapter scan from markdown_scanner.py, which recognizes
+    headings with the centralized pattern from utils.py (so titles containing
+    < characters like `<initializer_list>` are handled correctly).
     """
     sections: dict[str, dict[str, Any]] = {}
 
     for md_file in sorted(md_dir.glob("*.md")):
         chapter = md_file.stem
-        content = md_file.read_text(encoding="utf-8")
+        scan = scan_markdown_file(md_file)
 
-        # Use centralized heading parser from utils.py
-        headings = list(iter_section_headings(content))
-
-        for i, heading in enumerate(headings):
-            # Extract section content (up to next section)
-            section_start = heading.match_end
-            if i + 1 < len(headings):
-                section_end = headings[i + 1].match_start
-            else:
-                section_end = len(content)
-
-            section_content = content[section_start:section_end]
+        for i, heading in enumerate(scan.headings):
+            # Section content runs up to the next heading of any level
+            section_content = scan.heading_body(i)
 
             # Find cross-references in content
-            cross_refs = list(set(re.findall(r"\[\[([^\]]+)\]\]", section_content)))
+            cross_refs = list(set(scan.heading_wikilinks(i)))
 
             # Use LabelIndexer mapping if available, fallback to current file
             actual_chapter = chapter
@@ -259,6 +268,17 @@ def generate_connections(
             if chapter not in chapter_roots:
                 chapter_roots[chapter] = name
 
+    # Position of each section in its parent's children list
+    sibling_positions: dict[str, int] = {}
+    for data in sections.values():
+        for position, child in enumerate(data.get("children", [])):
+            sibling_positions.setdefault(child, position)
+
+    # Position of each chapter in std.tex order (first occurrence wins)
+    chapter_positions: dict[str, int] = {}
+    for chapter_idx, chapter in enumerate(chapter_order or []):
+        chapter_positions.setdefault(chapter, chapter_idx)
+
     # Generate connections for each section
     for name, data in sections.items():
         parent = data.get("parent")
@@ -272,10 +292,7 @@ def generate_connections(
             siblings = []
 
         # Find position among siblings
-        try:
-            idx = siblings.index(name)
-        except ValueError:
-            idx = -1
+        idx = sibling_positions.get(name, -1) if siblings else -1
 
         # North/South: sibling navigation (null at chapter root level)
         north = siblings[idx - 1] if idx > 0 else None
@@ -284,19 +301,16 @@ def generate_connections(
         # East/West: chapter navigation
         east = None
         west = None
-        if chapter_order:
-            try:
-                chapter_idx = chapter_order.index(chapter)
-                # West = previous chapter's root section
-                if chapter_idx > 0:
-                    prev_chapter = chapter_order[chapter_idx - 1]
-                    west = chapter_roots.get(prev_chapter)
-                # East = next chapter's root section
-                if chapter_idx < len(chapter_order) - 1:
-                    next_chapter = chapter_order[chapter_idx + 1]
-                    east = chapter_roots.get(next_chapter)
-            except ValueError:
-                pass  # Chapter not in order list
+        chapter_idx = chapter_positions.get(chapter)
+        if chapter_idx is not None:
+            # West = previous chapter's root section
+            if chapter_idx > 0:
+                prev_chapter = chapter_order[chapter_idx - 1]
+                west = chapter_roots.get(prev_chapter)
+            # East = next chapter's root section
+            if chapter_idx < len(chapter_order) - 1:
+                next_chapter = chapter_order[chapter_idx + 1]
+                east = chapter_roots.get(next_chapter)
 
         data["connections"] = {
             "north": north,
@@ -437,19 +451,9 @@ def generate_display_name(title: str, stable_name: str) -> str:
     return title
 
 
-def detect_era_availability(stable_name: str, version_dirs: list[Path]) -> list[str]:
-    """Detect which C++ versions contain this section."""
-    available = []
-    for version_dir in version_dirs:
-        if not version_dir.exists():
-            continue
-        # Check if any markdown file in this version contains the stable name
-        for md_file in version_dir.glob("*.md"):
-            content = md_file.read_text(encoding="utf-8")
-            if f'id="{stable_name}"' in content:
-                available.append(version_dir.name)
-                break
-    return available
+def detect_era_availability(stable_name: str, version_indexes: list[VersionIndex]) -> list[str]:
+    """Detect which C++ versions contain this section (from scan_version_dir() indexes)."""
+    return [index.name for index in version_indexes if stable_name in index.anchors]
 
 
 def generate_world_map(
@@ -475,6 +479,11 @@ def generate_world_map(
 
     sections = generate_connections(sections, chapter_order)
 
+    # One anchor set per version, so era availability is a set lookup per section
+    version_indexes = [
+        index for index in (scan_version_dir(d) for d in all_version_dirs) if index is not None
+    ]
+
     world_map: dict[str, Any] = {
         "version": "1.0.0",
         "primaryEra": primary_version_dir.name,
@@ -509,7 +518,7 @@ def generate_world_map(
             "parent": data.get("parent"),
             "children": data.get("children", []),
             "connections": data.get("connections", {}),
-            "availableIn": detect_era_availability(stable_name, all_version_dirs),
+            "availableIn": detect_era_availability(stable_name, version_indexes),
             "description": f"Section covering {data['title'].lower()}.",
             "npcs": [],
             "items": [],
@@ -604,6 +613,16 @@ def merge_content(world_map: dict[str, Any], yaml_content: dict[str, Any]) -> di
         if realm_key in world_map["realms"]:
             world_map["realms"][realm_key].update(realm_data)
 
+    sections = world_map["sections"]
+    # Ids already listed per (section, field), so duplicates are set lookups
+    placed: dict[tuple[str, str], set[str]] = {}
+
+    def place(location: str, field: str, content_id: str) -> None:
+        listed = placed.setdefault((location, field), set(sections[location][field]))
+        if content_id not in listed:
+            listed.add(content_id)
+            sections[location][field].append(content_id)
+
     # Add NPCs to their locations
     for npc in yaml_content.get("npcs", []):
         npc_id = npc.get("id")
@@ -612,25 +631,20 @@ def merge_content(world_map: dict[str, Any], yaml_content: dict[str, Any]) -> di
             if loc == "*":
                 # NPC appears everywhere - handled by game client
                 continue
-            if loc in world_map["sections"]:
-                if npc_id not in world_map["sections"][loc]["npcs"]:
-                    world_map["sections"][loc]["npcs"].append(npc_id)
+            if loc in sections:
+                place(loc, "npcs", npc_id)
 
     # Add items to their source sections
     for item in yaml_content.get("items", []):
         source = item.get("sourceSection")
-        if source and source in world_map["sections"]:
-            item_id = item.get("id")
-            if item_id not in world_map["sections"][source]["items"]:
-                world_map["sections"][source]["items"].append(item_id)
+        if source and source in sections:
+            place(source, "items", item.get("id"))
 
     # Add puzzles to their locations
     for puzzle in yaml_content.get("puzzles", []):
         location = puzzle.get("location")
-        if location and location in world_map["sections"]:
-            puzzle_id = puzzle.get("id")
-            if puzzle_id not in world_map["sections"][location]["puzzles"]:
-                world_map["sections"][location]["puzzles"].append(puzzle_id)
+        if location and location in sections:
+            place(location, "puzzles", puzzle.get("id"))
 
     return world_map
 
@@ -784,8 +798,16 @@ def generate_adventure_data(
     primary_version: str = "n4950",
     versions: list[str] | None = None,
     game_content_dir: Path | None = None,
+    precompress: bool = False,
+    compact: bool = False,
 ) -> None:
-    """Main entry point: generate all adventure game data files."""
+    """Main entry point: generate all adventure game data files.
+
+    With precompress, .gz/.br siblings are written for changed text assets
+    under output_dir (shared with the diff site's precompression manifest).
+    With compact, JSON is written without whitespace and world files use a
+    string table for stable names (see world_shards.encode_compact).
+    """
     game_data_dir = output_dir / "data" / "game"
     game_data_dir.mkdir(parents=True, exist_ok=True)
 
@@ -883,25 +905,46 @@ def generate_adventure_data(
 
     print("  Content validation passed")
 
+    # Prerender each section per era so the game fetches a few KB, not a chapter
+    version_indexes = [
+        index for index in (scan_version_dir(d) for d in version_dirs) if index is not None
+    ]
+    fragments = write_section_fragments(
+        list(world_map["sections"]), version_indexes, game_data_dir / "sections"
+    )
+    for stable_name, section in world_map["sections"].items():
+        section["fragments"] = fragments.get(stable_name, {})
+    world_map["fragmentFormat"] = fragment_format()
+    fragment_count = len({h for eras in fragments.values() for h in eras.values()})
+    print(f"  Generated {fragment_count} section fragments ({world_map['fragmentFormat']})")
+
     # Write output files
-    with open(game_data_dir / "world-map.json", "w") as f:
-        json.dump(world_map, f, indent=2)
-    print(f"  Generated world-map.json ({len(world_map['sections'])} sections)")
+    result = write_world_shards(
+        world_map, world_map["stableNameAliases"], game_data_dir / WORLD_DIR, compact=compact
+    )
+    print(
+        f"  Generated world map ({len(world_map['sections'])} sections in "
+        f"{len(world_map['realms'])} realm shards, {result['written']} changed)"
+    )
 
-    with open(game_data_dir / "npcs.json", "w") as f:
-        json.dump(yaml_content["npcs"], f, indent=2)
+    (game_data_dir / "npcs.json").write_text(
+        json_text(yaml_content["npcs"], compact), encoding="utf-8"
+    )
     print(f"  Generated npcs.json ({len(yaml_content['npcs'])} NPCs)")
 
-    with open(game_data_dir / "items.json", "w") as f:
-        json.dump(yaml_content["items"], f, indent=2)
+    (game_data_dir / "items.json").write_text(
+        json_text(yaml_content["items"], compact), encoding="utf-8"
+    )
     print(f"  Generated items.json ({len(yaml_content['items'])} items)")
 
-    with open(game_data_dir / "quests.json", "w") as f:
-        json.dump(yaml_content["quests"], f, indent=2)
+    (game_data_dir / "quests.json").write_text(
+        json_text(yaml_content["quests"], compact), encoding="utf-8"
+    )
     print(f"  Generated quests.json ({len(yaml_content['quests'])} quests)")
 
-    with open(game_data_dir / "puzzles.json", "w") as f:
-        json.dump(yaml_content["puzzles"], f, indent=2)
+    (game_data_dir / "puzzles.json").write_text(
+        json_text(yaml_content["puzzles"], compact), encoding="utf-8"
+    )
     print(f"  Generated puzzles.json ({len(yaml_content['puzzles'])} puzzles)")
 
     # Generate library entity index from LaTeX source
@@ -931,16 +974,39 @@ def generate_adventure_data(
         print("  Copying markdown files for deployment...")
         copy_version_markdown(existing_version_dirs, output_dir)
 
+    if precompress:
+        formats = available_formats()
+        print(f"  Precompressing text assets ({', '.join(formats)})...")
+        result = precompress_tree(output_dir, formats)
+        print(
+            f"  Compressed {result['compressed']} files "
+            f"({result['unchanged']} unchanged, {result['removed']} removed)"
+        )
+    else:
+        stale = invalidate_stale(output_dir)
+        if stale:
+            print(f"  Removed precompressed siblings of {stale} changed files")
+
+    (game_data_dir / BUILD_STAMP_FILENAME).write_text(
+        json.dumps({"encoding": data_encoding(compact)}), encoding="utf-8"
+    )
+
     print("\nAdventure game data generation complete!")
 
 
-def should_regenerate(output_dir: Path, input_dirs: list[Path], force: bool = False) -> bool:
+def should_regenerate(
+    output_dir: Path, input_dirs: list[Path], force: bool = False, compact: bool = False
+) -> bool:
     """Check if output needs regeneration based on input mtimes.
 
+    Inputs are compared against the build stamp of the last complete run, which
+    must also record the encoding that compact asks for.
+
     Args:
         output_dir: Directory containing output JSON files
         input_dirs: List of directories containing input files (markdown, YAML)
         force: If True, always regenerate
+        compact: Whether the output should use the compact encoding
 
     Returns:
         True if regeneration is needed, False otherwise
@@ -948,14 +1014,18 @@ def should_regenerate(output_dir: Path, input_dirs: list[Path], force: bool = Fa
     if force:
         return True
 
-    # Check if key output files exist
+    # Check the stamp of the last complete run
     game_data_dir = output_dir / "data" / "game"
-    world_map_file = game_data_dir / "world-map.json"
+    stamp_file = game_data_dir / BUILD_STAMP_FILENAME
 
-    if not world_map_file.exists():
+    try:
+        stamp = json.loads(stamp_file.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return True
+    if stamp.get("encoding") != data_encoding(compact):
         return True
 
-    output_mtime = world_map_file.stat().st_mtime
+    output_mtime = stamp_file.stat().st_mtime
 
     # Check all input directories for newer files
     for input_dir in input_dirs:
@@ -1034,6 +1104,16 @@ def main():
         action="store_true",
         help="Force regeneration even if output is newer than input",
     )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Write .gz (and .br with the brotli package) siblings of changed text assets",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write JSON without whitespace, with a string table for stable names",
+    )
 
     args = parser.parse_args()
 
@@ -1068,9 +1148,9 @@ def main():
 
     # Check if regeneration is needed
     output_path = Path(args.output)
-    if not should_regenerate(output_path, input_dirs, args.force):
-        world_map_file = output_path / "data" / "game" / "world-map.json"
-        mtime_str = world_map_file.stat().st_mtime
+    if not should_regenerate(output_path, input_dirs, args.force, args.compact):
+        stamp_file = output_path / "data" / "game" / BUILD_STAMP_FILENAME
+        mtime_str = stamp_file.stat().st_mtime
         from datetime import datetime
 
         mtime_date = datetime.fromtimestamp(mtime_str).strftime("%Y-%m-%d %H:%M")
@@ -1083,6 +1163,8 @@ def main():
             output_dir=output_path,
             primary_version=args.primary,
             game_content_dir=args.game_content,
+            precompress=args.precompress,
+            compact=args.compact,
         )
     except KeyboardInterrupt:
         print("\n\nGeneration interrupted")
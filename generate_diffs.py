@@ -38,12 +38,29 @@ Usage:
 """
 
 import argparse
-import re
+import hashlib
+import os
+import subprocess
 import sys
 import tempfile
 from pathlib import Path
 
-from src.cpp_std_converter.utils import ensure_dir, run_command_silent
+from src.cpp_std_converter.anchored_diff import anchored_diff
+from src.cpp_std_converter.diff_store import (
+    DIFF_STAT_KEYS,
+    PACK_FILENAME,
+    DiffStore,
+    LooseDiffStore,
+    diff_stats,
+    export_loose,
+    load_diff_manifest,
+    open_diff_store,
+    remove_loose,
+    save_diff_manifest,
+)
+from src.cpp_std_converter.markdown_scanner import scan_markdown_file
+from src.cpp_std_converter.similarity import RenameMatch, find_renames
+from src.cpp_std_converter.utils import ensure_dir, run_command, run_command_silent
 
 # Version metadata (in chronological order)
 VERSIONS = {
@@ -76,6 +93,100 @@ def generate_all_version_pairs() -> list[tuple[str, str]]:
 # Default: Generate all pairs (15 total)
 DEFAULT_PAIRS = generate_all_version_pairs()
 
+# git diff options used for stable name and table diffs. These are part of the
+# diff cache key, so changing them invalidates previously cached results.
+SECTION_DIFF_OPTIONS = ["--patience", "--unified=5", "--ignore-all-space"]
+
+
+def safe_diff_name(name: str) -> str:
+    """Convert a stable name or table label to its .diff file stem."""
+    return name.replace("/", "_").replace("\\", "_")
+
+
+def content_hash(content: str | None) -> str:
+    """Return the SHA-256 hex digest of section content (None hashes like "")."""
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+
+def is_diff_current(
+    store: DiffStore, kind: str, file_name: str, previous: dict | None, from_hash: str, to_hash: str
+) -> bool:
+    """Check whether an existing diff was produced from exactly these inputs."""
+    return (
+        previous is not None
+        and previous.get("from_hash") == from_hash
+        and previous.get("to_hash") == to_hash
+        and store.exists(kind, file_name)
+    )
+
+
+def attach_diff_stats(
+    entry: dict, previous: dict | None, store: DiffStore, kind: str, reuse: bool
+) -> dict:
+    """Add diff statistics to a manifest entry.
+
+    Statistics are carried over from the previous entry when the diff was not
+    regenerated (reuse=True), otherwise computed from the stored diff text.
+    """
+    if reuse and previous and all(key in previous for key in DIFF_STAT_KEYS):
+        entry.update({key: previous[key] for key in DIFF_STAT_KEYS})
+    else:
+        entry.update(diff_stats(store.read(kind, entry["file"]) or ""))
+    return entry
+
+
+def remove_stale_diffs(store: DiffStore, kind: str, keep_files: set[str]) -> int:
+    """Delete diffs of a kind ("by_stable_name"/"by_table") not listed in keep_files.
+
+    Returns the number of diffs removed.
+    """
+    removed = 0
+    for file_name in store.names(kind):
+        if file_name not in keep_files:
+            store.remove(kind, file_name)
+            removed += 1
+    return removed
+
+
+class DiffCache:
+    """
+    On-disk cache of section diff bodies keyed on (from hash, to hash).
+
+    Many version pairs produce identical section diffs: if a section is unchanged
+    from n4659 through n4950, every pair starting at n3337 computes the same diff.
+    Cached bodies exclude the per-file header, so one entry serves any stable name
+    or table whose contents match.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, from_hash: str, to_hash: str) -> Path:
+        key_source = "\0".join([from_hash, to_hash, *SECTION_DIFF_OPTIONS])
+        key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.diff"
+
+    def get(self, from_hash: str, to_hash: str) -> str | None:
+        """Return the cached diff body, or None on a miss."""
+        entry = self._entry_path(from_hash, to_hash)
+        try:
+            body = entry.read_text(encoding="utf-8")
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return body
+
+    def put(self, from_hash: str, to_hash: str, body: str) -> None:
+        """Store a diff body. Writes are atomic so parallel runs can share a cache."""
+        entry = self._entry_path(from_hash, to_hash)
+        ensure_dir(entry.parent)
+        tmp_file = entry.with_suffix(f".tmp{os.getpid()}")
+        tmp_file.write_text(body, encoding="utf-8")
+        os.replace(tmp_file, entry)
+
 
 def find_common_chapters(from_version: str, to_version: str) -> tuple[set[str], set[str], set[str]]:
     """
@@ -127,48 +238,20 @@ def parse_stable_names(markdown_file: Path) -> dict[str, tuple[str, int, int]]:
     """
     Parse markdown file and extract stable name sections.
 
+    Uses the shared single-pass chapter scan, so the file is only parsed once per
+    process no matter how many version pairs it participates in.
+
     Returns:
         Dict mapping stable_name -> (content, start_line, end_line)
     """
-    if not markdown_file.exists():
+    scan = scan_markdown_file(markdown_file)
+    if scan is None:
         return {}
 
-    sections = {}
-
-    with open(markdown_file, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    # Pattern to match headings with stable name anchors
-    # Format: ## Title <a id="stable.name">[[stable.name]]</a>
-    heading_pattern = re.compile(r'^(#{1,6})\s+.*<a id="([^"]+)">.*</a>\s*$')
-
-    # Track heading hierarchy
-    current_sections = []  # Stack of (level, stable_name, start_line)
-
-    for line_num, line in enumerate(lines, 1):
-        match = heading_pattern.match(line)
-
-        if match:
-            level = len(match.group(1))  # Count # symbols
-            stable_name = match.group(2)
-
-            # Close any sections at same or deeper level
-            while current_sections and current_sections[-1][0] >= level:
-                old_level, old_name, old_start = current_sections.pop()
-                # Extract content from old_start to line_num - 1
-                content = "".join(lines[old_start - 1 : line_num - 1])
-                sections[old_name] = (content, old_start, line_num - 1)
-
-            # Start new section
-            current_sections.append((level, stable_name, line_num))
-
-    # Close remaining open sections
-    while current_sections:
-        level, stable_name, start_line = current_sections.pop()
-        content = "".join(lines[start_line - 1 :])
-        sections[stable_name] = (content, start_line, len(lines))
-
-    return sections
+    return {
+        name: (scan.text(span.start_line, span.end_line), span.start_line, span.end_line)
+        for name, span in scan.sections.items()
+    }
 
 
 def parse_tables(markdown_file: Path) -> dict[str, tuple[str, str, int, int]]:
@@ -184,62 +267,24 @@ def parse_tables(markdown_file: Path) -> dict[str, tuple[str, str, int, int]]:
     Returns:
         Dict mapping table_label -> (caption, content, start_line, end_line)
     """
-    if not markdown_file.exists():
+    scan = scan_markdown_file(markdown_file)
+    if scan is None:
         return {}
 
-    tables = {}
-
-    with open(markdown_file, encoding="utf-8") as f:
-        lines = f.readlines()
-
-    # Pattern to match table headers with labels
-    # Format: **Table: Caption** <a id="label">[label]</a>
-    table_pattern = re.compile(r'^\*\*Table:\s*(.+?)\*\*\s*<a id="([^"]+)">')
-
-    current_table = None  # (label, caption, start_line, seen_table_content)
-
-    for line_num, line in enumerate(lines, 1):
-        match = table_pattern.match(line)
-
-        if match:
-            # Close previous table if any
-            if current_table:
-                label, caption, start, _ = current_table
-                content = "".join(lines[start - 1 : line_num - 1])
-                tables[label] = (caption, content, start, line_num - 1)
-
-            # Start new table
-            caption = match.group(1).strip()
-            label = match.group(2)
-            current_table = (label, caption, line_num, False)  # Not seen table content yet
-
-        elif current_table:
-            label, caption, start, seen_table_content = current_table
-            stripped = line.strip()
-
-            # Check if this is a table row (starts with |)
-            is_table_row = stripped.startswith("|") and "|" in stripped[1:]
-
-            if is_table_row:
-                # Mark that we've seen table content
-                if not seen_table_content:
-                    current_table = (label, caption, start, True)
-            elif stripped == "" and seen_table_content:
-                # Blank line after we've seen table content - table is complete
-                content = "".join(lines[start - 1 : line_num])
-                tables[label] = (caption, content, start, line_num)
-                current_table = None
-
-    # Close final table
-    if current_table:
-        label, caption, start, _ = current_table
-        content = "".join(lines[start - 1 :])
-        tables[label] = (caption, content, start, len(lines))
-
-    return tables
+    return {
+        label: (
+            span.caption,
+            scan.text(span.start_line, span.end_line),
+            span.start_line,
+            span.end_line,
+        )
+        for label, span in scan.tables.items()
+    }
 
 
-def generate_chapter_diff(from_file: Path, to_file: Path, output_file: Path, force: bool = False) -> bool:
+def generate_chapter_diff(
+    from_file: Path, to_file: Path, output_file: Path, force: bool = False
+) -> bool:
     """
     Generate unified diff for a single chapter.
 
@@ -291,8 +336,19 @@ def generate_chapter_diff(from_file: Path, to_file: Path, output_file: Path, for
         return False
 
 
-def generate_full_diff(from_version: str, to_version: str, output_file: Path, force: bool = False) -> bool:
-    """Generate diff for full standard files."""
+def generate_full_diff(
+    from_version: str,
+    to_version: str,
+    output_file: Path,
+    force: bool = False,
+    chunked: bool = False,
+) -> bool:
+    """Generate diff for full standard files.
+
+    With chunked=True the two files are first aligned on stable-name headings and
+    the matching chunks are diffed in parallel (see anchored_diff), which keeps
+    git's memory use per chunk and copes better with moved chapters.
+    """
     from_file = Path("full") / f"{from_version}.md"
     to_file = Path("full") / f"{to_version}.md"
 
@@ -303,62 +359,104 @@ def generate_full_diff(from_version: str, to_version: str, output_file: Path, fo
         print(f"Warning: Full file not found: {to_file}", file=sys.stderr)
         return False
 
-    return generate_chapter_diff(from_file, to_file, output_file, force=force)
+    if not chunked:
+        return generate_chapter_diff(from_file, to_file, output_file, force=force)
+
+    # Skip if output exists and is newer than both inputs (unless forced)
+    if not force and output_file.exists():
+        output_mtime = output_file.stat().st_mtime
+        if output_mtime > from_file.stat().st_mtime and output_mtime > to_file.stat().st_mtime:
+            return True
+
+    try:
+        output_file.write_text(anchored_diff(from_file, to_file), encoding="utf-8")
+        return True
+    except (OSError, RuntimeError) as e:
+        print(f"Error generating chunked full diff: {e}", file=sys.stderr)
+        return False
+
+
+def compute_section_diff(
+    from_content: str | None, to_content: str | None, cache: DiffCache | None = None
+) -> str | None:
+    """
+    Compute the unified diff body between two section contents.
+
+    The diff runs inside a scratch directory on relative file names, so the output
+    does not depend on the temporary path and identical inputs always produce
+    identical bodies.
+
+    Returns the diff text, or None if git diff itself failed (failures, including
+    timeouts, are never cached).
+    """
+    from_hash = to_hash = ""
+    if cache is not None:
+        from_hash = content_hash(from_content)
+        to_hash = content_hash(to_content)
+        cached = cache.get(from_hash, to_hash)
+        if cached is not None:
+            return cached
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        (tmp_path / "from.md").write_text(from_content or "", encoding="utf-8")
+        (tmp_path / "to.md").write_text(to_content or "", encoding="utf-8")
+
+        try:
+            result = run_command(
+                ["git", "diff", "--no-index", *SECTION_DIFF_OPTIONS, "from.md", "to.md"],
+                cwd=tmp_path,
+                check=False,
+                timeout=30,
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+
+    # git diff returns 1 when files differ (this is expected), 0 when identical;
+    # any other exit code means git diff itself failed
+    if result.returncode not in (0, 1):
+        return None
+
+    if cache is not None:
+        cache.put(from_hash, to_hash, result.stdout)
+    return result.stdout
 
 
 def generate_stable_name_diff(
-    stable_name: str, from_content: str | None, to_content: str | None, output_file: Path
+    stable_name: str,
+    from_content: str | None,
+    to_content: str | None,
+    output_file: Path,
+    cache: DiffCache | None = None,
+    moved_from: str | None = None,
+    store: DiffStore | None = None,
 ) -> bool:
     """
     Generate diff for a single stable name section.
 
+    If moved_from is given, from_content is the old section it was renamed or
+    moved from, and the header records the old stable name. If store is given,
+    the diff is written to it under output_file's name instead of to output_file.
+
     Returns True if diff was generated successfully.
     """
     try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir)
-
-            # Write content to temp files
-            from_file = tmp_path / "from.md"
-            to_file = tmp_path / "to.md"
-
-            if from_content:
-                from_file.write_text(from_content, encoding="utf-8")
-            else:
-                from_file.write_text("", encoding="utf-8")
-
-            if to_content:
-                to_file.write_text(to_content, encoding="utf-8")
-            else:
-                to_file.write_text("", encoding="utf-8")
-
-            # Use git diff with high-quality options
-            success, stdout, stderr = run_command_silent(
-                [
-                    "git",
-                    "diff",
-                    "--no-index",
-                    "--patience",  # Better algorithm for moved sections
-                    "--unified=5",  # More context lines
-                    "--ignore-all-space",  # Ignore all whitespace differences
-                    str(from_file),
-                    str(to_file),
-                ],
-                timeout=30,
-            )
+        body = compute_section_diff(from_content, to_content, cache=cache)
+        if body is None:
+            return False
 
-            # git diff returns 1 when files differ (this is expected), 0 when identical
-            # Only fail if git diff command itself failed
-            if not success and stderr and "fatal" in stderr.lower():
-                return False
+        # Add header with stable name
+        header = f"# Diff for [{stable_name}]\n# Stable name: {stable_name}\n"
+        if moved_from:
+            header += f"# Moved from: {moved_from}\n"
+        text = f"{header}\n{body}"
 
-            # Add header with stable name
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(f"# Diff for [{stable_name}]\n")
-                f.write(f"# Stable name: {stable_name}\n\n")
-                f.write(stdout)
+        if store is not None:
+            store.write("by_stable_name", output_file.name, text)
+        else:
+            output_file.write_text(text, encoding="utf-8")
 
-            return True
+        return True
 
     except Exception as e:
         print(f"Error generating diff for {stable_name}: {e}", file=sys.stderr)
@@ -366,8 +464,13 @@ def generate_stable_name_diff(
 
 
 def generate_stable_name_diffs(
-    from_version: str, to_version: str, output_dir: Path, max_dots: int | None = None,
-    force: bool = False
+    from_version: str,
+    to_version: str,
+    output_dir: Path,
+    max_dots: int | None = None,
+    force: bool = False,
+    cache: DiffCache | None = None,
+    store: DiffStore | None = None,
 ) -> int:
     """
     Generate diffs for all stable names across all chapters.
@@ -377,16 +480,12 @@ def generate_stable_name_diffs(
         to_version: Ending version directory
         output_dir: Output directory for diffs
         max_dots: Maximum number of dots in stable names (None = all levels)
-        force: Force regeneration even if output is newer than input
+        force: Force regeneration even if the manifest says the diff is current
+        cache: Optional diff cache shared across version pairs
+        store: Where to write diffs (default: loose files under output_dir)
 
     Returns the number of diffs successfully generated.
     """
-    # Get newest source file mtime for caching check
-    from_dir = Path(from_version)
-    to_dir = Path(to_version)
-    newest_source_mtime = 0
-    for md_file in list(from_dir.glob("*.md")) + list(to_dir.glob("*.md")):
-        newest_source_mtime = max(newest_source_mtime, md_file.stat().st_mtime)
     if max_dots is not None:
         print(f"  Generating stable name diffs (max {max_dots} dots)...")
     else:
@@ -395,6 +494,9 @@ def generate_stable_name_diffs(
     # Collect all stable names from both versions
     from_stable_names = {}  # stable_name -> (chapter, content, start, end)
     to_stable_names = {}
+    # Own text of each section (without subsections), for rename detection
+    from_bodies: dict[str, str] = {}
+    to_bodies: dict[str, str] = {}
 
     # Parse all chapter files from both versions
     from_dir = Path(from_version)
@@ -405,12 +507,14 @@ def generate_stable_name_diffs(
         sections = parse_stable_names(chapter_file)
         for stable_name, (content, start, end) in sections.items():
             from_stable_names[stable_name] = (chapter, content, start, end)
+        from_bodies.update(scan_markdown_file(chapter_file).heading_bodies())
 
     for chapter_file in sorted(to_dir.glob("*.md")):
         chapter = chapter_file.stem
         sections = parse_stable_names(chapter_file)
         for stable_name, (content, start, end) in sections.items():
             to_stable_names[stable_name] = (chapter, content, start, end)
+        to_bodies.update(scan_markdown_file(chapter_file).heading_bodies())
 
     # Find all unique stable names
     all_stable_names = set(from_stable_names.keys()) | set(to_stable_names.keys())
@@ -423,22 +527,42 @@ def generate_stable_name_diffs(
     print(f"    - {len(removed_names)} removed")
     print(f"    - {len(added_names)} added")
 
-    # Filter by dot count if max_dots is specified
+    # Pair removed names with added names whose content barely changed
+    renames = find_renames(
+        {name: from_bodies.get(name, "") for name in removed_names},
+        {name: to_bodies.get(name, "") for name in added_names},
+    )
+    moved_from = {match.new_name: match.old_name for match in renames}
+    print(f"    - {len(renames)} renamed or moved")
+
+    # Filter by dot count if max_dots is specified. Diffs of filtered-out names are
+    # left alone (not treated as stale) so a shallow run keeps deeper diffs intact.
+    keep_files: set[str] = set()
     if max_dots is not None:
         filtered_names = {name for name in all_stable_names if name.count(".") <= max_dots}
         print(f"    Filtering to {len(filtered_names)} stable names (max {max_dots} dots)")
+        for name in all_stable_names - filtered_names:
+            keep_files.add(f"{safe_diff_name(name)}.diff")
         all_stable_names = filtered_names
 
-    # Create output directory
+    # Create output directory (holds the README, and the diffs unless packed)
     stable_name_dir = output_dir / "by_stable_name"
     ensure_dir(stable_name_dir)
+    if store is None:
+        store = LooseDiffStore(output_dir)
+
+    manifest = load_diff_manifest(output_dir)
+    previous_entries = manifest.get("by_stable_name", {})
+    manifest_entries = {}
 
     # Generate diff for each stable name
     success_count = 0
-    diff_sizes = {}  # stable_name -> size
+    regenerated_count = 0
 
     for stable_name in sorted(all_stable_names):
-        from_content = from_stable_names.get(stable_name, (None, None, None, None))[1]
+        # A renamed or moved section is diffed against the section it came from
+        source_name = moved_from.get(stable_name, stable_name)
+        from_content = from_stable_names.get(source_name, (None, None, None, None))[1]
         to_content = to_stable_names.get(stable_name, (None, None, None, None))[1]
 
         # Skip if both are empty or identical
@@ -446,19 +570,58 @@ def generate_stable_name_diffs(
             continue
 
         # Generate safe filename from stable name
-        safe_name = stable_name.replace("/", "_").replace("\\", "_")
-        output_file = stable_name_dir / f"{safe_name}.diff"
-
-        # Skip if output exists and is newer than source files (unless forced)
-        if not force and output_file.exists():
-            if output_file.stat().st_mtime > newest_source_mtime:
-                success_count += 1
-                diff_sizes[stable_name] = output_file.stat().st_size
-                continue
+        output_file = stable_name_dir / f"{safe_diff_name(stable_name)}.diff"
+        keep_files.add(output_file.name)
+
+        from_hash = content_hash(from_content)
+        to_hash = content_hash(to_content)
+        entry = {"file": output_file.name, "from_hash": from_hash, "to_hash": to_hash}
+        if source_name != stable_name:
+            entry["moved_from"] = source_name
+
+        # Skip if the existing diff was produced from the same inputs (unless forced)
+        if not force and is_diff_current(
+            store,
+            "by_stable_name",
+            output_file.name,
+            previous_entries.get(stable_name),
+            from_hash,
+            to_hash,
+        ):
+            success_count += 1
+            manifest_entries[stable_name] = attach_diff_stats(
+                entry, previous_entries.get(stable_name), store, "by_stable_name", reuse=True
+            )
+            continue
 
-        if generate_stable_name_diff(stable_name, from_content, to_content, output_file):
+        if generate_stable_name_diff(
+            stable_name,
+            from_content,
+            to_content,
+            output_file,
+            cache=cache,
+            moved_from=entry.get("moved_from"),
+            store=store,
+        ):
             success_count += 1
-            diff_sizes[stable_name] = output_file.stat().st_size
+            regenerated_count += 1
+            manifest_entries[stable_name] = attach_diff_stats(
+                entry, None, store, "by_stable_name", reuse=False
+            )
+
+    # Remove diffs for stable names that vanished or no longer differ
+    stale_count = remove_stale_diffs(store, "by_stable_name", keep_files)
+
+    # Sizes of the diffs written by this run (for the README)
+    diff_sizes = {name: entry["bytes"] for name, entry in manifest_entries.items()}
+
+    # Entries for names excluded by max_dots are carried over unchanged
+    for stable_name, entry in previous_entries.items():
+        if stable_name not in manifest_entries and entry.get("file") in keep_files:
+            manifest_entries[stable_name] = entry
+
+    manifest["by_stable_name"] = manifest_entries
+    save_diff_manifest(output_dir, manifest)
 
     # Generate README for stable name diffs
     readme_path = stable_name_dir / "README.md"
@@ -471,9 +634,13 @@ def generate_stable_name_diffs(
         added_names,
         removed_names,
         diff_sizes,
+        renames,
     )
 
-    print(f"  Generated {success_count} stable name diffs")
+    print(
+        f"  Generated {success_count} stable name diffs "
+        f"({regenerated_count} regenerated, {stale_count} stale removed)"
+    )
     return success_count
 
 
@@ -486,6 +653,7 @@ def generate_stable_name_readme(
     added_names: set[str],
     removed_names: set[str],
     diff_sizes: dict[str, int],
+    renames: list[RenameMatch] | None = None,
 ) -> None:
     """Generate README for stable name diffs directory."""
     from_name = VERSIONS.get(from_version, from_version)
@@ -519,6 +687,7 @@ def generate_stable_name_readme(
     lines.append(f"- **In {to_version}**: {len(to_stable_names)}")
     lines.append(f"- **Added in {to_version}**: {len(added_names)}")
     lines.append(f"- **Removed in {to_version}**: {len(removed_names)}")
+    lines.append(f"- **Renamed or moved**: {len(renames or [])}")
     lines.append(f"- **Modified**: {len(diff_sizes)}\n")
 
     # Top 20 largest changes
@@ -532,6 +701,27 @@ def generate_stable_name_readme(
             lines.append(f"{i}. [`[{stable_name}]`]({safe_name}.diff) - {size_kb:.1f} KB")
         lines.append("")
 
+    # Renamed / moved stable names
+    moved_from = {match.new_name: match for match in renames or []}
+    if moved_from:
+        lines.append(f"## Renamed or Moved Stable Names in {to_name}\n")
+        lines.append(
+            f"Stable names new in {to_name} whose content closely matches a section "
+            f"removed from {from_name}:\n"
+        )
+        for match in sorted(moved_from.values(), key=lambda m: m.new_name):
+            old_chapter = from_stable_names.get(match.old_name, (None,))[0]
+            new_chapter = to_stable_names.get(match.new_name, (None,))[0]
+            if old_chapter == new_chapter:
+                location = f"{new_chapter}.md"
+            else:
+                location = f"{old_chapter}.md → {new_chapter}.md"
+            lines.append(
+                f"- [`[{match.new_name}]`]({safe_diff_name(match.new_name)}.diff) "
+                f"moved from `[{match.old_name}]` ({location}, {match.similarity:.0%} similar)"
+            )
+        lines.append("")
+
     # New stable names
     if added_names:
         lines.append(f"## New Stable Names in {to_name}\n")
@@ -540,7 +730,13 @@ def generate_stable_name_readme(
             safe_name = stable_name.replace("/", "_").replace("\\", "_")
             # Get chapter
             chapter = to_stable_names.get(stable_name, (None,))[0]
-            lines.append(f"- [`[{stable_name}]`]({safe_name}.diff) (from {chapter}.md)")
+            if stable_name in moved_from:
+                lines.append(
+                    f"- [`[{stable_name}]`]({safe_name}.diff) (from {chapter}.md, "
+                    f"moved from `[{moved_from[stable_name].old_name}]`)"
+                )
+            else:
+                lines.append(f"- [`[{stable_name}]`]({safe_name}.diff) (from {chapter}.md)")
         if len(added_names) > 50:
             lines.append(f"\n*...and {len(added_names) - 50} more*")
         lines.append("")
@@ -589,64 +785,50 @@ def generate_table_diff(
     from_content: str | None,
     to_content: str | None,
     output_file: Path,
+    cache: DiffCache | None = None,
+    store: DiffStore | None = None,
 ) -> bool:
     """
     Generate diff for a single table.
 
+    If store is given, the diff is written to it under output_file's name
+    instead of to output_file.
+
     Returns True if diff was generated successfully.
     """
     try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir)
-
-            # Write content to temp files
-            from_file = tmp_path / "from.md"
-            to_file = tmp_path / "to.md"
-
-            if from_content:
-                from_file.write_text(from_content, encoding="utf-8")
-            else:
-                from_file.write_text("", encoding="utf-8")
-
-            if to_content:
-                to_file.write_text(to_content, encoding="utf-8")
-            else:
-                to_file.write_text("", encoding="utf-8")
-
-            # Use git diff with high-quality options
-            success, stdout, stderr = run_command_silent(
-                [
-                    "git",
-                    "diff",
-                    "--no-index",
-                    "--patience",
-                    "--unified=5",
-                    "--ignore-all-space",
-                    str(from_file),
-                    str(to_file),
-                ],
-                timeout=30,
-            )
+        body = compute_section_diff(from_content, to_content, cache=cache)
+        if body is None:
+            return False
 
-            # git diff returns 1 when files differ (expected), 0 when identical
-            if not success and stderr and "fatal" in stderr.lower():
-                return False
+        # Add header with table label and caption
+        text = (
+            f"# Diff for table [{table_label}]\n"
+            f"# Table label: {table_label}\n"
+            f"# Caption: {caption}\n\n"
+            f"{body}"
+        )
 
-            # Add header with table label and caption
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(f"# Diff for table [{table_label}]\n")
-                f.write(f"# Table label: {table_label}\n")
-                f.write(f"# Caption: {caption}\n\n")
-                f.write(stdout)
+        if store is not None:
+            store.write("by_table", output_file.name, text)
+        else:
+            output_file.write_text(text, encoding="utf-8")
 
-            return True
+        return True
 
     except Exception as e:
         print(f"Error generating diff for table {table_label}: {e}", file=sys.stderr)
         return False
 
 
-def generate_table_diffs(from_version: str, to_version: str, output_dir: Path, force: bool = False) -> int:
+def generate_table_diffs(
+    from_version: str,
+    to_version: str,
+    output_dir: Path,
+    force: bool = False,
+    cache: DiffCache | None = None,
+    store: DiffStore | None = None,
+) -> int:
     """
     Generate diffs for all tables across all chapters.
 
@@ -654,7 +836,9 @@ def generate_table_diffs(from_version: str, to_version: str, output_dir: Path, f
         from_version: Starting version directory
         to_version: Ending version directory
         output_dir: Output directory for diffs
-        force: Force regeneration even if output is newer than input
+        force: Force regeneration even if the manifest says the diff is current
+        cache: Optional diff cache shared across version pairs
+        store: Where to write diffs (default: loose files under output_dir)
 
     Returns the number of diffs successfully generated.
     """
@@ -668,11 +852,6 @@ def generate_table_diffs(from_version: str, to_version: str, output_dir: Path, f
     from_dir = Path(from_version)
     to_dir = Path(to_version)
 
-    # Get newest source file mtime for caching check
-    newest_source_mtime = 0
-    for md_file in list(from_dir.glob("*.md")) + list(to_dir.glob("*.md")):
-        newest_source_mtime = max(newest_source_mtime, md_file.stat().st_mtime)
-
     for chapter_file in sorted(from_dir.glob("*.md")):
         chapter = chapter_file.stem
         tables = parse_tables(chapter_file)
@@ -696,13 +875,20 @@ def generate_table_diffs(from_version: str, to_version: str, output_dir: Path, f
     print(f"    - {len(removed_tables)} removed")
     print(f"    - {len(added_tables)} added")
 
-    # Create output directory
+    # Create output directory (holds the README, and the diffs unless packed)
     table_dir = output_dir / "by_table"
     ensure_dir(table_dir)
+    if store is None:
+        store = LooseDiffStore(output_dir)
+
+    manifest = load_diff_manifest(output_dir)
+    previous_entries = manifest.get("by_table", {})
+    manifest_entries = {}
+    keep_files: set[str] = set()
 
     # Generate diff for each table
     success_count = 0
-    diff_sizes: dict[str, int] = {}
+    regenerated_count = 0
 
     for label in sorted(all_tables):
         from_data = from_tables.get(label)
@@ -717,19 +903,43 @@ def generate_table_diffs(from_version: str, to_version: str, output_dir: Path, f
             continue
 
         # Generate safe filename from label
-        safe_name = label.replace("/", "_").replace("\\", "_")
-        output_file = table_dir / f"{safe_name}.diff"
-
-        # Skip if output exists and is newer than source files (unless forced)
-        if not force and output_file.exists():
-            if output_file.stat().st_mtime > newest_source_mtime:
-                success_count += 1
-                diff_sizes[label] = output_file.stat().st_size
-                continue
+        output_file = table_dir / f"{safe_diff_name(label)}.diff"
+        keep_files.add(output_file.name)
+
+        # The caption is part of the diff header, so it is hashed along with the content
+        from_hash = content_hash(from_content)
+        to_hash = content_hash(f"{caption}\n{to_content or ''}")
+        entry = {
+            "file": output_file.name,
+            "from_hash": from_hash,
+            "to_hash": to_hash,
+            "caption": caption,
+        }
+
+        # Skip if the existing diff was produced from the same inputs (unless forced)
+        if not force and is_diff_current(
+            store, "by_table", output_file.name, previous_entries.get(label), from_hash, to_hash
+        ):
+            success_count += 1
+            manifest_entries[label] = attach_diff_stats(
+                entry, previous_entries.get(label), store, "by_table", reuse=True
+            )
+            continue
 
-        if generate_table_diff(label, caption, from_content, to_content, output_file):
+        if generate_table_diff(
+            label, caption, from_content, to_content, output_file, cache=cache, store=store
+        ):
             success_count += 1
-            diff_sizes[label] = output_file.stat().st_size
+            regenerated_count += 1
+            manifest_entries[label] = attach_diff_stats(entry, None, store, "by_table", reuse=False)
+
+    diff_sizes = {label: entry["bytes"] for label, entry in manifest_entries.items()}
+
+    # Remove diffs for tables that vanished or no longer differ
+    stale_count = remove_stale_diffs(store, "by_table", keep_files)
+
+    manifest["by_table"] = manifest_entries
+    save_diff_manifest(output_dir, manifest)
 
     # Generate README for table diffs
     readme_path = table_dir / "README.md"
@@ -744,7 +954,10 @@ def generate_table_diffs(from_version: str, to_version: str, output_dir: Path, f
         diff_sizes,
     )
 
-    print(f"  Generated {success_count} table diffs")
+    print(
+        f"  Generated {success_count} table diffs "
+        f"({regenerated_count} regenerated, {stale_count} stale removed)"
+    )
     return success_count
 
 
@@ -828,8 +1041,13 @@ def generate_summary(
     common: set[str],
     removed: set[str],
     added: set[str],
+    packed: bool = False,
 ) -> str:
-    """Generate summary markdown for a version pair."""
+    """Generate summary markdown for a version pair.
+
+    With packed, stable name and table diffs live in the pair's diffs.sqlite, so
+    the summary points there instead of linking the by_stable_name/by_table files.
+    """
     from_name = VERSIONS.get(from_version, from_version)
     to_name = VERSIONS.get(to_version, to_version)
 
@@ -911,9 +1129,16 @@ def generate_summary(
 
     # Stable name diffs section
     lines.append("## Stable Name Diffs\n")
-    lines.append(
-        "**[Browse diffs by stable name](by_stable_name/)** - Focused diffs for individual sections\n"
-    )
+    if packed:
+        lines.append(
+            f"Focused diffs for individual sections are stored in `{PACK_FILENAME}`; "
+            "run `./generate_diffs.py --export-loose` to write them as .diff files.\n"
+        )
+    else:
+        lines.append(
+            "**[Browse diffs by stable name](by_stable_name/)** - "
+            "Focused diffs for individual sections\n"
+        )
     lines.append(
         "Instead of viewing entire chapter diffs, you can now view changes for specific stable names:"
     )
@@ -923,7 +1148,12 @@ def generate_summary(
 
     # Table diffs section
     lines.append("## Table Diffs\n")
-    lines.append("**[Browse diffs by table](by_table/)** - Track changes to individual tables\n")
+    if packed:
+        lines.append(f"Diffs of individual tables are stored in `{PACK_FILENAME}`.\n")
+    else:
+        lines.append(
+            "**[Browse diffs by table](by_table/)** - Track changes to individual tables\n"
+        )
     lines.append(
         "Tables are tracked by their stable label (e.g., `support.summary`, `locale.category.facets`):"
     )
@@ -957,8 +1187,14 @@ def generate_summary(
 
 
 def generate_diff_pair(
-    from_version: str, to_version: str, output_base: Path, max_dots: int | None = None,
-    force: bool = False
+    from_version: str,
+    to_version: str,
+    output_base: Path,
+    max_dots: int | None = None,
+    force: bool = False,
+    cache: DiffCache | None = None,
+    packed: bool = False,
+    chunked_full: bool = False,
 ) -> None:
     """Generate all diffs for a version pair.
 
@@ -968,6 +1204,10 @@ def generate_diff_pair(
         output_base: Output directory for diffs
         max_dots: Maximum number of dots in stable names (None = all levels)
         force: Force regeneration even if output is newer than input
+        cache: Optional diff cache shared across version pairs
+        packed: Write stable name and table diffs to a single diffs.sqlite pack
+            instead of one .diff file each
+        chunked_full: Diff the full standard chunk by chunk, aligned on stable names
     """
     from_name = VERSIONS.get(from_version, from_version)
     to_name = VERSIONS.get(to_version, to_version)
@@ -1001,22 +1241,49 @@ def generate_diff_pair(
     # Generate full standard diff
     print("  Generating full standard diff...")
     full_diff_file = output_base / "full_standard.diff"
-    if generate_full_diff(from_version, to_version, full_diff_file, force=force):
+    if generate_full_diff(
+        from_version, to_version, full_diff_file, force=force, chunked=chunked_full
+    ):
         print("  Generated full standard diff")
     else:
         print("  Warning: Could not generate full standard diff")
 
-    # Generate stable name diffs
-    generate_stable_name_diffs(from_version, to_version, output_base, max_dots=max_dots, force=force)
+    # Switching back to loose files: bring them up to date from the pack first so
+    # the manifest's hashes still describe what is on disk, then drop the pack
+    pack_file = output_base / PACK_FILENAME
+    if not packed and pack_file.exists():
+        print(f"  Unpacking {pack_file} into loose diff files")
+        export_loose(output_base)
+        pack_file.unlink()
+
+    with open_diff_store(output_base, packed=packed) as store:
+        # Generate stable name diffs
+        generate_stable_name_diffs(
+            from_version,
+            to_version,
+            output_base,
+            max_dots=max_dots,
+            force=force,
+            cache=cache,
+            store=store,
+        )
 
-    # Generate table diffs
-    generate_table_diffs(from_version, to_version, output_base, force=force)
+        # Generate table diffs
+        generate_table_diffs(
+            from_version, to_version, output_base, force=force, cache=cache, store=store
+        )
+
+    # Switching to the pack: loose files from earlier runs are now stale copies
+    if packed:
+        pruned = remove_loose(output_base)
+        if pruned:
+            print(f"  Removed {pruned} loose diff files now stored in {PACK_FILENAME}")
 
     # Generate summary
     print("  Generating summary...")
     summary_file = output_base / "README.md"
     summary_content = generate_summary(
-        from_version, to_version, output_base, common, removed, added
+        from_version, to_version, output_base, common, removed, added, packed=packed
     )
     with open(summary_file, "w", encoding="utf-8") as f:
         f.write(summary_content)
@@ -1034,6 +1301,9 @@ Examples:
   ./generate_diffs.py n3337 n4950       # Generate specific version pair
   ./generate_diffs.py n3337 n4950 --max-dots 1   # Only 0-1 dots
   ./generate_diffs.py --list            # List available versions
+  ./generate_diffs.py --packed          # Store section diffs in diffs.sqlite per pair
+  ./generate_diffs.py --export-loose    # Write loose .diff files from the packs
+  ./generate_diffs.py --chunked-full-diff  # Anchor-aligned parallel full-standard diff
 
 By default, generates all possible pairs (15 total):
   - Adjacent versions: C++11→C++14, C++14→C++17, etc.
@@ -1056,6 +1326,34 @@ By default, generates all possible pairs (15 total):
         action="store_true",
         help="Force regeneration of all diffs even if output is newer than input",
     )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Shared diff cache directory (default: <output>/.cache)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the content-hash diff cache shared between version pairs",
+    )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Store stable name and table diffs in one diffs.sqlite per pair "
+        "instead of one .diff file each",
+    )
+    parser.add_argument(
+        "--chunked-full-diff",
+        action="store_true",
+        help="Diff the full standard in chunks aligned on stable-name headings, "
+        "running git diff on the chunks in parallel",
+    )
+    parser.add_argument(
+        "--export-loose",
+        action="store_true",
+        help="Write the loose by_stable_name/ and by_table/ .diff files from each "
+        "pair's diffs.sqlite (for browsing on GitHub), then exit",
+    )
 
     args = parser.parse_args()
 
@@ -1074,17 +1372,43 @@ By default, generates all possible pairs (15 total):
     else:
         pairs = DEFAULT_PAIRS
 
+    if args.export_loose:
+        for from_v, to_v in pairs:
+            pair_dir = output_root / f"{from_v}_to_{to_v}"
+            if not (pair_dir / PACK_FILENAME).exists():
+                print(f"  {pair_dir}: no {PACK_FILENAME}, skipping")
+                continue
+            print(f"  {pair_dir}: wrote {export_loose(pair_dir)} loose diffs")
+        return 0
+
+    cache = None
+    if not args.no_cache:
+        cache_dir = Path(args.cache_dir) if args.cache_dir else output_root / ".cache"
+        cache = DiffCache(cache_dir)
+
     print(f"Generating diffs for {len(pairs)} version pairs")
     print(f"Output directory: {output_root}")
 
     for from_v, to_v in pairs:
         output_dir = output_root / f"{from_v}_to_{to_v}"
         try:
-            generate_diff_pair(from_v, to_v, output_dir, max_dots=args.max_dots, force=args.force)
+            generate_diff_pair(
+                from_v,
+                to_v,
+                output_dir,
+                max_dots=args.max_dots,
+                force=args.force,
+                cache=cache,
+                packed=args.packed,
+                chunked_full=args.chunked_full_diff,
+            )
         except Exception as e:
             print(f"Error generating diff pair {from_v} → {to_v}: {e}", file=sys.stderr)
             continue
 
+    if cache is not None:
+        print(f"\nDiff cache: {cache.hits} hits, {cache.misses} misses ({cache.cache_dir})")
+
     print(f"\n✓ All diffs generated in {output_root}/")
     print("\nView summaries:")
     for from_v, to_v in pairs:
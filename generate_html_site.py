@@ -42,28 +42,52 @@ Options:
 """
 
 import argparse
+import hashlib
 import json
+import math
+import mimetypes
 import os
 import re
 import shutil
 import subprocess
 import sys
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from dataclasses import dataclass
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import unquote, urlsplit
+from xml.sax.saxutils import escape as xml_escape
 
 from jinja2 import Environment
 
+from src.cpp_std_converter.build_timings import BuildTimer, measure
+from src.cpp_std_converter.diff_render import render_side_by_side_chunks
+from src.cpp_std_converter.diff_store import (
+    DIFF_STAT_KEYS,
+    PACK_FILENAME,
+    load_diff_manifest,
+    open_diff_store,
+)
+from src.cpp_std_converter.markdown_scanner import scan_version_dir
+from src.cpp_std_converter.precompress import (
+    available_formats,
+    invalidate_stale,
+    precompress_tree,
+)
 from src.cpp_std_converter.utils import ensure_dir, run_command, run_command_silent
 
 try:
-    from bs4 import BeautifulSoup
     from jinja2 import FileSystemLoader
 except ImportError as e:
     print(f"Error: Missing required package: {e}")
     print("Please install required packages:")
-    print("  pip install jinja2 beautifulsoup4 lxml")
+    print("  pip install jinja2")
     sys.exit(1)
 
 
@@ -86,6 +110,10 @@ class VersionPairConfig:
     limit: int | None = None
     max_workers: int | None = None
     force: bool = False
+    diff_renderer: str = "python"  # "python" (in-process) or "diff2html" (diff2html-cli)
+    diff2html_cmd: list[str] | None = None  # Detected once when diff_renderer is "diff2html"
+    page_assets: dict[str, str] | None = None  # From publish_diff_page_assets()
+    timer: BuildTimer = field(default_factory=BuildTimer)  # Stage timings for the build
 
 
 # Version pairs (adjacent only) - these are the focus of the viewer
@@ -97,23 +125,6 @@ VERSION_PAIRS = [
     ("n4950", "trunk", "C++23", "Trunk", "cpp23-to-trunk"),
 ]
 
-# Author branding configuration
-# Update these URLs with your actual social media handles
-AUTHOR_INFO = {
-    "name": "Jason Turner",
-    "tagline": "Professional C++ training and code review services",
-    "links": {
-        "twitter": "https://twitter.com/lefticus",
-        "mastodon": "https://mas.to/@lefticus",
-        "bluesky": "https://bsky.app/profile/lefticus.bsky.social",
-        "linkedin": "https://www.linkedin.com/in/lefticus/",
-        "youtube": "https://youtube.com/@cppweekly",
-        "github": "https://github.com/lefticus",
-        "project_github": "https://github.com/lefticus/cppstdmd",
-        "website": "https://emptycrate.com",
-    },
-}
-
 # Font Awesome 7 Free icon mappings
 # See: https://fontawesome.com/search?o=r&m=free
 FONT_AWESOME_ICONS = {
@@ -150,17 +161,156 @@ def create_icon(icon_name):
     return f'<i class="{icon_classes}"></i>'
 
 
-def check_dependencies():
-    """Check if required external tools are available."""
-    # Check for diff2html-cli or npx
+@cache
+def find_diff2html() -> tuple[str, ...] | None:
+    """Find the diff2html-cli command (probed once per process).
+
+    Returns:
+        ("diff2html",), ("npx", "diff2html"), or None if neither is available
+    """
     success, stdout, stderr = run_command_silent(["diff2html", "--version"])
     if success:
-        return  # diff2html is available
+        return ("diff2html",)
 
     # Try npx as fallback
     success, stdout, stderr = run_command_silent(["npx", "--version"])
     if success:
-        return  # npx is available
+        return ("npx", "diff2html")
+
+    return None
+
+
+# Stylesheets and scripts of a diff page: site-relative paths, or URLs for
+# third-party assets that could not be published locally
+DEFAULT_DIFF_PAGE_ASSETS = {
+    "highlight_css": "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.7.0/styles/github.min.css",
+    "diff2html_css": "https://cdn.jsdelivr.net/npm/diff2html/bundles/css/diff2html.min.css",
+    "diff2html_js": "https://cdn.jsdelivr.net/npm/diff2html/bundles/js/diff2html-ui.min.js",
+    "fontawesome_css": "css/fontawesome.min.css",
+    "solid_css": "css/solid.min.css",
+    "brands_css": "css/brands.min.css",
+    "custom_css": "css/custom.css",
+    "diff_page_js": "js/diff-page.js",
+    "navigation_js": "js/navigation.js",
+}
+
+# Third-party diff page assets: (npm package, file in package, site directory),
+# published from a local node_modules when one has them
+_NPM_PAGE_ASSETS = {
+    "highlight_css": ("highlight.js", "styles/github.min.css", "css"),
+    "diff2html_css": ("diff2html", "bundles/css/diff2html.min.css", "css"),
+    "diff2html_js": ("diff2html", "bundles/js/diff2html-ui.min.js", "js"),
+}
+
+# Hex digits of the content hash in published asset names
+ASSET_HASH_LENGTH = 10
+
+
+@cache
+def node_modules_dirs() -> tuple[Path, ...]:
+    """Local and global node_modules directories (probed once per process)."""
+    dirs = [Path("node_modules")]
+    success, stdout, _stderr = run_command_silent(["npm", "root", "-g"])
+    if success and stdout.strip():
+        dirs.append(Path(stdout.strip()))
+    return tuple(d for d in dirs if d.is_dir())
+
+
+def hashed_asset_name(name: str, data: bytes) -> str:
+    """Content-hashed file name: custom.css → custom.<hash>.css."""
+    stem, _dot, suffix = name.rpartition(".")
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:ASSET_HASH_LENGTH]}.{suffix}"
+
+
+def publish_hashed_asset(source: Path, output_path: Path, subdir: str) -> str:
+    """Copy an asset into the site under its content-hashed name.
+
+    Earlier hashed copies are left in place for pages that still link them;
+    prune_hashed_assets() removes them once a full build has re-rendered those.
+
+    Returns:
+        Site-relative path of the published file (e.g. "css/custom.<hash>.css")
+    """
+    data = source.read_bytes()
+    name = hashed_asset_name(source.name, data)
+    dest_dir = output_path / subdir
+    ensure_dir(dest_dir)
+
+    target = dest_dir / name
+    if not target.exists():
+        target.write_bytes(data)
+    return f"{subdir}/{name}"
+
+
+def prune_hashed_assets(output_path: Path, assets: dict[str, str]) -> int:
+    """Delete hashed copies of the published assets other than the current ones.
+
+    Only for full builds: every page then links the hashes in assets, while a
+    partial build keeps pages that reference older copies.
+
+    Args:
+        output_path: Site root
+        assets: Asset key → site-relative path or URL (from publish_diff_page_assets())
+
+    Returns:
+        Number of files deleted
+    """
+    removed = 0
+    hash_re = rf"\.[0-9a-f]{{{ASSET_HASH_LENGTH}}}\."
+    for path in assets.values():
+        if "://" in path:
+            continue
+        current = output_path / path
+        stem, suffix = re.split(hash_re, current.name, maxsplit=1)
+        stale = re.compile(rf"{re.escape(stem)}{hash_re}{re.escape(suffix)}")
+        for old in current.parent.iterdir():
+            if old.name != current.name and stale.fullmatch(old.name):
+                old.unlink()
+                removed += 1
+    return removed
+
+
+def publish_diff_page_assets(output_path: Path, templates_dir: Path) -> dict[str, str]:
+    """Publish the stylesheets and scripts shared by all diff pages.
+
+    Every asset gets a content-hashed name, so it can be cached indefinitely and
+    is fetched once for the whole site. diff2html and highlight.js are taken
+    from node_modules when installed there; otherwise pages keep the CDN URLs.
+
+    Returns:
+        Asset key → site-relative path or URL (see DEFAULT_DIFF_PAGE_ASSETS)
+    """
+    assets = dict(DEFAULT_DIFF_PAGE_ASSETS)
+    for key, (package, package_file, subdir) in _NPM_PAGE_ASSETS.items():
+        for node_modules in node_modules_dirs():
+            source = node_modules / package / package_file
+            if source.exists():
+                assets[key] = publish_hashed_asset(source, output_path, subdir)
+                break
+
+    for key, path in DEFAULT_DIFF_PAGE_ASSETS.items():
+        source = templates_dir / path
+        if key not in _NPM_PAGE_ASSETS and source.exists():
+            subdir, _slash, _name = path.partition("/")
+            assets[key] = publish_hashed_asset(source, output_path, subdir)
+    return assets
+
+
+def check_dependencies(diff_renderer: str = "python") -> list[str] | None:
+    """Check if required external tools are available.
+
+    The in-process Python renderer needs nothing external; the diff2html
+    renderer needs diff2html-cli or npx.
+
+    Returns:
+        The diff2html command to run, or None for the Python renderer
+    """
+    if diff_renderer != "diff2html":
+        return None
+
+    diff2html_cmd = find_diff2html()
+    if diff2html_cmd is not None:
+        return list(diff2html_cmd)
 
     # Neither available
     print("Error: diff2html-cli is not installed and npx is not available")
@@ -170,6 +320,8 @@ def check_dependencies():
     print()
     print("Or install npx (part of npm):")
     print("  sudo apt install npm")
+    print()
+    print("Or use the built-in renderer: --renderer python")
     sys.exit(1)
 
 
@@ -195,35 +347,106 @@ def extract_stable_name(diff_file: Path) -> str | None:
     return None
 
 
-def extract_table_info(diff_file: Path) -> tuple[str | None, str | None]:
-    """Extract table label and caption from diff header.
+def parse_diff_header(text: str) -> dict[str, str]:
+    """Parse the "# Key: value" header lines at the top of a diff.
 
     Args:
-        diff_file: Path to the table diff file
+        text: Diff content
 
     Returns:
-        Tuple of (table_label, caption), or (None, None) if not found
+        Dict mapping header key (e.g., "Stable name") to its value
     """
-    label = None
-    caption = None
-    try:
-        with open(diff_file, encoding="utf-8") as f:
-            for line in f:
-                if line.startswith("# Table label:"):
-                    label = line.split(":", 1)[1].strip()
-                elif line.startswith("# Caption:"):
-                    caption = line.split(":", 1)[1].strip()
-                # Only check first few lines
-                if not line.startswith("#"):
-                    break
-    except Exception as e:
-        print(f"Warning: Could not read {diff_file}: {e}")
-    return label, caption
+    fields = {}
+    for line in text.split("\n"):
+        if not line.startswith("#"):
+            break
+        key, sep, value = line[1:].partition(":")
+        if sep:
+            fields.setdefault(key.strip(), value.strip())
+    return fields
+
+
+def _diff_item(store, kind: str, file_name: str) -> tuple[dict, str]:
+    """Build the common item fields for one diff in a store, plus its text."""
+    text = store.read(kind, file_name) or ""
+    item = {
+        "size_kb": round(store.size(kind, file_name) / 1024, 1),
+        "line_count": count_diff_text_lines(text),
+        "file": Path(file_name).stem,
+        "path": store.path(kind, file_name),
+        "diff_hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "packed": store.packed,
+    }
+    return item, text
+
+
+# Header key that names the diff's subject, per kind
+_NAME_HEADER = {"by_stable_name": "Stable name", "by_table": "Table label"}
+
+
+def iter_diff_items(store, kind: str):
+    """Yield (header, item) for every diff of a kind, sorted by file name.
+
+    Uses the sizes and line counts recorded in the pair's manifest.json when it
+    has them, so no diff needs to be opened; otherwise reads each diff to parse
+    its header and count its lines.
+    """
+    entries = load_diff_manifest(store.pair_dir).get(kind, {})
+    if entries and all(key in entry for entry in entries.values() for key in DIFF_STAT_KEYS):
+        for name, entry in sorted(entries.items(), key=lambda kv: kv[1]["file"]):
+            file_name = entry["file"]
+            header = {_NAME_HEADER[kind]: name}
+            if entry.get("caption"):
+                header["Caption"] = entry["caption"]
+            item = {
+                "size_kb": round(entry["bytes"] / 1024, 1),
+                "line_count": entry["line_count"],
+                "file": Path(file_name).stem,
+                "path": store.path(kind, file_name),
+                "diff_hash": entry["diff_hash"],
+                "packed": store.packed,
+            }
+            yield header, item
+        return
+
+    for file_name in store.names(kind):
+        item, text = _diff_item(store, kind, file_name)
+        yield parse_diff_header(text), item
+
+
+@cache
+def _pair_diff_store(pair_dir: str, pid: int):
+    """Read-only diff store for a version pair, cached per process."""
+    return open_diff_store(Path(pair_dir), readonly=True)
+
+
+def load_diff_text(item: dict) -> str:
+    """Load the diff text for an item from collect_stable_names()/collect_tables()."""
+    diff_path = Path(item["path"])
+    if item.get("packed"):
+        store = _pair_diff_store(str(diff_path.parent.parent), os.getpid())
+        return store.read(diff_path.parent.name, diff_path.name) or ""
+    return diff_path.read_text(encoding="utf-8", errors="ignore")
+
+
+@contextmanager
+def diff_input_file(item: dict):
+    """Yield a real file path holding the item's diff (a temp file if packed)."""
+    if not item.get("packed"):
+        yield Path(item["path"])
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_file = Path(tmp_dir) / Path(item["path"]).name
+        tmp_file.write_text(load_diff_text(item), encoding="utf-8")
+        yield tmp_file
 
 
 def collect_tables(diff_dir: Path, limit: int | None = None) -> list[dict]:
     """Collect tables from a by_table diff directory.
 
+    Takes sizes and line counts from the pair's manifest.json when present, and
+    otherwise reads loose .diff files or the pair's diffs.sqlite pack.
+
     Args:
         diff_dir: Path to by_table directory containing .diff files
         limit: Maximum number of diffs to collect (for testing)
@@ -236,31 +459,16 @@ def collect_tables(diff_dir: Path, limit: int | None = None) -> list[dict]:
     if not diff_dir.exists():
         return tables
 
-    diff_files = sorted(diff_dir.glob("*.diff"))
-
-    for diff_file in diff_files:
-        label, caption = extract_table_info(diff_file)
-
-        if not label:
+    with open_diff_store(diff_dir.parent, readonly=True) as store:
+        for header, item in iter_diff_items(store, diff_dir.name):
             # Fallback: use filename
-            label = diff_file.stem
-
-        if not caption:
-            caption = label
-
-        tables.append(
-            {
-                "label": label,
-                "caption": caption,
-                "size_kb": get_file_size_kb(diff_file),
-                "line_count": count_diff_lines(diff_file),
-                "file": diff_file.stem,
-                "path": diff_file,
-            }
-        )
+            label = header.get("Table label") or item["file"]
+            caption = header.get("Caption") or label
 
-        if limit and len(tables) >= limit:
-            break
+            tables.append({"label": label, "caption": caption, **item})
+
+            if limit and len(tables) >= limit:
+                break
 
     return tables
 
@@ -441,21 +649,25 @@ def count_diff_lines(diff_file: Path) -> int:
         Number of diff lines (lines starting with +, -, or @)
     """
     try:
-        count = 0
-        with open(diff_file, encoding="utf-8") as f:
-            in_header = True
-            for line in f:
-                if in_header and line.startswith("diff --git"):
-                    in_header = False
-                if not in_header and (
-                    line.startswith("+") or line.startswith("-") or line.startswith("@@")
-                ):
-                    count += 1
-        return count
+        return count_diff_text_lines(diff_file.read_text(encoding="utf-8"))
     except Exception:
         return 0
 
 
+def count_diff_text_lines(text: str) -> int:
+    """Count number of lines in diff text (excluding header), see count_diff_lines()."""
+    count = 0
+    in_header = True
+    for line in text.split("\n"):
+        if in_header and line.startswith("diff --git"):
+            in_header = False
+        if not in_header and (
+            line.startswith("+") or line.startswith("-") or line.startswith("@@")
+        ):
+            count += 1
+    return count
+
+
 def get_cppstdmd_sha() -> dict[str, str]:
     """Get current SHA of the cppstdmd repository.
 
@@ -508,30 +720,17 @@ def extract_diff_keywords(diff_file: Path) -> list[str]:
     Returns:
         List of unique keywords found in changed lines (max 150)
     """
-    import re
-
     try:
         content = diff_file.read_text(encoding="utf-8", errors="ignore")
     except Exception:
         return []
 
-    keywords = set()
-
-    # Extract changed lines only (+ or - markers)
-    for line in content.split("\n"):
-        if line.startswith("+") or line.startswith("-"):
-            # Skip metadata lines
-            if line.startswith("+++") or line.startswith("---"):
-                continue
-
-            clean_line = line[1:].strip()
+    return extract_diff_text_keywords(content)
 
-            # Extract C++ identifiers: [A-Za-z_][A-Za-z0-9_]*
-            identifiers = re.findall(r"\b[A-Za-z_][A-Za-z0-9_]*\b", clean_line)
-            keywords.update(identifiers)
 
-    # Filter out very common words and single characters
-    stop_words = {
+# Words too common in the standard's prose to be worth indexing
+SEARCH_STOP_WORDS = frozenset(
+    {
         "the",
         "and",
         "for",
@@ -550,65 +749,198 @@ def extract_diff_keywords(diff_file: Path) -> list[str]:
         "may",
         "will",
     }
-    keywords = {k for k in keywords if len(k) > 2 and k.lower() not in stop_words}
+)
+
+# Changed lines of a diff (+/- markers, excluding the ---/+++ file headers)
+_CHANGED_LINE_RE = re.compile(r"^(?!\+\+\+|---)[+-](.*)$", re.MULTILINE)
+_IDENTIFIER_RE = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]*\b")
+
+# Search terms are sharded by their first SEARCH_PREFIX_LENGTH characters; the
+# client only searches content from 3 characters on, so it always knows the shard
+SEARCH_PREFIX_LENGTH = 2
+SEARCH_KEYWORD_LIMIT = 150
+
+
+def diff_term_counts(content: str) -> Counter:
+    """Count C++ identifiers in the changed lines of diff text.
+
+    Single characters, two-letter words and common English words are dropped.
+    """
+    changed = "\n".join(_CHANGED_LINE_RE.findall(content))
+    return Counter(
+        word
+        for word in _IDENTIFIER_RE.findall(changed)
+        if len(word) > 2 and word.lower() not in SEARCH_STOP_WORDS
+    )
+
 
-    # Limit to 150 most frequent keywords
-    return sorted(keywords)[:150]
+def extract_diff_text_keywords(content: str) -> list[str]:
+    """Extract keywords from diff text, see extract_diff_keywords()."""
+    # Most frequent first; ties keep first-seen order
+    return [word for word, _count in diff_term_counts(content).most_common(SEARCH_KEYWORD_LIMIT)]
+
+
+def _search_document_terms(item: dict) -> Counter:
+    """Lowercased term counts for one search document (worker function)."""
+    counts = Counter()
+    for word, count in diff_term_counts(load_diff_text(item)).items():
+        counts[word.lower()] += count
+    for word in re.findall(r"\b[A-Za-z_]\w*\b", item.get("caption", "")):
+        counts[word.lower()] += 1
+    return counts
+
+
+def search_shard_key(term: str) -> str:
+    """Shard file stem for a lowercased term."""
+    return term[:SEARCH_PREFIX_LENGTH]
+
+
+def build_search_postings(term_counts: list[Counter]) -> dict[str, list[list]]:
+    """Build a TF-IDF weighted inverted index.
+
+    Each document's weights use a log-scaled term frequency times a smoothed
+    inverse document frequency, normalised to unit length so long diffs do not
+    outrank focused ones.
+
+    Args:
+        term_counts: Term counts per document, indexed by document id
+
+    Returns:
+        Dict mapping term → [[doc_id, weight], ...], highest weight first
+    """
+    doc_count = len(term_counts)
+    doc_freq = Counter(term for counts in term_counts for term in counts)
+    idf = {term: math.log(1 + doc_count / df) for term, df in doc_freq.items()}
+
+    postings: dict[str, list[list]] = {}
+    for doc_id, counts in enumerate(term_counts):
+        weights = {term: (1 + math.log(count)) * idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        for term, weight in weights.items():
+            postings.setdefault(term, []).append([doc_id, round(weight / norm, 4)])
+
+    for entries in postings.values():
+        entries.sort(key=lambda entry: (-entry[1], entry[0]))
+    return postings
+
+
+# Document list the overview page loads with the shards (names and types only)
+SEARCH_DOCUMENTS_FILENAME = "documents.json"
+
+
+def search_index_hash(stable_names: list[dict], tables: list[dict] | None = None) -> str:
+    """Hash of everything a pair's search index is built from.
+
+    Covers each document's name, type, caption and diff hash (from the pair's
+    manifest.json) plus the tokenizer settings, so an unchanged hash means
+    generate_search_index() would write the same files.
+    """
+    inputs = {
+        "sections": [[item["name"], item.get("diff_hash")] for item in stable_names],
+        "tables": [
+            [item["label"], item.get("caption", ""), item.get("diff_hash")] for item in tables or []
+        ],
+        "prefix_length": SEARCH_PREFIX_LENGTH,
+        "keyword_limit": SEARCH_KEYWORD_LIMIT,
+        "stop_words": sorted(SEARCH_STOP_WORDS),
+    }
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
 
 
 def generate_search_index(
-    stable_names: list[dict], output_dir: Path, slug: str, tables: list[dict] | None = None
+    stable_names: list[dict],
+    output_dir: Path,
+    slug: str,
+    tables: list[dict] | None = None,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
 ):
-    """Generate JSON search index with keywords for each stable name and table.
+    """Generate the prefix-sharded search index for a version pair.
+
+    Writes three kinds of files:
+    - <slug>_search_index.json: the document list (name, type, table caption,
+      top keywords). A document's position is its id in the postings.
+    - <slug>_search/documents.json: the same list with only names and types,
+      which is all the overview page needs to map postings back to sections.
+    - <slug>_search/<prefix>.json: postings for every term starting with
+      <prefix>, as {term: [[doc_id, tf-idf weight], ...]}. The overview page
+      fetches only the shards for what the user types.
+
+    Diffs are tokenized in parallel, reading loose or packed diffs listed by
+    collect_stable_names()/collect_tables().
 
     Args:
         stable_names: List of dicts with 'name' and 'path' keys
         output_dir: Directory to write search index JSON
         slug: Version pair slug (e.g., 'cpp11-to-cpp14')
         tables: Optional list of table dicts with 'label', 'caption', and 'path' keys
+        max_workers: Number of tokenizer processes (defaults to CPU count)
+        executor: Existing pool to tokenize in instead of starting one
     """
-    search_index = []
+    print(f"  Generating search index for {slug}...")
 
-    print("  Generating search index...")
+    tables = tables or []
+    documents = [{"name": item["name"], "type": "section"} for item in stable_names]
+    documents += [
+        {"name": item["label"], "type": "table", "caption": item.get("caption", "")}
+        for item in tables
+    ]
+    items = list(stable_names) + list(tables)
 
-    # Add sections
-    for item in stable_names:
-        keywords = extract_diff_keywords(item["path"])
-        search_index.append({"name": item["name"], "type": "section", "keywords": keywords})
+    if executor is not None and len(items) > 1:
+        term_counts = list(executor.map(_search_document_terms, items, chunksize=16))
+    elif len(items) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            term_counts = list(pool.map(_search_document_terms, items, chunksize=16))
+    else:
+        term_counts = [_search_document_terms(item) for item in items]
 
-    # Add tables
-    if tables:
-        for item in tables:
-            keywords = extract_diff_keywords(item["path"])
-            # Add caption words as keywords
-            caption_words = re.findall(r"\b[A-Za-z_]\w*\b", item.get("caption", ""))
-            keywords.extend(caption_words)
-            # Deduplicate and limit
-            keywords = list(set(keywords))[:150]
-            search_index.append(
-                {
-                    "name": item["label"],
-                    "type": "table",
-                    "caption": item.get("caption", ""),
-                    "keywords": keywords,
-                }
-            )
+    postings = build_search_postings(term_counts)
+
+    # Each document's highest-weighted terms, for display and simple clients
+    top_terms: list[list[tuple[float, str]]] = [[] for _ in documents]
+    for term, entries in postings.items():
+        for doc_id, weight in entries:
+            top_terms[doc_id].append((weight, term))
+    for document, terms in zip(documents, top_terms, strict=True):
+        terms.sort(key=lambda entry: (-entry[0], entry[1]))
+        document["keywords"] = [term for _weight, term in terms[:SEARCH_KEYWORD_LIMIT]]
 
-    # Write JSON file
     index_file = output_dir / f"{slug}_search_index.json"
-    index_file.write_text(json.dumps(search_index), encoding="utf-8")
+    index_file.write_text(json.dumps(documents), encoding="utf-8")
+
+    # Shard postings by term prefix, replacing shards from earlier builds
+    shard_dir = output_dir / f"{slug}_search"
+    if shard_dir.exists():
+        shutil.rmtree(shard_dir)
+    ensure_dir(shard_dir)
+
+    shards: dict[str, dict[str, list]] = {}
+    for term in sorted(postings):
+        shards.setdefault(search_shard_key(term), {})[term] = postings[term]
+    shard_bytes = 0
+    for key, shard in shards.items():
+        shard_file = shard_dir / f"{key}.json"
+        shard_file.write_text(json.dumps(shard, separators=(",", ":")), encoding="utf-8")
+        shard_bytes += shard_file.stat().st_size
+
+    slim = [{"name": document["name"], "type": document["type"]} for document in documents]
+    (shard_dir / SEARCH_DOCUMENTS_FILENAME).write_text(
+        json.dumps(slim, separators=(",", ":")), encoding="utf-8"
+    )
 
     # Report size
     size_kb = index_file.stat().st_size / 1024
-    table_count = len(tables) if tables else 0
     print(
-        f"  ✓ Generated search index: {len(stable_names)} sections, {table_count} tables, "
-        f"{size_kb:.1f} KB"
+        f"  ✓ Generated search index: {len(stable_names)} sections, {len(tables)} tables, "
+        f"{len(postings)} terms in {len(shards)} shards ({size_kb:.1f} KB + "
+        f"{shard_bytes / 1024:.1f} KB)"
     )
 
 
 def generate_diff_html(diff_file: Path, output_file: Path, context: dict) -> bool:
-    """Generate HTML for a single diff using diff2html.
+    """Generate HTML for a single diff using diff2html-cli.
 
     Args:
         diff_file: Path to input diff file
@@ -622,25 +954,13 @@ def generate_diff_html(diff_file: Path, output_file: Path, context: dict) -> boo
         # Create output directory if needed
         ensure_dir(output_file.parent)
 
-        # Try diff2html first, fall back to npx
-        diff2html_cmd = None
-        success, stdout, stderr = run_command_silent(["diff2html", "--version"])
-        if success:
-            diff2html_cmd = "diff2html"
-
-        if diff2html_cmd is None:
-            # Try npx
-            success, stdout, stderr = run_command_silent(["npx", "--version"])
-            if success:
-                diff2html_cmd = "npx"
-            else:
-                return False
-
+        # Use the command detected once up front, probing only if none was passed
+        diff2html_cmd = context.get("diff2html_cmd") or find_diff2html()
         if diff2html_cmd is None:
             return False
 
         # Build command
-        cmd = ["npx", "diff2html"] if diff2html_cmd == "npx" else ["diff2html"]
+        cmd = list(diff2html_cmd)
         cmd.extend(["-i", "file", "-F", str(output_file), "-s", "side", "--", str(diff_file)])
 
         result = run_command(cmd, check=True)
@@ -661,483 +981,317 @@ def generate_diff_html(diff_file: Path, output_file: Path, context: dict) -> boo
         return False
 
 
-def create_author_banner(soup):
-    """Create the author banner that appears at the top of every page."""
-    banner = soup.new_tag("div", **{"class": "author-banner"})
-    banner_content = soup.new_tag("div", **{"class": "author-banner-content"})
+def extract_diff_fragment(page: str) -> str:
+    """Return the diff markup inside <div id="diff"> of a diff2html-cli page.
 
-    # Author name
-    author_name = soup.new_tag("span", **{"class": "author-name"})
-    author_name.string = f"From {AUTHOR_INFO['name']}"
-    banner_content.append(author_name)
+    Plain string slicing: the fragment is dropped into the page template as is.
+    """
+    start = page.find('<div id="diff">')
+    body_end = page.rfind("</body>")
+    if start == -1 or body_end == -1:
+        return page
+    start += len('<div id="diff">')
+    end = page.rfind("</div>", start, body_end)
+    return page[start:end] if end != -1 else page[start:body_end]
+
+
+def assemble_diff_page(
+    diff_html: str,
+    output_file: Path,
+    context: dict,
+    env: Environment,
+    chunk_urls: list[str] | None = None,
+) -> str:
+    """Wrap rendered diff markup in the site's diff page template.
 
-    # Social links
-    author_links = soup.new_tag("div", **{"class": "author-links"})
+    Adds the breadcrumbs, version timeline, external links, metadata and footer
+    around the diff2html markup by rendering templates/diff_page.html, so the
+    diff itself is never re-parsed.
 
-    icon_map = [
-        ("twitter", "twitter", "Twitter/X"),
-        ("mastodon", "mastodon", "Mastodon"),
-        ("bluesky", "bluesky", "Bluesky"),
-        ("linkedin", "linkedin", "LinkedIn"),
-        ("youtube", "youtube", "YouTube"),
-        ("github", "github", "GitHub"),
-        ("website", "website", "Website"),
-    ]
+    Args:
+        diff_html: diff2html side-by-side markup (the d2h-wrapper div)
+        output_file: Path the page will be written to (for the canonical URL)
+        context: Dictionary with navigation data
+        env: Jinja2 Environment for template rendering
+        chunk_urls: Page-relative URLs of the remaining diff parts, loaded by
+            navigation.js on scroll (None when diff_html is the whole diff)
 
-    for key, icon_name, title in icon_map:
-        icon_link = soup.new_tag(
-            "a",
-            href=AUTHOR_INFO["links"][key],
-            target="_blank",
-            rel="noopener noreferrer",
-            title=title,
+    Returns:
+        Complete HTML page
+    """
+    # Get availability lookup from context (pre-built to avoid race conditions)
+    availability = context.get("stable_name_availability", {})
+
+    timeline = []
+    for _from_tag, _to_tag, from_name, to_name, slug in VERSION_PAIRS:
+        is_current = slug == context["version_slug"]
+        # Link available diffs and the current version, show the rest disabled
+        href = None
+        if availability.get(slug, False) or is_current:
+            href = f"../{slug}/{context['stable_name_file']}.html"
+        timeline.append(
+            {"label": f"{from_name}→{to_name}", "slug": slug, "href": href, "current": is_current}
         )
 
-        icon_elem = soup.new_tag("i")
-        icon_elem["class"] = FONT_AWESOME_ICONS[icon_name].split()
-        icon_link.append(icon_elem)
+    # Use cppstdmd SHA if available, otherwise default to 'main'
+    sha = context.get("cppstdmd_sha", "main")
+    stable_name = context["stable_name"]
 
-        author_links.append(icon_link)
-
-    banner_content.append(author_links)
-    banner.append(banner_content)
+    # Table pages live one directory deeper (diffs/<slug>/tables/)
+    site_root = "../" * (3 if context.get("is_table") else 2)
+    assets = {
+        key: href if "://" in href else site_root + href
+        for key, href in (context.get("page_assets") or DEFAULT_DIFF_PAGE_ASSETS).items()
+    }
 
-    return banner
+    template = env.get_template("diff_page.html")
+    return template.render(
+        title=context.get("title", "C++ Standard Diff"),
+        stable_name=stable_name,
+        from_version=context["from_version"],
+        to_version=context["to_version"],
+        to_tag=context["to_tag"],
+        version_slug=context["version_slug"],
+        file_size_kb=context.get("file_size_kb", 0),
+        line_count=context.get("line_count", 0),
+        timeline=timeline,
+        availability_kind="tables" if context.get("is_table") else "sections",
+        availability_url=site_root + AVAILABILITY_FILENAME,
+        site_root=site_root,
+        assets=assets,
+        stable_name_file=context["stable_name_file"],
+        from_timsong=get_timsong_url(context["from_tag"], stable_name),
+        to_timsong=get_timsong_url(context["to_tag"], stable_name),
+        from_markdown_url=get_github_markdown_url(context["from_tag"], stable_name, sha),
+        to_markdown_url=get_github_markdown_url(context["to_tag"], stable_name, sha),
+        # Show top 3 episodes (already sorted by confidence)
+        episodes=context.get("episode_correlations", [])[:3],
+        canonical_url=(
+            f"https://cppstdmd.com/diffs/{context['version_slug']}/{Path(output_file).name}"
+        ),
+        diff_html=diff_html,
+        chunk_urls=chunk_urls or [],
+        generated_date=context.get("generated_date", "recently"),
+        cppstdmd_sha=context.get("cppstdmd_sha", ""),
+        cppstdmd_short_sha=context.get("cppstdmd_short_sha", ""),
+    )
 
 
-def inject_navigation(html_file: Path, context: dict, env: Environment) -> bool:
-    """Inject custom navigation into generated HTML.
+def collect_stable_names(
+    diff_dir: Path, max_dots: int | None = None, limit: int | None = None
+) -> list[dict]:
+    """Collect stable names from a diff directory.
 
-    This post-processes the diff2html output to add:
-    - Breadcrumbs
-    - Version timeline navigation
-    - External links
-    - Metadata
+    Takes sizes and line counts from the pair's manifest.json when present, and
+    otherwise reads loose .diff files or the pair's diffs.sqlite pack.
 
     Args:
-        html_file: Path to HTML file to modify
-        context: Dictionary with navigation data
-        env: Jinja2 Environment for template rendering
+        diff_dir: Path to directory containing .diff files
+        max_dots: Maximum number of dots allowed (None = no limit)
+        limit: Maximum number of diffs to collect (for testing)
 
     Returns:
-        True if successful, False otherwise
+        List of dicts with stable name info
     """
-    try:
-        with open(html_file, encoding="utf-8") as f:
-            soup = BeautifulSoup(f.read(), "html.parser")
-
-        # Create custom header
-        header = soup.new_tag("header", **{"class": "custom-header"})
-
-        # Breadcrumbs
-        breadcrumb_nav = soup.new_tag("nav", **{"class": "breadcrumb"})
-
-        # Add home icon
-        home_icon = soup.new_tag("i")
-        home_icon["class"] = FONT_AWESOME_ICONS["home"].split()
-        breadcrumb_nav.append(home_icon)
-        breadcrumb_nav.append(" ")
-
-        home_link = soup.new_tag("a", href="../../index.html")
-        home_link.string = "Home"
-        breadcrumb_nav.append(home_link)
-        breadcrumb_nav.append(" > ")
-
-        version_link = soup.new_tag("a", href=f"../../versions/{context['version_slug']}.html")
-        version_link.string = f"{context['from_version']} → {context['to_version']}"
-        breadcrumb_nav.append(version_link)
-        breadcrumb_nav.append(" > ")
-
-        stable_name_span = soup.new_tag("span", **{"class": "current"})
-        stable_name_span.string = f"[{context['stable_name']}]"
-        breadcrumb_nav.append(stable_name_span)
-
-        header.append(breadcrumb_nav)
-
-        # Title section
-        title_section = soup.new_tag("div", **{"class": "title-section"})
-        title_h1 = soup.new_tag("h1")
-        title_h1.string = f"[{context['stable_name']}]"
-        title_section.append(title_h1)
-
-        # Metadata
-        metadata_div = soup.new_tag("div", **{"class": "metadata"})
-
-        version_badge = soup.new_tag("span", **{"class": "badge version-badge"})
-        version_badge.string = f"{context['from_version']} → {context['to_version']}"
-        metadata_div.append(version_badge)
-        metadata_div.append(" ")
-
-        size_badge = soup.new_tag("span", **{"class": "badge size-badge"})
-        size_kb = context.get("file_size_kb", 0)
-        size_badge.string = f"{size_kb} KB"
-        if size_kb > 100:
-            size_badge["class"] = "badge size-badge large"
-        metadata_div.append(size_badge)
-
-        if context.get("line_count", 0) > 0:
-            metadata_div.append(" ")
-            line_badge = soup.new_tag("span", **{"class": "badge line-badge"})
-            line_badge.string = f"{context['line_count']} lines"
-            metadata_div.append(line_badge)
-
-        title_section.append(metadata_div)
-        header.append(title_section)
-
-        # Version timeline navigation
-        timeline_nav = soup.new_tag("nav", **{"class": "version-timeline"})
-        timeline_label = soup.new_tag("span", **{"class": "timeline-label"})
-        timeline_label.string = "Evolution Timeline: "
-        timeline_nav.append(timeline_label)
-
-        # Get availability lookup from context (pre-built to avoid race conditions)
-        availability = context.get("stable_name_availability", {})
-
-        for i, (_from_tag, _to_tag, from_name, to_name, slug) in enumerate(VERSION_PAIRS):
-            if i > 0:
-                timeline_nav.append(" | ")
-
-            # Check if this version pair has this stable name (from pre-built lookup)
-            is_available = availability.get(slug, False)
-            is_current = slug == context["version_slug"]
-
-            if is_available or is_current:
-                # Create link for available diffs or current version
-                timeline_link = soup.new_tag(
-                    "a",
-                    href=f"../{slug}/{context['stable_name_file']}.html",
-                    **{"class": "active" if is_current else ""},
-                )
-                timeline_link.string = f"{from_name}→{to_name}"
-                timeline_nav.append(timeline_link)
-            else:
-                # Create disabled span for non-existent diffs
-                disabled_span = soup.new_tag("span", **{"class": "disabled"})
-                disabled_span.string = f"{from_name}→{to_name}"
-                timeline_nav.append(disabled_span)
-
-        header.append(timeline_nav)
-
-        # External links
-        links_div = soup.new_tag("div", **{"class": "external-links"})
-
-        # Add link icon
-        link_icon = soup.new_tag("i")
-        link_icon["class"] = FONT_AWESOME_ICONS["link"].split()
-        links_div.append(link_icon)
-        links_div.append(" ")
-
-        eelis_link = soup.new_tag(
-            "a",
-            href=f"https://eel.is/c++draft/{context['stable_name']}",
-            target="_blank",
-            rel="noopener noreferrer",
-        )
-        eelis_link.string = "Current Draft"
-        links_div.append(eelis_link)
-        links_div.append(" | ")
-
-        github_link = soup.new_tag(
-            "a",
-            href="https://github.com/cplusplus/draft",
-            target="_blank",
-            rel="noopener noreferrer",
-        )
-        github_link.string = "LaTeX Source"
-        links_div.append(github_link)
+    stable_names = []
 
-        header.append(links_div)
+    if not diff_dir.exists():
+        print(f"Warning: Directory not found: {diff_dir}")
+        return stable_names
 
-        # Archived versions (timsong-cpp.github.io)
-        from_timsong = get_timsong_url(context["from_tag"], context["stable_name"])
-        to_timsong = get_timsong_url(context["to_tag"], context["stable_name"])
+    with open_diff_store(diff_dir.parent, readonly=True) as store:
+        for header, item in iter_diff_items(store, diff_dir.name):
+            # Fallback: use filename
+            name = header.get("Stable name") or item["file"]
 
-        if from_timsong or to_timsong:
-            archived_div = soup.new_tag("div", **{"class": "external-links"})
+            # Filter by dot count if max_dots is specified
+            if max_dots is not None and get_dot_count(name) > max_dots:
+                continue
 
-            # Add book icon
-            book_icon = soup.new_tag("i")
-            book_icon["class"] = FONT_AWESOME_ICONS["book"].split()
-            archived_div.append(book_icon)
-            archived_div.append(" Archived: ")
+            stable_names.append({"name": name, **item})
 
-            if from_timsong:
-                from_archived_link = soup.new_tag(
-                    "a", href=from_timsong, target="_blank", rel="noopener noreferrer"
-                )
-                from_archived_link.string = context["from_version"]
-                archived_div.append(from_archived_link)
+            if limit and len(stable_names) >= limit:
+                break
 
-            if from_timsong and to_timsong:
-                archived_div.append(" | ")
+    return stable_names
 
-            if to_timsong:
-                to_archived_link = soup.new_tag(
-                    "a", href=to_timsong, target="_blank", rel="noopener noreferrer"
-                )
-                to_archived_link.string = context["to_version"]
-                archived_div.append(to_archived_link)
 
-            header.append(archived_div)
+# Per-stable-name evolution bundles (evolution/<file>.json), rendered by evolution.html
+EVOLUTION_DIR = "evolution"
+EVOLUTION_TEXT_HASH_LENGTH = 12
 
-        # Markdown source links
-        md_links_div = soup.new_tag("div", **{"class": "external-links"})
 
-        # Add markdown icon
-        markdown_icon = soup.new_tag("i")
-        markdown_icon["class"] = FONT_AWESOME_ICONS["markdown"].split()
-        md_links_div.append(markdown_icon)
-        md_links_div.append(" Markdown: ")
+def evolution_versions(version_pairs: list[tuple]) -> list[tuple[str, str]]:
+    """(tag, name) of every version the pairs connect, oldest first."""
+    return [(pair[0], pair[2]) for pair in version_pairs] + [
+        (version_pairs[-1][1], version_pairs[-1][3])
+    ]
 
-        # Use cppstdmd SHA if available, otherwise default to 'main'
-        sha = context.get("cppstdmd_sha", "main")
 
-        from_md_link = soup.new_tag(
-            "a",
-            href=get_github_markdown_url(context["from_tag"], context["stable_name"], sha),
-            target="_blank",
-            rel="noopener noreferrer",
-        )
-        from_md_link.string = context["from_version"]
-        md_links_div.append(from_md_link)
-        md_links_div.append(" | ")
-
-        to_md_link = soup.new_tag(
-            "a",
-            href=get_github_markdown_url(context["to_tag"], context["stable_name"], sha),
-            target="_blank",
-            rel="noopener noreferrer",
-        )
-        to_md_link.string = context["to_version"]
-        md_links_div.append(to_md_link)
-
-        header.append(md_links_div)
-
-        # Adventure game link (with era for timeshift)
-        adventure_div = soup.new_tag("div", **{"class": "external-links"})
-        gamepad_icon = soup.new_tag("i")
-        gamepad_icon["class"] = FONT_AWESOME_ICONS["gamepad"].split()
-        adventure_div.append(gamepad_icon)
-        adventure_div.append(" ")
-        adventure_link = soup.new_tag(
-            "a",
-            href=f"../../adventure/?section={context['stable_name']}&era={context['to_tag']}",
-        )
-        adventure_link.string = "Explore in Adventure Game"
-        adventure_div.append(adventure_link)
-        header.append(adventure_div)
-
-        # YouTube episode links (from correlations)
-        episode_correlations = context.get("episode_correlations", [])
-        if episode_correlations:
-            youtube_div = soup.new_tag("div", **{"class": "external-links youtube-links"})
-            video_icon = soup.new_tag("i")
-            video_icon["class"] = FONT_AWESOME_ICONS["video"].split()
-            youtube_div.append(video_icon)
-            youtube_div.append(" C++ Weekly: ")
-
-            # Show top 3 episodes (already sorted by confidence)
-            for i, ep in enumerate(episode_correlations[:3]):
-                if i > 0:
-                    youtube_div.append(" | ")
-                ep_link = soup.new_tag(
-                    "a",
-                    href=ep.get("youtube_url", "#"),
-                    target="_blank",
-                    rel="noopener noreferrer",
-                    title=ep.get("title", f"Episode {ep.get('episode', '?')}"),
-                )
-                ep_link.string = f"Ep {ep.get('episode', '?')}"
-                youtube_div.append(ep_link)
+def build_evolution_bundle(
+    stable_name: str,
+    file_stem: str,
+    version_pairs: list[tuple],
+    stores: dict,
+    versions_path: Path = Path("."),
+) -> dict:
+    """Everything evolution.html shows for one stable name.
 
-            header.append(youtube_div)
+    Args:
+        stable_name: Section stable name (e.g., "basic.life")
+        file_stem: Diff file stem of the section (also the bundle's file name)
+        version_pairs: List of version pair tuples from VERSION_PAIRS
+        stores: Pair slug → open diff store, for the adjacent-version diffs
+        versions_path: Directory holding the converted versions (n3337/, ..., trunk/)
 
-        # Large file warning
-        if size_kb > 100:
-            warning_div = soup.new_tag("div", **{"class": "warning large-file-warning"})
+    Returns:
+        Dict with "versions" (tag, name and text hash, or null where the section
+        does not exist), "texts" (hash → markdown, each distinct text once) and
+        "diffs" (the adjacent-version diffs that exist, oldest first)
+    """
+    versions = []
+    texts: dict[str, str] = {}
+    for tag, name in evolution_versions(version_pairs):
+        index = scan_version_dir(versions_path / tag)
+        text = index.section_text(stable_name) if index else None
+        key = None
+        if text is not None:
+            key = hashlib.sha256(text.encode("utf-8")).hexdigest()[:EVOLUTION_TEXT_HASH_LENGTH]
+            texts.setdefault(key, text)
+        versions.append({"tag": tag, "name": name, "text": key})
+
+    diffs = []
+    for _from_tag, _to_tag, from_name, to_name, slug in version_pairs:
+        store = stores.get(slug)
+        diff = store.read("by_stable_name", f"{file_stem}.diff") if store else None
+        if diff:
+            diffs.append({"slug": slug, "from": from_name, "to": to_name, "diff": diff})
 
-            # Add warning icon
-            warning_icon = soup.new_tag("i")
-            warning_icon["class"] = FONT_AWESOME_ICONS["warning"].split()
-            warning_div.append(warning_icon)
-            warning_div.append(
-                f" Large diff ({size_kb} KB) - rendering may be slow on some devices"
-            )
+    return {
+        "name": stable_name,
+        "file": file_stem,
+        "versions": versions,
+        "texts": texts,
+        "diffs": diffs,
+    }
 
-            header.append(warning_div)
-
-        # Insert author banner and header at beginning of body
-        if soup.body:
-            author_banner = create_author_banner(soup)
-            soup.body.insert(0, header)
-            soup.body.insert(0, author_banner)
-
-            # Add main-content id to the diff div for skip-link
-            diff_div = soup.find("div", id="diff")
-            if diff_div:
-                # Create a wrapper with main-content id
-                wrapper = soup.new_tag("div", id="main-content")
-                diff_div.wrap(wrapper)
-
-        # Render footer from template
-        footer_template = env.get_template("_footer.html")
-        footer_html = footer_template.render(
-            generated_date=context.get("generated_date", "recently"),
-            cppstdmd_sha=context.get("cppstdmd_sha", ""),
-            cppstdmd_short_sha=context.get("cppstdmd_short_sha", ""),
-        )
-        footer_soup = BeautifulSoup(footer_html, "html.parser")
-
-        # Insert footer at end of body
-        if soup.body and footer_soup.footer:
-            soup.body.append(footer_soup.footer)
-
-        # Update page title
-        if soup.title:
-            soup.title.string = context.get("title", "C++ Standard Diff")
-        elif soup.head:
-            title_tag = soup.new_tag("title")
-            title_tag.string = context.get("title", "C++ Standard Diff")
-            soup.head.insert(0, title_tag)
-
-        # Add meta tags
-        if soup.head:
-            # Theme color
-            theme_meta = soup.new_tag("meta", attrs={"name": "theme-color", "content": "#00a500"})
-            soup.head.append(theme_meta)
-
-            # Canonical URL
-            canonical_url = (
-                f"https://cppstdmd.com/diffs/{context['version_slug']}/{Path(html_file).name}"
-            )
-            canonical_link = soup.new_tag("link", rel="canonical", href=canonical_url)
-            soup.head.append(canonical_link)
-
-            # Open Graph
-            og_tags = [
-                ("og:title", context.get("title", "C++ Standard Diff")),
-                (
-                    "og:description",
-                    f"View changes in section {context['stable_name']} between {context['from_version']} and {context['to_version']}",
-                ),
-                ("og:type", "website"),
-                ("og:url", canonical_url),
-                ("og:site_name", "C++ Standard Evolution Viewer"),
-            ]
-            for prop, content_val in og_tags:
-                og_meta = soup.new_tag("meta", property=prop, content=content_val)
-                soup.head.append(og_meta)
-
-            # Twitter Card
-            twitter_tags = [
-                ("twitter:card", "summary"),
-                ("twitter:title", context.get("title", "C++ Standard Diff")),
-                (
-                    "twitter:description",
-                    f"Changes in {context['stable_name']} between {context['from_version']} and {context['to_version']}",
-                ),
-                ("twitter:creator", "@lefticus"),
-            ]
-            for name, content_val in twitter_tags:
-                twitter_meta = soup.new_tag("meta", attrs={"name": name, "content": content_val})
-                soup.head.append(twitter_meta)
-
-        # Add skip-to-content link at start of body
-        if soup.body:
-            skip_link = soup.new_tag("a", href="#main-content", **{"class": "skip-link"})
-            skip_link.string = "Skip to main content"
-            soup.body.insert(0, skip_link)
-
-        # Add CSS links to head
-        if soup.head:
-            # Add Font Awesome CSS
-            fa_css_link = soup.new_tag(
-                "link", rel="stylesheet", href="../../css/fontawesome.min.css"
-            )
-            soup.head.append(fa_css_link)
 
-            fa_solid_link = soup.new_tag("link", rel="stylesheet", href="../../css/solid.min.css")
-            soup.head.append(fa_solid_link)
+def generate_evolution_bundles(
+    output_path: Path,
+    sections: list[dict],
+    version_pairs: list[tuple],
+    base_diffs_path: Path,
+    versions_path: Path = Path("."),
+    prune: bool = False,
+) -> int:
+    """Write evolution/<file>.json for every section that has a diff page.
 
-            fa_brands_link = soup.new_tag("link", rel="stylesheet", href="../../css/brands.min.css")
-            soup.head.append(fa_brands_link)
+    Bundles whose content is unchanged are not rewritten, so their mtimes (and
+    precompressed siblings) stay put on incremental builds.
 
-            # Add custom CSS
-            css_link = soup.new_tag("link", rel="stylesheet", href="../../css/custom.css")
-            soup.head.append(css_link)
+    Args:
+        output_path: Site output directory
+        sections: Section dicts with "name" and "file" (from the pairs' statistics)
+        version_pairs: List of version pair tuples from VERSION_PAIRS
+        base_diffs_path: Base path to diffs directory (e.g., Path('diffs'))
+        versions_path: Directory holding the converted versions
+        prune: Remove bundles of sections not in this build (full builds only)
 
-        # Add navigation.js script before closing body
-        if soup.body:
-            script_tag = soup.new_tag("script", src="../../js/navigation.js")
-            soup.body.append(script_tag)
+    Returns:
+        Number of bundles written
+    """
+    bundle_dir = output_path / EVOLUTION_DIR
+    ensure_dir(bundle_dir)
 
-        # Write modified HTML
-        with open(html_file, "w", encoding="utf-8") as f:
-            f.write(str(soup))
+    stores = {}
+    for from_tag, to_tag, _from_name, _to_name, slug in version_pairs:
+        pair_dir = base_diffs_path / f"{from_tag}_to_{to_tag}"
+        if pair_dir.exists():
+            stores[slug] = open_diff_store(pair_dir, readonly=True)
 
-        return True
+    written = 0
+    current = set()
+    try:
+        for name, file_stem in sorted({(s["name"], s["file"]) for s in sections}):
+            bundle = build_evolution_bundle(name, file_stem, version_pairs, stores, versions_path)
+            data = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            bundle_file = bundle_dir / f"{file_stem}.json"
+            current.add(bundle_file.name)
+            if not bundle_file.exists() or bundle_file.read_bytes() != data:
+                bundle_file.write_bytes(data)
+                written += 1
+    finally:
+        for store in stores.values():
+            store.close()
+
+    if prune:
+        for stale in bundle_dir.glob("*.json"):
+            if stale.name not in current:
+                stale.unlink()
+    return written
+
+
+def generate_evolution_page(output_path: Path, env: Environment, page_assets: dict[str, str]):
+    """Generate evolution.html, which shows any section's bundle (?name=<file>)."""
+    sha_info = get_cppstdmd_sha()
+    template = env.get_template("evolution.html")
+    content = template.render(
+        assets=page_assets,
+        bundle_dir=EVOLUTION_DIR,
+        cppstdmd_sha=sha_info["sha"],
+        cppstdmd_short_sha=sha_info["short_sha"],
+    )
+    (output_path / "evolution.html").write_text(content, encoding="utf-8")
 
-    except Exception as e:
-        print(f"  Error injecting navigation: {e}")
-        return False
 
+# Availability matrix for the version timeline, published next to index.html
+AVAILABILITY_FILENAME = "availability.json"
+AVAILABILITY_KINDS = {"by_stable_name": "sections", "by_table": "tables"}
 
-def collect_stable_names(
-    diff_dir: Path, max_dots: int | None = None, limit: int | None = None
-) -> list[dict]:
-    """Collect stable names from a diff directory.
+
+@cache
+def availability_index(base_diffs_path: str, version_pairs: tuple) -> dict[str, dict[str, int]]:
+    """Bitmask of the version pairs each diff exists in.
+
+    Lists every pair's by_stable_name and by_table diffs (loose or packed) once.
+    Bit i of a mask is set when version_pairs[i] has that diff. Checking diffs
+    (which are already generated) rather than .html files (which may be
+    concurrently created) avoids races during parallel HTML generation.
 
     Args:
-        diff_dir: Path to directory containing .diff files
-        max_dots: Maximum number of dots allowed (None = no limit)
-        limit: Maximum number of diffs to collect (for testing)
+        base_diffs_path: Base path to diffs directory (e.g., 'diffs')
+        version_pairs: Version pair tuples from VERSION_PAIRS
 
     Returns:
-        List of dicts with stable name info
+        Dict mapping kind ("by_stable_name"/"by_table") → {diff file stem: mask}
     """
-    stable_names = []
-
-    if not diff_dir.exists():
-        print(f"Warning: Directory not found: {diff_dir}")
-        return stable_names
+    index: dict[str, dict[str, int]] = {kind: {} for kind in AVAILABILITY_KINDS}
 
-    diff_files = sorted(diff_dir.glob("*.diff"))
-
-    for diff_file in diff_files:
-        name = extract_stable_name(diff_file)
-
-        if not name:
-            # Fallback: use filename
-            name = diff_file.stem
-
-        # Filter by dot count if max_dots is specified
-        if max_dots is not None and get_dot_count(name) > max_dots:
+    for bit, (from_tag, to_tag, *_rest) in enumerate(version_pairs):
+        pair_dir = Path(base_diffs_path) / f"{from_tag}_to_{to_tag}"
+        if not pair_dir.exists():
             continue
+        with open_diff_store(pair_dir, readonly=True) as store:
+            for kind, masks in index.items():
+                for file_name in store.names(kind):
+                    stem = file_name.removesuffix(".diff")
+                    masks[stem] = masks.get(stem, 0) | (1 << bit)
 
-        stable_names.append(
-            {
-                "name": name,
-                "size_kb": get_file_size_kb(diff_file),
-                "line_count": count_diff_lines(diff_file),
-                "file": diff_file.stem,
-                "path": diff_file,
-            }
-        )
+    return index
 
-        if limit and len(stable_names) >= limit:
-            break
 
-    return stable_names
+def availability_from_mask(mask: int, version_pairs: list[tuple]) -> dict[str, bool]:
+    """Expand an availability bitmask into a slug → exists dict."""
+    return {pair[4]: bool(mask >> bit & 1) for bit, pair in enumerate(version_pairs)}
 
 
 def build_stable_name_availability(
     stable_name: str, version_pairs: list[tuple], base_diffs_path: Path
 ) -> dict[str, bool]:
-    """Check which version pairs have this stable name by scanning .diff files.
+    """Check which version pairs have this stable name.
 
-    This pre-builds a lookup table to avoid race conditions during parallel
-    HTML generation. Checks for the existence of .diff files (which are already
-    generated) rather than .html files (which may be concurrently created).
+    Reads the stable name's mask from availability_index(), so the diff
+    directories are scanned once for the whole build.
 
     Args:
         stable_name: The stable name to check (e.g., "concepts", "alg.copy")
@@ -1148,22 +1302,14 @@ def build_stable_name_availability(
         Dict mapping slug → exists (bool)
         Example: {'cpp11-to-cpp14': True, 'cpp14-to-cpp17': False, ...}
     """
-    availability = {}
-    safe_name = sanitize_filename(stable_name)
-
-    for from_tag, to_tag, _from_name, _to_name, slug in version_pairs:
-        diff_file = (
-            base_diffs_path / f"{from_tag}_to_{to_tag}" / "by_stable_name" / f"{safe_name}.diff"
-        )
-        availability[slug] = diff_file.exists()
-
-    return availability
+    masks = availability_index(str(base_diffs_path), tuple(version_pairs))["by_stable_name"]
+    return availability_from_mask(masks.get(sanitize_filename(stable_name), 0), version_pairs)
 
 
 def build_table_availability(
     table_label: str, version_pairs: list[tuple], base_diffs_path: Path
 ) -> dict[str, bool]:
-    """Check which version pairs have this table by scanning .diff files.
+    """Check which version pairs have this table.
 
     Similar to build_stable_name_availability but for tables.
 
@@ -1175,17 +1321,230 @@ def build_table_availability(
     Returns:
         Dict mapping slug → exists (bool)
     """
-    availability = {}
-    safe_name = sanitize_filename(table_label)
+    masks = availability_index(str(base_diffs_path), tuple(version_pairs))["by_table"]
+    return availability_from_mask(masks.get(sanitize_filename(table_label), 0), version_pairs)
 
-    for from_tag, to_tag, _from_name, _to_name, slug in version_pairs:
-        diff_file = base_diffs_path / f"{from_tag}_to_{to_tag}" / "by_table" / f"{safe_name}.diff"
-        availability[slug] = diff_file.exists()
 
-    return availability
+def availability_data(version_pairs: list[tuple], base_diffs_path: Path) -> dict:
+    """The availability matrix: pair slugs in bit order and each kind's stem → mask."""
+    index = availability_index(str(base_diffs_path), tuple(version_pairs))
+    data = {"pairs": [pair[4] for pair in version_pairs]}
+    for kind, key in AVAILABILITY_KINDS.items():
+        data[key] = index[kind]
+    return data
+
+
+def write_availability_json(
+    output_path: Path, version_pairs: list[tuple], base_diffs_path: Path
+) -> Path:
+    """Write the availability matrix for navigation.js.
+
+    The file lists the pair slugs in bit order and, per kind, each diff file
+    stem's mask, so pages can refresh their version timeline client-side.
+
+    Args:
+        output_path: Site output directory
+        version_pairs: List of version pair tuples from VERSION_PAIRS
+        base_diffs_path: Base path to diffs directory (e.g., Path('diffs'))
+
+    Returns:
+        Path of the written file
+    """
+    availability_file = output_path / AVAILABILITY_FILENAME
+    availability_file.write_text(
+        json.dumps(availability_data(version_pairs, base_diffs_path), separators=(",", ":")),
+        encoding="utf-8",
+    )
+    return availability_file
+
+
+# Templates every diff page renders, compiled once per worker
+PAGE_TEMPLATES = ("diff_page.html", "_author_banner.html", "_footer.html")
+
+
+@cache
+def page_environment(templates_dir: str) -> Environment:
+    """Jinja2 environment for diff pages, created once per process."""
+    return Environment(loader=FileSystemLoader(templates_dir))
+
+
+def init_page_worker(templates_dir: str) -> None:
+    """Process pool initializer: build the Jinja2 environment and compile page templates."""
+    env = page_environment(templates_dir)
+    for name in PAGE_TEMPLATES:
+        env.get_template(name)
+
+
+# Input hash of every diff page from the last build, kept in the site root
+BUILD_MANIFEST_FILENAME = ".build-manifest.json"
+BUILD_MANIFEST_VERSION = 1
+
+# Stage and per-page timings of the last build (see BuildTimer)
+BUILD_TIMINGS_FILENAME = ".build-timings.json"
+
+# Context entries that do not affect a page's HTML. generated_date is rendered,
+# but only pages whose inputs changed should get a new date. The cppstdmd SHA
+# (footer and markdown source links) is the repository HEAD, which every commit
+# moves: a skipped page keeps linking the commit it was rendered from, which
+# still has its markdown, instead of every page re-rendering and re-dating.
+_UNHASHED_CONTEXT_KEYS = frozenset(
+    {
+        "force",
+        "generated_date",
+        "diff2html_cmd",
+        "input_hash",
+        "cppstdmd_sha",
+        "cppstdmd_short_sha",
+    }
+)
+
+
+def _read_build_manifest(output_path: Path) -> dict:
+    try:
+        data = json.loads((output_path / BUILD_MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if data.get("version") == BUILD_MANIFEST_VERSION else {}
 
 
-def generate_single_diff(args: tuple) -> tuple[bool, str, str]:
+def load_build_manifest(output_path: Path) -> dict[str, str]:
+    """Page path (relative to the site root) → input hash, from the previous build."""
+    return _read_build_manifest(output_path).get("pages", {})
+
+
+def load_page_dates(output_path: Path) -> dict[str, str]:
+    """Page path → date (YYYY-MM-DD) its input hash last changed, from the previous build."""
+    return _read_build_manifest(output_path).get("changed", {})
+
+
+def load_search_hashes(output_path: Path) -> dict[str, str]:
+    """Version pair slug → search index hash, from the previous build."""
+    return _read_build_manifest(output_path).get("search", {})
+
+
+def save_build_manifest(
+    output_path: Path,
+    pages: dict[str, str],
+    changed: dict[str, str] | None = None,
+    search: dict[str, str] | None = None,
+) -> None:
+    """Write the page → input hash, page → change date and search hash maps for the next build."""
+    data = {
+        "version": BUILD_MANIFEST_VERSION,
+        "pages": pages,
+        "changed": changed or {},
+        "search": search or {},
+    }
+    (output_path / BUILD_MANIFEST_FILENAME).write_text(
+        json.dumps(data, indent=0, sort_keys=True), encoding="utf-8"
+    )
+
+
+def page_change_dates(
+    pages: dict[str, str],
+    previous_pages: dict[str, str],
+    previous_dates: dict[str, str],
+    today: str,
+) -> dict[str, str]:
+    """Carry each page's change date over while its input hash is unchanged, else use today."""
+    return {
+        page: (
+            previous_dates[page]
+            if previous_pages.get(page) == input_hash and page in previous_dates
+            else today
+        )
+        for page, input_hash in pages.items()
+        if input_hash
+    }
+
+
+@cache
+def page_sources_hash(templates_dir: str) -> str:
+    """SHA-256 over the diff page templates and the diff renderer's source."""
+    digest = hashlib.sha256()
+    sources = [Path(templates_dir) / name for name in PAGE_TEMPLATES]
+    sources.append(Path(sys.modules[render_side_by_side_chunks.__module__].__file__))
+    for source in sources:
+        digest.update(source.name.encode("utf-8"))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def page_input_hash(item: dict, context: dict, templates_dir: str) -> str:
+    """Hash of everything a diff page is rendered from.
+
+    Covers the diff content, the page templates and renderer source, the
+    version pair list (timeline labels) and the page's rendering context, so a
+    page whose hash matches the previous build's would render identically.
+    """
+    inputs = {
+        "diff": item.get("diff_hash"),
+        "sources": page_sources_hash(templates_dir),
+        "chunk_lines": DIFF_CHUNK_LINES,
+        "version_pairs": VERSION_PAIRS,
+        "context": {k: v for k, v in context.items() if k not in _UNHASHED_CONTEXT_KEYS},
+    }
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def prune_stale_pages(output_path: Path, previous: dict[str, str], current: dict[str, str]) -> int:
+    """Delete pages the previous build wrote that this build no longer produces.
+
+    Directories left empty (e.g. for a removed version pair) are removed too.
+
+    Returns:
+        Number of pages deleted
+    """
+    removed = 0
+    for page in sorted(previous.keys() - current.keys()):
+        page_file = output_path / page
+        if not page_file.exists():
+            continue
+        page_file.unlink()
+        shutil.rmtree(diff_chunk_dir(page_file), ignore_errors=True)
+        removed += 1
+        parent = page_file.parent
+        while parent != output_path and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    return removed
+
+
+# Diffs longer than this many lines are split into parts of about this size:
+# the page holds the first part and navigation.js fetches the rest on scroll
+DIFF_CHUNK_LINES = 1500
+
+
+def diff_chunk_dir(page_file: Path) -> Path:
+    """Directory holding the lazily loaded parts of a diff page (array.html → array.chunks/)."""
+    return page_file.with_suffix(".chunks")
+
+
+def diff_chunk_urls(page_file: Path, count: int) -> list[str]:
+    """Page-relative URLs of diff parts 1..count (array.chunks/1.html, ...)."""
+    return [f"{diff_chunk_dir(page_file).name}/{number}.html" for number in range(1, count + 1)]
+
+
+def write_diff_chunks(page_file: Path, chunks: list[str]) -> list[str]:
+    """Write diff parts 1.. as HTML fragments next to the page, replacing old ones.
+
+    Returns:
+        Page-relative URLs of the written fragments
+    """
+    chunk_dir = diff_chunk_dir(page_file)
+    if chunk_dir.exists():
+        shutil.rmtree(chunk_dir)
+    if not chunks:
+        return []
+
+    ensure_dir(chunk_dir)
+    for number, chunk in enumerate(chunks, start=1):
+        (chunk_dir / f"{number}.html").write_text(chunk, encoding="utf-8")
+    return diff_chunk_urls(page_file, len(chunks))
+
+
+def generate_single_diff(args: tuple) -> tuple[bool, str, str, dict]:
     """Worker function to generate a single diff HTML (for parallel execution).
 
     This function is designed to be called from ProcessPoolExecutor.
@@ -1194,46 +1553,154 @@ def generate_single_diff(args: tuple) -> tuple[bool, str, str]:
         args: Tuple of (item, diff_output_dir, context, templates_dir) where:
             item: Dict with stable name info (name, file, path, size_kb, line_count)
             diff_output_dir: Path to output directory for diff HTML files
-            context: Dict with metadata for the diff (includes 'force' key for cache bypass)
+            context: Dict with metadata for the diff
             templates_dir: Path to templates directory for Jinja2
 
     Returns:
-        Tuple of (success, stable_name, message) for logging
+        Tuple of (success, stable_name, message, steps) where steps maps "render"
+        and "assemble" to the wall/CPU seconds they took in this worker
     """
     item, diff_output_dir, context, templates_dir = args
 
     stable_name = item["name"]
     output_file = Path(diff_output_dir) / f"{item['file']}.html"
-    input_diff = item["path"]
-    force = context.get("force", False)
+    steps: dict[str, dict] = {}
 
     try:
-        # Skip if output HTML exists and is newer than all inputs (unless forced)
-        if not force and output_file.exists() and input_diff.exists():
-            output_mtime = output_file.stat().st_mtime
-            input_mtime = input_diff.stat().st_mtime
-            correlations_mtime = context.get("correlations_mtime", 0)
-            # Regenerate if diff OR correlations file is newer than output
-            if output_mtime > input_mtime and output_mtime > correlations_mtime:
-                return (True, stable_name, "skipped (unchanged)")
-
-        # Create Jinja2 environment for this worker
-        from jinja2 import Environment, FileSystemLoader
+        # Jinja2 environment built once per worker process
+        env = page_environment(str(templates_dir))
+
+        chunks: list[str] = []
+        with measure() as steps["render"]:
+            if context.get("diff_renderer", "python") == "python":
+                # Render in-process: no Node.js startup and no temp file for packed diffs.
+                # Large diffs keep their first part in the page and the rest as fragments
+                diff_html, *chunks = render_side_by_side_chunks(
+                    load_diff_text(item), DIFF_CHUNK_LINES
+                )
+            else:
+                # Generate HTML with diff2html (packed diffs go through a temp file)
+                with diff_input_file(item) as diff_file:
+                    if not generate_diff_html(diff_file, output_file, context):
+                        return (False, stable_name, "diff2html failed", steps)
+                diff_html = extract_diff_fragment(output_file.read_text(encoding="utf-8"))
 
-        env = Environment(loader=FileSystemLoader(str(templates_dir)))
+        # Wrap the diff in the page template (navigation, metadata, footer)
+        with measure() as steps["assemble"]:
+            ensure_dir(output_file.parent)
+            chunk_urls = write_diff_chunks(output_file, chunks)
+            page = assemble_diff_page(diff_html, output_file, context, env, chunk_urls)
+            output_file.write_text(page, encoding="utf-8")
 
-        # Generate HTML with diff2html
-        if not generate_diff_html(item["path"], output_file, context):
-            return (False, stable_name, "diff2html failed")
+        return (True, stable_name, "success", steps)
 
-        # Inject custom navigation
-        if not inject_navigation(output_file, context, env):
-            return (False, stable_name, "navigation injection failed")
+    except Exception as e:
+        return (False, stable_name, f"exception: {e}", steps)
 
-        return (True, stable_name, "success")
 
-    except Exception as e:
-        return (False, stable_name, f"exception: {e}")
+def render_version_overview(
+    config: VersionPairConfig, stable_names: list[dict], sha_info: dict
+) -> str:
+    """Render versions/<slug>.html, the list of changed sections of a version pair."""
+    template = config.env.get_template("version_overview.html")
+    generated_date = datetime.now().strftime("%Y-%m-%d")
+    stats = {"generated_date": generated_date}
+
+    return template.render(
+        from_name=config.from_name,
+        to_name=config.to_name,
+        from_tag=config.from_tag,
+        to_tag=config.to_tag,
+        slug=config.slug,
+        stable_names=stable_names,
+        version_pairs=VERSION_PAIRS,
+        stats=stats,
+        generated_date=generated_date,
+        cppstdmd_sha=sha_info["sha"],
+        cppstdmd_short_sha=sha_info["short_sha"],
+    )
+
+
+def render_tables_overview(config: VersionPairConfig, tables: list[dict], sha_info: dict) -> str:
+    """Render versions/<slug>-tables.html, the list of changed tables of a version pair."""
+    template = config.env.get_template("tables_overview.html")
+    return template.render(
+        from_name=config.from_name,
+        to_name=config.to_name,
+        from_tag=config.from_tag,
+        to_tag=config.to_tag,
+        slug=config.slug,
+        tables=tables,
+        version_pairs=VERSION_PAIRS,
+        generated_date=datetime.now().strftime("%Y-%m-%d"),
+        cppstdmd_sha=sha_info["sha"],
+        cppstdmd_short_sha=sha_info["short_sha"],
+    )
+
+
+def section_page_context(
+    config: VersionPairConfig, item: dict, sha_info: dict, episode_correlations: dict
+) -> dict:
+    """Rendering context for the diff page of a section from collect_stable_names()."""
+    # Build availability lookup to avoid race conditions during parallel processing
+    stable_name_availability = build_stable_name_availability(
+        stable_name=item["name"],
+        version_pairs=VERSION_PAIRS,
+        base_diffs_path=Path("diffs"),
+    )
+
+    return {
+        "title": f"[{item['name']}] - {config.from_name} → {config.to_name}",
+        "stable_name": item["name"],
+        "stable_name_file": item["file"],
+        "from_version": config.from_name,
+        "to_version": config.to_name,
+        "from_tag": config.from_tag,
+        "to_tag": config.to_tag,
+        "version_slug": config.slug,
+        "file_size_kb": item["size_kb"],
+        "line_count": item["line_count"],
+        "generated_date": datetime.now().strftime("%Y-%m-%d"),
+        "stable_name_availability": stable_name_availability,
+        "cppstdmd_sha": sha_info["sha"],
+        "cppstdmd_short_sha": sha_info["short_sha"],
+        "episode_correlations": episode_correlations.get(item["name"], []),
+        "force": config.force,
+        "diff_renderer": config.diff_renderer,
+        "diff2html_cmd": config.diff2html_cmd,
+        "page_assets": config.page_assets,
+    }
+
+
+def table_page_context(config: VersionPairConfig, item: dict, sha_info: dict) -> dict:
+    """Rendering context for the diff page of a table from collect_tables()."""
+    table_availability = build_table_availability(
+        table_label=item["label"],
+        version_pairs=VERSION_PAIRS,
+        base_diffs_path=Path("diffs"),
+    )
+    return {
+        "title": f"Table [{item['label']}] - {config.from_name} → {config.to_name}",
+        "stable_name": item["label"],  # Reuse stable_name field for compatibility
+        "table_caption": item["caption"],
+        "stable_name_file": item["file"],
+        "from_version": config.from_name,
+        "to_version": config.to_name,
+        "from_tag": config.from_tag,
+        "to_tag": config.to_tag,
+        "version_slug": config.slug,
+        "file_size_kb": item["size_kb"],
+        "line_count": item["line_count"],
+        "generated_date": datetime.now().strftime("%Y-%m-%d"),
+        "stable_name_availability": table_availability,
+        "is_table": True,
+        "cppstdmd_sha": sha_info["sha"],
+        "cppstdmd_short_sha": sha_info["short_sha"],
+        "force": config.force,
+        "diff_renderer": config.diff_renderer,
+        "diff2html_cmd": config.diff2html_cmd,
+        "page_assets": config.page_assets,
+    }
 
 
 def generate_version_pair(config: VersionPairConfig) -> dict:
@@ -1263,7 +1730,8 @@ def generate_version_pair(config: VersionPairConfig) -> dict:
         }
 
     # Collect stable names
-    stable_names = collect_stable_names(diff_dir, max_dots=config.max_dots, limit=config.limit)
+    with config.timer.stage("collection"):
+        stable_names = collect_stable_names(diff_dir, max_dots=config.max_dots, limit=config.limit)
 
     if config.max_dots is not None:
         print(f"  Found {len(stable_names)} stable names (max {config.max_dots} dots)")
@@ -1288,189 +1756,66 @@ def generate_version_pair(config: VersionPairConfig) -> dict:
     # Load episode correlations (do this once for all pages)
     episode_correlations = load_episode_correlations(config.output_path)
 
-    # Get correlations file mtime for cache invalidation
-    correlations_file = config.output_path / "data" / "game" / "episode-correlations.json"
-    correlations_mtime = correlations_file.stat().st_mtime if correlations_file.exists() else 0
-
     # Generate overview page
-    template = config.env.get_template("version_overview.html")
-    generated_date = datetime.now().strftime("%Y-%m-%d")
-    stats = {"generated_date": generated_date}
-
-    content = template.render(
-        from_name=config.from_name,
-        to_name=config.to_name,
-        from_tag=config.from_tag,
-        to_tag=config.to_tag,
-        slug=config.slug,
-        stable_names=stable_names,
-        version_pairs=VERSION_PAIRS,
-        stats=stats,
-        generated_date=generated_date,
-        cppstdmd_sha=sha_info["sha"],
-        cppstdmd_short_sha=sha_info["short_sha"],
-    )
-
-    version_dir = config.output_path / "versions"
-    version_dir.mkdir(exist_ok=True, parents=True)
-    overview_file = version_dir / f"{config.slug}.html"
-    overview_file.write_text(content, encoding="utf-8")
+    with config.timer.stage("overview"):
+        content = render_version_overview(config, stable_names, sha_info)
+        version_dir = config.output_path / "versions"
+        version_dir.mkdir(exist_ok=True, parents=True)
+        overview_file = version_dir / f"{config.slug}.html"
+        overview_file.write_text(content, encoding="utf-8")
     print(f"  ✓ Generated overview: {overview_file}")
 
     # Note: Search index generation moved to after table collection
 
-    # Generate individual diff pages in parallel
+    # Prepare individual diff pages (rendered later by render_diff_pages in one shared pool)
     diff_output_dir = config.output_path / "diffs" / config.slug
     ensure_dir(diff_output_dir)
 
     # Prepare tasks for parallel execution
     tasks = []
     for item in stable_names:
-        # Build availability lookup to avoid race conditions during parallel processing
-        stable_name_availability = build_stable_name_availability(
-            stable_name=item["name"],
-            version_pairs=VERSION_PAIRS,
-            base_diffs_path=Path("diffs"),
-        )
-
-        context = {
-            "title": f"[{item['name']}] - {config.from_name} → {config.to_name}",
-            "stable_name": item["name"],
-            "stable_name_file": item["file"],
-            "from_version": config.from_name,
-            "to_version": config.to_name,
-            "from_tag": config.from_tag,
-            "to_tag": config.to_tag,
-            "version_slug": config.slug,
-            "file_size_kb": item["size_kb"],
-            "line_count": item["line_count"],
-            "generated_date": datetime.now().strftime("%Y-%m-%d"),
-            "stable_name_availability": stable_name_availability,
-            "cppstdmd_sha": sha_info["sha"],
-            "cppstdmd_short_sha": sha_info["short_sha"],
-            "episode_correlations": episode_correlations.get(item["name"], []),
-            "correlations_mtime": correlations_mtime,
-            "force": config.force,
-        }
+        context = section_page_context(config, item, sha_info, episode_correlations)
         # Get templates directory from config.env.loader
         templates_dir = Path(config.env.loader.searchpath[0])
+        context["input_hash"] = page_input_hash(item, context, str(templates_dir))
         tasks.append((item, str(diff_output_dir), context, str(templates_dir)))
 
-    # Execute tasks in parallel
-    success_count = 0
-    completed_count = 0
-
-    with ProcessPoolExecutor(max_workers=config.max_workers) as executor:
-        # Submit all tasks
-        future_to_name = {
-            executor.submit(generate_single_diff, task): task[0]["name"] for task in tasks
-        }
-
-        # Process completed tasks
-        for future in as_completed(future_to_name):
-            completed_count += 1
-            stable_name = future_to_name[future]
-
-            try:
-                success, name, message = future.result()
-                status_symbol = "✓" if success else "✗"
-                print(f"  [{completed_count}/{len(stable_names)}] [{name}] {status_symbol}")
-
-                if success:
-                    success_count += 1
-                elif message != "success":
-                    print(f"      └─ {message}")
-
-            except Exception as e:
-                print(f"  [{completed_count}/{len(stable_names)}] [{stable_name}] ✗")
-                print(f"      └─ exception: {e}")
-
-    print(f"  ✓ Successfully generated {success_count}/{len(stable_names)} diffs")
+    table_tasks = []
 
     # Process tables
     table_diff_dir = Path(f"diffs/{config.from_tag}_to_{config.to_tag}/by_table")
-    tables = collect_tables(table_diff_dir, limit=config.limit)
+    with config.timer.stage("collection"):
+        tables = collect_tables(table_diff_dir, limit=config.limit)
     table_count = len(tables)
 
     if tables:
         print(f"  Found {table_count} table diffs")
 
         # Generate tables overview page
-        try:
-            tables_template = config.env.get_template("tables_overview.html")
-            tables_content = tables_template.render(
-                from_name=config.from_name,
-                to_name=config.to_name,
-                from_tag=config.from_tag,
-                to_tag=config.to_tag,
-                slug=config.slug,
-                tables=tables,
-                version_pairs=VERSION_PAIRS,
-                generated_date=datetime.now().strftime("%Y-%m-%d"),
-                cppstdmd_sha=sha_info["sha"],
-                cppstdmd_short_sha=sha_info["short_sha"],
-            )
-            tables_overview_file = version_dir / f"{config.slug}-tables.html"
-            tables_overview_file.write_text(tables_content, encoding="utf-8")
-            print(f"  ✓ Generated tables overview: {tables_overview_file}")
-        except Exception as e:
-            print(f"  ⚠️  Could not generate tables overview: {e}")
+        with config.timer.stage("overview"):
+            try:
+                tables_content = render_tables_overview(config, tables, sha_info)
+                tables_overview_file = version_dir / f"{config.slug}-tables.html"
+                tables_overview_file.write_text(tables_content, encoding="utf-8")
+                print(f"  ✓ Generated tables overview: {tables_overview_file}")
+            except Exception as e:
+                print(f"  ⚠️  Could not generate tables overview: {e}")
 
         # Generate individual table diff pages
         table_output_dir = config.output_path / "diffs" / config.slug / "tables"
         ensure_dir(table_output_dir)
 
-        table_tasks = []
         for item in tables:
-            table_availability = build_table_availability(
-                table_label=item["label"],
-                version_pairs=VERSION_PAIRS,
-                base_diffs_path=Path("diffs"),
-            )
-            context = {
-                "title": f"Table [{item['label']}] - {config.from_name} → {config.to_name}",
-                "stable_name": item["label"],  # Reuse stable_name field for compatibility
-                "table_caption": item["caption"],
-                "stable_name_file": item["file"],
-                "from_version": config.from_name,
-                "to_version": config.to_name,
-                "from_tag": config.from_tag,
-                "to_tag": config.to_tag,
-                "version_slug": config.slug,
-                "file_size_kb": item["size_kb"],
-                "line_count": item["line_count"],
-                "generated_date": datetime.now().strftime("%Y-%m-%d"),
-                "stable_name_availability": table_availability,
-                "is_table": True,
-                "cppstdmd_sha": sha_info["sha"],
-                "cppstdmd_short_sha": sha_info["short_sha"],
-                "force": config.force,
-            }
+            context = table_page_context(config, item, sha_info)
             templates_dir = Path(config.env.loader.searchpath[0])
             # Modify item to point to table diff file
             table_item = item.copy()
             table_item["name"] = item["label"]  # For compatibility with generate_single_diff
+            context["input_hash"] = page_input_hash(table_item, context, str(templates_dir))
             table_tasks.append((table_item, str(table_output_dir), context, str(templates_dir)))
 
-        # Execute table tasks in parallel
-        table_success = 0
-        with ProcessPoolExecutor(max_workers=config.max_workers) as executor:
-            future_to_label = {
-                executor.submit(generate_single_diff, task): task[0]["label"]
-                for task in table_tasks
-            }
-            for future in as_completed(future_to_label):
-                try:
-                    success, _name, _message = future.result()
-                    if success:
-                        table_success += 1
-                except Exception:
-                    pass
-
-        print(f"  ✓ Generated {table_success}/{table_count} table diff pages")
-
-    # Generate search index (includes both sections and tables)
-    generate_search_index(stable_names, version_dir, config.slug, tables=tables)
+    # The search index (sections and tables) is built later by
+    # generate_search_indexes() in the shared pool
 
     # Calculate statistics
     total_size_kb = sum(item["size_kb"] for item in stable_names)
@@ -1481,6 +1826,7 @@ def generate_version_pair(config: VersionPairConfig) -> dict:
     sections = [
         {
             "name": item["name"],
+            "file": item["file"],
             "size_kb": item["size_kb"],
             "lines": item["line_count"],
             "from_name": config.from_name,
@@ -1491,7 +1837,7 @@ def generate_version_pair(config: VersionPairConfig) -> dict:
     ]
 
     return {
-        "count": success_count,
+        "count": 0,  # Filled in by render_diff_pages()
         "total_size_kb": round(total_size_kb, 1),
         "total_lines": total_lines,
         "avg_size_kb": avg_size_kb,
@@ -1500,9 +1846,138 @@ def generate_version_pair(config: VersionPairConfig) -> dict:
         "from_name": config.from_name,
         "to_name": config.to_name,
         "slug": config.slug,
+        "tasks": tasks,
+        "table_tasks": table_tasks,
+        "search": (stable_names, tables, version_dir),
     }
 
 
+def generate_search_indexes(
+    pair_stats_list: list[dict],
+    executor: Executor,
+    previous: dict[str, str] | None = None,
+) -> dict[str, str]:
+    """Build the search index of every version pair in a shared pool.
+
+    A pair whose search_index_hash() matches previous and whose files still
+    exist is skipped. The "search" entries are removed from the stats.
+
+    Args:
+        pair_stats_list: Statistics dicts returned by generate_version_pair()
+        executor: Process pool to tokenize the diffs in
+        previous: Slug → search index hash from the previous build
+
+    Returns:
+        Slug → search index hash for every pair indexed or up to date
+    """
+    previous = previous or {}
+    hashes: dict[str, str] = {}
+    for pair_stats in pair_stats_list:
+        search = pair_stats.pop("search", None)
+        if search is None:
+            continue
+        stable_names, tables, version_dir = search
+        slug = pair_stats["slug"]
+        input_hash = search_index_hash(stable_names, tables)
+        documents_file = version_dir / f"{slug}_search" / SEARCH_DOCUMENTS_FILENAME
+        if previous.get(slug) == input_hash and documents_file.exists():
+            print(f"  ✓ {slug}: search index unchanged")
+        else:
+            generate_search_index(stable_names, version_dir, slug, tables=tables, executor=executor)
+        hashes[slug] = input_hash
+    return hashes
+
+
+def render_diff_pages(
+    pair_stats_list: list[dict],
+    executor: ProcessPoolExecutor,
+    previous_pages: dict[str, str] | None = None,
+    site_root: Path | None = None,
+    timer: BuildTimer | None = None,
+) -> dict[str, str]:
+    """Render the diff pages of every version pair through one process pool.
+
+    Pages whose input hash matches previous_pages and whose file still exists
+    are skipped (unless the context has "force"). The rest of the section and
+    table pages from all pairs form a single queue, submitted largest diff
+    first so the slowest pages start early instead of trailing at the end of
+    the run. Each pair's "count" is set to its number of section pages
+    generated or up to date, and the task lists are removed from the stats.
+
+    Args:
+        pair_stats_list: Statistics dicts returned by generate_version_pair()
+        executor: Process pool whose workers ran init_page_worker()
+        previous_pages: Page → input hash map from the previous build
+        site_root: Directory the page paths are relative to
+        timer: Receives each rendered page's worker timings and diff size
+
+    Returns:
+        Page → input hash for every page of this build ("" for failed pages, so
+        they are rendered again next time)
+    """
+    previous_pages = previous_pages or {}
+    pages: dict[str, str] = {}
+    successes: dict[tuple[int, str], int] = {}
+
+    queue = []
+    for pair_stats in pair_stats_list:
+        for kind in ("tasks", "table_tasks"):
+            for task in pair_stats.pop(kind, []):
+                item, diff_output_dir, context, _templates_dir = task
+                page_file = Path(diff_output_dir) / f"{item['file']}.html"
+                page = (page_file.relative_to(site_root) if site_root else page_file).as_posix()
+                input_hash = context.get("input_hash", "")
+
+                unchanged = input_hash and previous_pages.get(page) == input_hash
+                if unchanged and not context.get("force") and page_file.exists():
+                    pages[page] = input_hash
+                    key = (id(pair_stats), kind)
+                    successes[key] = successes.get(key, 0) + 1
+                    continue
+
+                queue.append((pair_stats, kind, task, page))
+    queue.sort(key=lambda entry: entry[2][0]["size_kb"], reverse=True)
+
+    print(f"\n🖨️  Rendering {len(queue)} diff pages ({len(pages)} unchanged)...")
+    future_to_entry = {executor.submit(generate_single_diff, entry[2]): entry for entry in queue}
+
+    completed_count = 0
+    for future in as_completed(future_to_entry):
+        completed_count += 1
+        pair_stats, kind, task, page = future_to_entry[future]
+        prefix = f"  [{completed_count}/{len(queue)}] {pair_stats['slug']}"
+        pages[page] = ""
+
+        try:
+            success, name, message, *steps = future.result()
+            if timer is not None:
+                timer.add_page(page, task[0].get("size_kb", 0), steps[0] if steps else {}, success)
+            status_symbol = "✓" if success else "✗"
+            print(f"{prefix} [{name}] {status_symbol}")
+
+            if success:
+                pages[page] = task[2].get("input_hash", "")
+                key = (id(pair_stats), kind)
+                successes[key] = successes.get(key, 0) + 1
+            elif message != "success":
+                print(f"      └─ {message}")
+
+        except Exception as e:
+            print(f"{prefix} [{task[0]['name']}] ✗")
+            print(f"      └─ exception: {e}")
+
+    for pair_stats in pair_stats_list:
+        pair_stats["count"] = successes.get((id(pair_stats), "tasks"), 0)
+        table_success = successes.get((id(pair_stats), "table_tasks"), 0)
+        print(
+            f"  ✓ {pair_stats['from_name']} → {pair_stats['to_name']}: "
+            f"{pair_stats['count']} diff pages, "
+            f"{table_success}/{pair_stats.get('table_count', 0)} table diff pages"
+        )
+
+    return pages
+
+
 def generate_landing_page(output_path: Path, env: Environment, stats: dict):
     """Generate the landing page.
 
@@ -1530,13 +2005,16 @@ def generate_landing_page(output_path: Path, env: Environment, stats: dict):
     print(f"  ✓ Generated: {index_file}")
 
 
-def generate_statistics_page(output_path: Path, env: Environment, stats: dict):
+def generate_statistics_page(
+    output_path: Path, env: Environment, stats: dict, timer: BuildTimer | None = None
+):
     """Generate the statistics page with metrics and insights.
 
     Args:
         output_path: Base output directory
         env: Jinja2 environment
         stats: Dictionary with statistics about generated pages
+        timer: Build timings to show (stages so far and the slowest diff pages)
     """
     print("\n📊 Generating statistics page...")
 
@@ -1598,6 +2076,8 @@ def generate_statistics_page(output_path: Path, env: Environment, stats: dict):
         generated_date=stats.get("generated_date", "recently"),
         cppstdmd_sha=sha_info["sha"],
         cppstdmd_short_sha=sha_info["short_sha"],
+        timings=timer.report() if timer is not None else None,
+        slowest_pages=timer.slowest_pages() if timer is not None else [],
     )
 
     stats_file = output_path / "statistics.html"
@@ -1633,9 +2113,10 @@ def copy_static_assets(output_path: Path):
         print("  ✓ Copied custom.css")
 
     # Copy JS if exists
-    if Path("templates/js/navigation.js").exists():
-        shutil.copy("templates/js/navigation.js", js_dir / "navigation.js")
-        print("  ✓ Copied navigation.js")
+    for js_file in ("navigation.js", "evolution.js"):
+        if Path(f"templates/js/{js_file}").exists():
+            shutil.copy(f"templates/js/{js_file}", js_dir / js_file)
+            print(f"  ✓ Copied {js_file}")
 
     # Copy Source Sans Pro and Source Code Pro fonts
     fonts_src = Path("templates/fonts")
@@ -1685,6 +2166,120 @@ def copy_static_assets(output_path: Path):
     print("  ✓ Created .nojekyll")
 
 
+# Sitemap protocol limits per file
+SITEMAP_MAX_URLS = 50_000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+class SitemapWriter:
+    """Stream sitemap <url> entries into files within the protocol's limits.
+
+    URLs are written as they are added, to sitemap-1.xml, sitemap-2.xml, ...,
+    starting a new file before one would exceed max_urls entries or max_bytes.
+    On close a single file is renamed to sitemap.xml; several are listed by a
+    sitemap.xml index instead. Numbered files left over from larger earlier
+    builds are deleted.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        base_url: str,
+        max_urls: int = SITEMAP_MAX_URLS,
+        max_bytes: int = SITEMAP_MAX_BYTES,
+    ):
+        self.output_path = output_path
+        self.base_url = base_url.rstrip("/")
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.files: list[Path] = []
+        self.url_count = 0
+        self._file = None
+        self._file_urls = 0
+        self._file_bytes = 0
+        self._file_lastmod: list[str | None] = []
+
+    _HEADER = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+    _FOOTER = "</urlset>\n"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._file:
+            self._file.close()
+
+    def _finish_file(self):
+        if self._file:
+            self._file.write(self._FOOTER)
+            self._file.close()
+            self._file = None
+
+    def add(self, path: str, priority: str, changefreq: str, lastmod: str | None = None):
+        """Add a site-relative page path ("" for the home page)."""
+        entry = f"  <url>\n    <loc>{xml_escape(f'{self.base_url}/{path}')}</loc>\n"
+        if lastmod:
+            entry += f"    <lastmod>{lastmod}</lastmod>\n"
+        entry += (
+            f"    <priority>{priority}</priority>\n"
+            f"    <changefreq>{changefreq}</changefreq>\n  </url>\n"
+        )
+        size = len(entry.encode("utf-8"))
+
+        full = self._file_urls >= self.max_urls or (
+            self._file_bytes + size + len(self._FOOTER) > self.max_bytes
+        )
+        if self._file is None or full:
+            self._finish_file()
+            shard = self.output_path / f"sitemap-{len(self.files) + 1}.xml"
+            self.files.append(shard)
+            self._file_lastmod.append(None)
+            self._file = shard.open("w", encoding="utf-8")
+            self._file.write(self._HEADER)
+            self._file_urls = 0
+            self._file_bytes = len(self._HEADER)
+
+        self._file.write(entry)
+        self._file_urls += 1
+        self._file_bytes += size
+        self.url_count += 1
+        if lastmod and (self._file_lastmod[-1] or "") < lastmod:
+            self._file_lastmod[-1] = lastmod
+
+    def close(self):
+        """Finish the last file and write sitemap.xml."""
+        self._finish_file()
+        index_file = self.output_path / "sitemap.xml"
+
+        if len(self.files) <= 1:
+            if self.files:
+                self.files[0].replace(index_file)
+            else:
+                index_file.write_text(self._HEADER + self._FOOTER, encoding="utf-8")
+            self.files = [index_file]
+        else:
+            with index_file.open("w", encoding="utf-8") as index:
+                index.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+                index.write(f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n')
+                for shard, lastmod in zip(self.files, self._file_lastmod, strict=True):
+                    index.write(
+                        f"  <sitemap>\n    <loc>{xml_escape(f'{self.base_url}/{shard.name}')}</loc>\n"
+                    )
+                    if lastmod:
+                        index.write(f"    <lastmod>{lastmod}</lastmod>\n")
+                    index.write("  </sitemap>\n")
+                index.write("</sitemapindex>\n")
+
+        # Numbered sitemaps beyond this build's count are stale
+        keep = {shard.name for shard in self.files}
+        for old in self.output_path.glob("sitemap-*.xml"):
+            if old.name not in keep:
+                old.unlink()
+
+
 def generate_seo_files(output_path: Path, stats: dict, base_url: str = "https://cppstdmd.com"):
     """Generate robots.txt and sitemap.xml for SEO.
 
@@ -1708,67 +2303,315 @@ Sitemap: {base_url}/sitemap.xml
     robots_file.write_text(robots_content, encoding="utf-8")
     print("  ✓ Generated robots.txt")
 
-    # Generate sitemap.xml
-    sitemap_urls = []
+    # Generate sitemap.xml (diff pages come from the build manifest)
+    page_dates = load_page_dates(output_path)
+
+    with SitemapWriter(output_path, base_url) as sitemap:
+        sitemap.add("", "1.0", "weekly")
+
+        # Add version overview pages
+        for _from_tag, _to_tag, _from_name, _to_name, slug in VERSION_PAIRS:
+            sitemap.add(f"versions/{slug}.html", "0.8", "weekly")
+
+        # Add all diff pages, dated by the last change of their inputs
+        for page, input_hash in sorted(load_build_manifest(output_path).items()):
+            if not input_hash:
+                continue  # Failed to render
+            priority = "0.5" if "/tables/" in page else "0.6"
+            sitemap.add(page, priority, "monthly", page_dates.get(page))
+
+        # Add episode pages (if generated)
+        episodes_dir = output_path / "episodes"
+        if episodes_dir.exists():
+            # Add episode index
+            sitemap.add("episodes/index.html", "0.8", "weekly")
+            # Add individual episode pages
+            for ep_file in sorted(episodes_dir.glob("*.html")):
+                if ep_file.name != "index.html":
+                    sitemap.add(f"episodes/{ep_file.name}", "0.6", "monthly")
+
+    if len(sitemap.files) > 1:
+        print(
+            f"  ✓ Generated sitemap.xml index of {len(sitemap.files)} sitemaps "
+            f"({sitemap.url_count} URLs)"
+        )
+    else:
+        print(f"  ✓ Generated sitemap.xml ({sitemap.url_count} URLs)")
+
+
+def precompress_site(output_path: Path, max_workers: int | None = None):
+    """Write precompressed .gz/.br siblings for the site's changed text assets."""
+    formats = available_formats()
+    print(f"\n🗜️  Precompressing text assets ({', '.join(formats)})...")
+    if "br" not in formats:
+        print("  Note: install 'brotli' to also write .br files")
 
-    # Add homepage
-    sitemap_urls.append({"loc": f"{base_url}/", "priority": "1.0", "changefreq": "weekly"})
+    result = precompress_tree(output_path, formats, max_workers)
+    print(
+        f"  ✓ Compressed {result['compressed']} files "
+        f"({result['unchanged']} unchanged, {result['removed']} removed)"
+    )
 
-    # Add version overview pages
-    for _from_tag, _to_tag, _from_name, _to_name, slug in VERSION_PAIRS:
-        sitemap_urls.append(
-            {"loc": f"{base_url}/versions/{slug}.html", "priority": "0.8", "changefreq": "weekly"}
+
+# Pages kept in memory by the --serve preview server
+PREVIEW_CACHE_SIZE = 256
+
+# Top-level directories served straight from templates/ by the preview server
+PREVIEW_STATIC_DIRS = ("css", "js", "fonts", "webfonts")
+
+_PREVIEW_OVERVIEW_RE = re.compile(r"versions/(?P<slug>[^/]+?)(?P<tables>-tables)?\.html")
+_PREVIEW_DIFF_RE = re.compile(
+    r"diffs/(?P<slug>[^/]+)/(?P<tables>tables/)?(?P<file>[^/]+?)"
+    r"(?:\.chunks/(?P<part>\d+))?\.html"
+)
+
+
+def _file_signature(path: Path) -> tuple | None:
+    """(mtime, size) of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _pair_signature(pair_dir: Path) -> tuple:
+    """Changes whenever a diff of the pair is added, removed or rewritten."""
+    entries = [
+        _file_signature(pair_dir / "manifest.json"),
+        _file_signature(pair_dir / PACK_FILENAME),
+    ]
+    for kind in AVAILABILITY_KINDS:
+        kind_dir = pair_dir / kind
+        if kind_dir.is_dir():
+            with os.scandir(kind_dir) as it:
+                entries.extend(sorted((entry.name, entry.stat().st_mtime_ns) for entry in it))
+    return tuple(entries)
+
+
+class PreviewSite:
+    """Renders site pages on request for the --serve preview server.
+
+    Version overviews and diff/table pages are rendered from diffs/ and
+    templates/ when they are requested and kept in an in-memory LRU cache. Each
+    entry records the modification times of its inputs (the page templates and
+    the diff, or the pair's whole directory for overviews), so after editing a
+    template or regenerating a diff the next request renders the page again.
+    Static assets come from templates/; anything else (landing page, search
+    index) from the last full build in the output directory.
+    """
+
+    def __init__(self, output_path: Path, templates_dir: Path, max_dots: int | None = None):
+        self.output_path = output_path
+        self.templates_dir = templates_dir
+        self.max_dots = max_dots
+        # auto_reload (the default) recompiles templates whose files changed
+        self.env = Environment(loader=FileSystemLoader(str(templates_dir)))
+        self.pairs = {pair[4]: pair for pair in VERSION_PAIRS}
+        self.cache: OrderedDict[str, tuple[tuple, list[bytes]]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.renders = 0
+        self.hits = 0
+
+    def pair_config(self, slug: str) -> VersionPairConfig:
+        from_tag, to_tag, from_name, to_name, slug = self.pairs[slug]
+        return VersionPairConfig(
+            from_tag=from_tag,
+            to_tag=to_tag,
+            from_name=from_name,
+            to_name=to_name,
+            slug=slug,
+            output_path=self.output_path,
+            env=self.env,
+            max_dots=self.max_dots,
         )
 
-    # Add all diff pages
-    for pair_stats in stats.get("version_pairs", []):
-        slug = pair_stats["slug"]
-        diff_dir = output_path / "diffs" / slug
-        if diff_dir.exists():
-            for diff_file in sorted(diff_dir.glob("*.html")):
-                sitemap_urls.append(
-                    {
-                        "loc": f"{base_url}/diffs/{slug}/{diff_file.name}",
-                        "priority": "0.6",
-                        "changefreq": "monthly",
-                    }
-                )
+    def pair_dir(self, slug: str) -> Path:
+        from_tag, to_tag, *_ = self.pairs[slug]
+        return Path("diffs") / f"{from_tag}_to_{to_tag}"
 
-    # Add episode pages (if generated)
-    episodes_dir = output_path / "episodes"
-    if episodes_dir.exists():
-        # Add episode index
-        sitemap_urls.append(
-            {"loc": f"{base_url}/episodes/index.html", "priority": "0.8", "changefreq": "weekly"}
+    def templates_signature(self) -> tuple:
+        return tuple(
+            sorted(
+                (str(path), path.stat().st_mtime_ns) for path in self.templates_dir.rglob("*.html")
+            )
         )
-        # Add individual episode pages
-        for ep_file in sorted(episodes_dir.glob("*.html")):
-            if ep_file.name != "index.html":
-                sitemap_urls.append(
-                    {
-                        "loc": f"{base_url}/episodes/{ep_file.name}",
-                        "priority": "0.6",
-                        "changefreq": "monthly",
-                    }
-                )
 
-    # Build XML
-    xml_lines = ['<?xml version="1.0" encoding="UTF-8"?>']
-    xml_lines.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+    def cached(self, key: str, signature: tuple, render) -> list[bytes] | None:
+        """Return the cached parts for key if its inputs are unchanged, else render them."""
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is not None and entry[0] == signature:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        parts = render()
+        if parts is None:
+            return None
+        with self.lock:
+            self.renders += 1
+            self.cache[key] = (signature, parts)
+            self.cache.move_to_end(key)
+            while len(self.cache) > PREVIEW_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return parts
+
+    def render_overview(self, slug: str, tables: bool) -> list[bytes] | None:
+        config = self.pair_config(slug)
+        kind_dir = self.pair_dir(slug) / ("by_table" if tables else "by_stable_name")
+        if not kind_dir.parent.exists():
+            return None
+        sha_info = get_cppstdmd_sha()
+        if tables:
+            content = render_tables_overview(config, collect_tables(kind_dir), sha_info)
+        else:
+            stable_names = collect_stable_names(kind_dir, max_dots=self.max_dots)
+            content = render_version_overview(config, stable_names, sha_info)
+        return [content.encode("utf-8")]
+
+    def render_diff(self, slug: str, kind: str, stem: str, page: str) -> list[bytes] | None:
+        file_name = f"{stem}.diff"
+        with open_diff_store(self.pair_dir(slug), readonly=True) as store:
+            if not store.exists(kind, file_name):
+                return None
+            item, text = _diff_item(store, kind, file_name)
+        header = parse_diff_header(text)
+
+        # Pick up diffs added to other pairs since the last render
+        availability_index.cache_clear()
+        config = self.pair_config(slug)
+        sha_info = get_cppstdmd_sha()
+        if kind == "by_table":
+            label = header.get("Table label") or item["file"]
+            item = {"label": label, "caption": header.get("Caption") or label, **item}
+            context = table_page_context(config, item, sha_info)
+        else:
+            item = {"name": header.get("Stable name") or item["file"], **item}
+            episodes = load_episode_correlations(self.output_path)
+            context = section_page_context(config, item, sha_info, episodes)
+
+        diff_html, *chunks = render_side_by_side_chunks(text, DIFF_CHUNK_LINES)
+        page_file = self.output_path / page
+        chunk_urls = diff_chunk_urls(page_file, len(chunks))
+        content = assemble_diff_page(diff_html, page_file, context, self.env, chunk_urls)
+        return [part.encode("utf-8") for part in (content, *chunks)]
+
+    def get(self, path: str) -> bytes | None:
+        """Render (or fetch from the cache) the page at a site path; None if not rendered here."""
+        if path == AVAILABILITY_FILENAME:
+            availability_index.cache_clear()
+            data = availability_data(VERSION_PAIRS, Path("diffs"))
+            return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+        match = _PREVIEW_OVERVIEW_RE.fullmatch(path)
+        if match and match["slug"] in self.pairs:
+            signature = (self.templates_signature(), _pair_signature(self.pair_dir(match["slug"])))
+            parts = self.cached(
+                path, signature, lambda: self.render_overview(match["slug"], bool(match["tables"]))
+            )
+            return parts[0] if parts else None
+
+        match = _PREVIEW_DIFF_RE.fullmatch(path)
+        if match and match["slug"] in self.pairs:
+            kind = "by_table" if match["tables"] else "by_stable_name"
+            page = f"diffs/{match['slug']}/{match['tables'] or ''}{match['file']}.html"
+            pair_dir = self.pair_dir(match["slug"])
+            signature = (
+                self.templates_signature(),
+                _file_signature(pair_dir / kind / f"{match['file']}.diff"),
+                _file_signature(pair_dir / PACK_FILENAME),
+            )
+            parts = self.cached(
+                page, signature, lambda: self.render_diff(match["slug"], kind, match["file"], page)
+            )
+            part = int(match["part"] or 0)
+            return parts[part] if parts and part < len(parts) else None
+
+        return None
+
+    def static_file(self, path: str) -> Path | None:
+        """Asset from templates/, or a file from the last full build."""
+        roots = [self.output_path]
+        if path.split("/", 1)[0] in PREVIEW_STATIC_DIRS:
+            roots.insert(0, self.templates_dir)
+        for root in roots:
+            candidate = root / path
+            if candidate.is_file():
+                return candidate
+        return None
+
+
+class PreviewRequestHandler(BaseHTTPRequestHandler):
+    """Serves a PreviewSite (set as the server's ``site`` attribute)."""
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body: bool):
+        path = unquote(urlsplit(self.path).path).lstrip("/")
+        if path == "" or path.endswith("/"):
+            path += "index.html"
+        if ".." in path.split("/"):
+            self.send_error(404)
+            return
+
+        site = self.server.site
+        try:
+            content = site.get(path)
+        except Exception as e:
+            self.send_error(500, f"Could not render {path}: {e}")
+            return
+        if content is None:
+            static = site.static_file(path)
+            if static is None:
+                self.send_error(404)
+                return
+            content = static.read_bytes()
+
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/json":
+            content_type += "; charset=utf-8"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(content)
+
+
+def serve_site(output_dir: str = "build/site", port: int = 8000, max_dots: int | None = None):
+    """Serve a live preview of the site, rendering pages on request.
 
-    for url_data in sitemap_urls:
-        xml_lines.append("  <url>")
-        xml_lines.append(f"    <loc>{url_data['loc']}</loc>")
-        xml_lines.append(f"    <priority>{url_data['priority']}</priority>")
-        xml_lines.append(f"    <changefreq>{url_data['changefreq']}</changefreq>")
-        xml_lines.append("  </url>")
+    Args:
+        output_dir: Directory of the last full build, for pages that are not
+            rendered on demand (landing page, search index, episodes)
+        port: Local port to listen on
+        max_dots: Maximum number of dots in stable names on overview pages
+    """
+    templates_dir = Path("templates")
+    if not templates_dir.exists():
+        print(f"Error: Templates directory not found: {templates_dir}")
+        sys.exit(1)
 
-    xml_lines.append("</urlset>")
+    server = ThreadingHTTPServer(("127.0.0.1", port), PreviewRequestHandler)
+    server.site = PreviewSite(Path(output_dir), templates_dir, max_dots)
 
-    sitemap_content = "\n".join(xml_lines)
-    sitemap_file = output_path / "sitemap.xml"
-    sitemap_file.write_text(sitemap_content, encoding="utf-8")
-    print(f"  ✓ Generated sitemap.xml ({len(sitemap_urls)} URLs)")
+    print("🔍 C++ Standard Evolution Viewer - Preview Server")
+    print(f"   Rendering from: {Path('diffs').absolute()} and {templates_dir.absolute()}")
+    print(f"   Other files from: {Path(output_dir).absolute()}")
+    print(f"   Open: http://localhost:{port}/versions/{VERSION_PAIRS[-1][4]}.html")
+    print("   Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n   Stopped ({server.site.renders} renders, {server.site.hits} cache hits)")
+    finally:
+        server.server_close()
 
 
 def generate_site(
@@ -1778,6 +2621,9 @@ def generate_site(
     test_mode: bool = False,
     max_workers: int | None = None,
     force: bool = False,
+    diff_renderer: str = "python",
+    precompress: bool = False,
+    timings: bool = False,
 ):
     """Main generation logic.
 
@@ -1787,10 +2633,17 @@ def generate_site(
         limit: Maximum number of diffs per version pair (for testing)
         test_mode: If True, only process first version pair with limit=10
         max_workers: Number of parallel workers (defaults to CPU count)
-        force: Force regeneration of all HTML even if output is newer than input diff
+        force: Force regeneration of all diff pages even if their inputs are unchanged
+        diff_renderer: "python" to render diff pages in-process, "diff2html" to run
+            diff2html-cli for each page
+        precompress: Write .gz/.br siblings of changed text assets after the build
+        timings: Also show the stage timings and slowest pages on statistics.html
+            (the JSON report is always written)
     """
-    # Check dependencies
-    check_dependencies()
+    timer = BuildTimer()
+
+    # Check dependencies (and find the diff2html command once, if it is needed)
+    diff2html_cmd = check_dependencies(diff_renderer)
 
     # Setup Jinja2 environment
     templates_dir = Path("templates")
@@ -1816,6 +2669,7 @@ def generate_site(
     else:
         print("   Max dots: unlimited (all levels)")
     print(f"   Workers: {max_workers} (parallel processing)")
+    print(f"   Diff renderer: {diff_renderer}")
     if limit:
         print(f"   Limit: {limit} diffs per version pair")
     if test_mode:
@@ -1832,6 +2686,10 @@ def generate_site(
         "generated_date": datetime.now().strftime("%Y-%m-%d"),
     }
 
+    # Shared, content-hashed stylesheets and scripts referenced by every diff page
+    with timer.stage("assets"):
+        page_assets = publish_diff_page_assets(output_path, templates_dir)
+
     for from_tag, to_tag, from_name, to_name, slug in pairs_to_process:
         # Create configuration object for this version pair
         pair_config = VersionPairConfig(
@@ -1846,24 +2704,101 @@ def generate_site(
             limit=test_limit,
             max_workers=max_workers,
             force=force,
+            diff_renderer=diff_renderer,
+            diff2html_cmd=diff2html_cmd,
+            page_assets=page_assets,
+            timer=timer,
         )
 
-        pair_stats = generate_version_pair(pair_config)
+        stats["version_pairs"].append(generate_version_pair(pair_config))
+
+    # Publish the availability matrix the timelines were built from
+    with timer.stage("availability"):
+        write_availability_json(output_path, VERSION_PAIRS, Path("diffs"))
+
+    # Index and render every pair through a single pool whose workers compile
+    # the page templates once; pairs and pages with unchanged inputs are skipped
+    previous_pages = load_build_manifest(output_path)
+    previous_dates = load_page_dates(output_path)
+    previous_search = load_search_hashes(output_path)
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=init_page_worker,
+        initargs=(str(templates_dir),),
+    ) as executor:
+        print("\n🔎 Building search indexes...")
+        with timer.stage("search index"):
+            search = generate_search_indexes(stats["version_pairs"], executor, previous_search)
+        with timer.stage("diff pages"):
+            pages = render_diff_pages(
+                stats["version_pairs"], executor, previous_pages, output_path, timer
+            )
+    changed = page_change_dates(
+        pages, previous_pages, previous_dates, datetime.now().strftime("%Y-%m-%d")
+    )
 
-        stats["total_diffs"] += pair_stats["count"]
-        stats["version_pairs"].append(pair_stats)
+    if test_mode or limit:
+        # Partial build: keep the rest of the previous build's pages
+        save_build_manifest(
+            output_path,
+            {**previous_pages, **pages},
+            {**previous_dates, **changed},
+            {**previous_search, **search},
+        )
+    else:
+        removed = prune_stale_pages(output_path, previous_pages, pages)
+        if removed:
+            print(f"  🧹 Removed {removed} stale diff pages")
+        # Every page now links the current hashes
+        removed = prune_hashed_assets(output_path, page_assets)
+        if removed:
+            print(f"  🧹 Removed {removed} superseded page assets")
+        save_build_manifest(output_path, pages, changed, search)
+
+    stats["total_diffs"] = sum(pair_stats["count"] for pair_stats in stats["version_pairs"])
+
+    # One bundle per section with every version's text and diffs, for evolution.html
+    with timer.stage("evolution bundles"):
+        sections = [s for pair_stats in stats["version_pairs"] for s in pair_stats["sections"]]
+        written = generate_evolution_bundles(
+            output_path, sections, VERSION_PAIRS, Path("diffs"), prune=not (test_mode or limit)
+        )
+        generate_evolution_page(output_path, env, page_assets)
+    print(f"\n🧬 Evolution bundles: {written} written")
 
     # Generate landing page
-    generate_landing_page(output_path, env, stats)
+    with timer.stage("landing page"):
+        generate_landing_page(output_path, env, stats)
 
     # Generate statistics page
-    generate_statistics_page(output_path, env, stats)
+    with timer.stage("statistics"):
+        generate_statistics_page(output_path, env, stats, timer if timings else None)
 
     # Copy static assets
-    copy_static_assets(output_path)
+    with timer.stage("static assets"):
+        copy_static_assets(output_path)
 
     # Generate SEO files
-    generate_seo_files(output_path, stats)
+    with timer.stage("seo"):
+        generate_seo_files(output_path, stats)
+
+    if precompress:
+        with timer.stage("precompress"):
+            precompress_site(output_path, max_workers)
+    else:
+        # Siblings from an earlier --precompress build would serve stale content
+        stale = invalidate_stale(output_path)
+        if stale:
+            print(
+                f"\n🗜️  Removed precompressed siblings of {stale} changed files "
+                "(run with --precompress to rewrite them)"
+            )
+
+    timer.write(output_path / BUILD_TIMINGS_FILENAME)
+    if timer.pages:
+        print("\n⏱️  Slowest diff pages:")
+        print(timer.format_table())
+    print(f"   Timing report: {output_path / BUILD_TIMINGS_FILENAME}")
 
     print("\n✅ Site generation complete!")
     print(f"   Total diffs generated: {stats['total_diffs']}")
@@ -1895,6 +2830,18 @@ Examples:
 
   # Use more workers for faster generation
   python3 generate_html_site.py --output build/site/ --workers 8
+
+  # Render diff pages with diff2html-cli instead of the built-in renderer
+  python3 generate_html_site.py --output build/site/ --renderer diff2html
+
+  # Also write .gz/.br siblings for static hosting
+  python3 generate_html_site.py --output build/site/ --precompress
+
+  # Show where the build time goes on statistics.html
+  python3 generate_html_site.py --output build/site/ --timings
+
+  # Preview template changes: pages are rendered on request at http://localhost:8000
+  python3 generate_html_site.py --output build/site/ --serve
         """,
     )
 
@@ -1931,11 +2878,45 @@ Examples:
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Force regeneration of all HTML even if output is newer than input diff",
+        help="Force regeneration of all diff pages even if their inputs are unchanged",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=["python", "diff2html"],
+        default="python",
+        help="Diff page renderer: built-in Python (default) or diff2html-cli",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Write .gz (and .br with the brotli package) siblings of changed text assets",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Start a local preview server that renders diff and overview pages on request "
+        "from diffs/ and templates/ (no build; other files come from --output)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        metavar="N",
+        help="Port for --serve (default: 8000)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help=f"Show build stage timings and the slowest pages on statistics.html "
+        f"(always written to {BUILD_TIMINGS_FILENAME})",
     )
 
     args = parser.parse_args()
 
+    if args.serve:
+        serve_site(output_dir=args.output, port=args.port, max_dots=args.max_dots)
+        return
+
     try:
         generate_site(
             output_dir=args.output,
@@ -1944,6 +2925,9 @@ Examples:
             test_mode=args.test,
             max_workers=args.workers,
             force=args.force,
+            diff_renderer=args.renderer,
+            precompress=args.precompress,
+            timings=args.timings,
         )
     except KeyboardInterrupt:
         print("\n\n⚠️  Generation interrupted by user")
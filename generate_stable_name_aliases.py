@@ -6,33 +6,65 @@ and outputs a mapping that can be used for timeshift navigation in the adventure
 
 Detected patterns:
 - Underscore to dot conversions (e.g., alg.all_of -> alg.all.of)
-- Other renames that can be auto-detected by string similarity
+- Other renames and moves, detected by section content similarity
+  (e.g., depr.complex.h.syn -> complex.h.syn)
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-import re
+import sys
 from pathlib import Path
 
+# Add src to path so we can import from cpp_std_converter
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from cpp_std_converter.markdown_scanner import scan_markdown_file
+from cpp_std_converter.similarity import find_renames
+
 
 def extract_stable_names(md_dir: Path) -> set[str]:
     """Extract stable names from markdown files in a version directory."""
     names = set()
-    heading_pattern = re.compile(r"^#{1,6}\s+.*?\[\[([^\]]+)\]\]")
 
     for md_file in md_dir.glob("*.md"):
         if md_file.name == "meta.md":
             continue
-        with open(md_file) as f:
-            for line in f:
-                m = heading_pattern.match(line)
-                if m:
-                    names.add(m.group(1))
+        names.update(heading.stable_name for heading in scan_markdown_file(md_file).headings)
     return names
 
 
+def extract_section_bodies(md_dir: Path) -> dict[str, str]:
+    """Extract stable name -> own section text (without subsections) for a version."""
+    bodies: dict[str, str] = {}
+
+    for md_file in md_dir.glob("*.md"):
+        if md_file.name == "meta.md":
+            continue
+        bodies.update(scan_markdown_file(md_file).heading_bodies())
+    return bodies
+
+
+def find_content_renames(
+    old_bodies: dict[str, str], new_bodies: dict[str, str], exclude: set[str]
+) -> dict[str, str]:
+    """Find removed sections whose content reappears under a new stable name.
+
+    Args:
+        old_bodies: Section text per stable name in the older version
+        new_bodies: Section text per stable name in the newer version
+        exclude: Names already matched by another rule (old or new side)
+    """
+    removed = old_bodies.keys() - new_bodies.keys() - exclude
+    added = new_bodies.keys() - old_bodies.keys() - exclude
+    matches = find_renames(
+        {name: old_bodies[name] for name in removed},
+        {name: new_bodies[name] for name in added},
+    )
+    return {match.old_name: match.new_name for match in matches}
+
+
 def find_underscore_to_dot_conversions(
     old_labels: set[str], new_labels: set[str]
 ) -> dict[str, str]:
@@ -55,9 +87,11 @@ def find_all_aliases(version_dirs: list[Path]) -> dict[str, str]:
     """
     # Extract labels from each version
     labels_per_version = {}
+    bodies_per_version = {}
     for v_dir in version_dirs:
         if v_dir.exists():
             labels_per_version[v_dir.name] = extract_stable_names(v_dir)
+            bodies_per_version[v_dir.name] = extract_section_bodies(v_dir)
             print(f"  {v_dir.name}: {len(labels_per_version[v_dir.name])} labels")
 
     # Build forward alias chain (old -> new)
@@ -75,6 +109,15 @@ def find_all_aliases(version_dirs: list[Path]) -> dict[str, str]:
         # Find underscore -> dot conversions
         conversions = find_underscore_to_dot_conversions(old_labels, new_labels)
 
+        # Find other renames and moves by content similarity
+        content_renames = find_content_renames(
+            bodies_per_version[old_ver],
+            bodies_per_version[new_ver],
+            exclude=set(conversions) | set(conversions.values()),
+        )
+        print(f"  {old_ver} -> {new_ver}: {len(content_renames)} content-matched renames")
+        conversions.update(content_renames)
+
         for old_label, new_label in conversions.items():
             # Check if old_label is itself an alias for something older
             # Walk back to find the original
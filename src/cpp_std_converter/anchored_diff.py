@@ -0,0 +1,355 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Anchor-aligned, chunked unified diff for very large markdown files.
+
+A single git diff over two full-standard files (several MB each) is slow and
+memory hungry, especially when whole chapters move. anchored_diff() first aligns
+the two files on stable-name headings that appear exactly once in each (keeping
+the longest run that is in the same order in both, as patience diff does), cuts
+both files at those headings, and diffs each pair of chunks with its own git diff
+running in parallel. The per-chunk changes are then shifted to file line numbers
+and re-emitted as one unified diff, with hunks merged across chunk boundaries
+exactly as git would merge them.
+"""
+
+import bisect
+import hashlib
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .utils import SECTION_HEADING_PATTERN, run_command
+
+# Chunks are grown to at least this many lines so tiny sections don't each
+# cost a git process
+MIN_CHUNK_LINES = 2000
+
+# Options matching the whole-file full-standard diff
+FULL_DIFF_OPTIONS = ("--ignore-all-space",)
+FULL_DIFF_CONTEXT = 3
+
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# git's default hunk-header function line: first line above the hunk that starts
+# with a letter, "_" or "$", cut to 80 bytes
+_FUNC_LINE_MAX_BYTES = 80
+NO_NEWLINE_MARKER = "\\ No newline at end of file\n"
+
+
+@dataclass(frozen=True)
+class Change:
+    """A run of removed and/or added lines (0-based positions, half-open)."""
+
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+
+
+def split_lines(text: str) -> list[str]:
+    """Split on "\\n" only (as git does), keeping line endings."""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+        return [line + "\n" for line in lines]
+    return [line + "\n" for line in lines[:-1]] + [lines[-1]]
+
+
+def heading_anchors(lines: list[str]) -> dict[str, int]:
+    """Return stable name -> line index for headings whose anchor occurs once."""
+    positions: dict[str, int] = {}
+    duplicates: set[str] = set()
+    for index, line in enumerate(lines):
+        if not line.startswith("#"):
+            continue
+        match = SECTION_HEADING_PATTERN.match(line.rstrip("\n"))
+        if match:
+            anchor = match.group(3)
+            if anchor in positions:
+                duplicates.add(anchor)
+            positions[anchor] = index
+    for anchor in duplicates:
+        del positions[anchor]
+    return positions
+
+
+def align_anchors(old_lines: list[str], new_lines: list[str]) -> list[tuple[int, int]]:
+    """
+    Pair up heading lines that can safely split both files.
+
+    Takes the anchors unique to each file and keeps the longest subsequence that
+    appears in the same order in both (a longest increasing subsequence over new
+    positions, O(n log n)). Moved sections drop out and are diffed as a removal
+    in one chunk and an addition in another.
+
+    Returns:
+        Sorted (old_line, new_line) index pairs
+    """
+    old_anchors = heading_anchors(old_lines)
+    new_anchors = heading_anchors(new_lines)
+    common = sorted(
+        (old_pos, new_anchors[anchor])
+        for anchor, old_pos in old_anchors.items()
+        if anchor in new_anchors
+    )
+
+    # Patience-style LIS: tails[k] is the index into common of the smallest new
+    # position ending an increasing run of length k + 1
+    tails: list[int] = []
+    tail_values: list[int] = []
+    parents = [-1] * len(common)
+    for i, (_, new_pos) in enumerate(common):
+        k = bisect.bisect_left(tail_values, new_pos)
+        if k > 0:
+            parents[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(new_pos)
+        else:
+            tails[k] = i
+            tail_values[k] = new_pos
+
+    aligned = []
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        aligned.append(common[i])
+        i = parents[i]
+    return aligned[::-1]
+
+
+def plan_chunks(
+    old_lines: list[str], new_lines: list[str], min_lines: int = MIN_CHUNK_LINES
+) -> list[tuple[int, int, int, int]]:
+    """
+    Cut both files into corresponding chunks at aligned headings.
+
+    Returns:
+        List of (old_start, old_end, new_start, new_end) line ranges that tile both files
+    """
+    chunks = []
+    old_start = new_start = 0
+    for old_pos, new_pos in align_anchors(old_lines, new_lines):
+        if old_pos - old_start >= min_lines and new_pos - new_start >= min_lines:
+            chunks.append((old_start, old_pos, new_start, new_pos))
+            old_start, new_start = old_pos, new_pos
+    chunks.append((old_start, len(old_lines), new_start, len(new_lines)))
+    return chunks
+
+
+def parse_changes(diff_text: str) -> list[Change]:
+    """Read the changes of a zero-context (-U0) unified diff."""
+    changes = []
+    for line in diff_text.split("\n"):
+        match = HUNK_HEADER_PATTERN.match(line)
+        if not match:
+            continue
+        old_start, new_start = int(match.group(1)), int(match.group(3))
+        old_count = int(match.group(2)) if match.group(2) is not None else 1
+        new_count = int(match.group(4)) if match.group(4) is not None else 1
+        # An empty side's start is the line before the change, so it is already
+        # the 0-based position of the change
+        changes.append(
+            Change(
+                old_start - 1 if old_count else old_start,
+                old_count,
+                new_start - 1 if new_count else new_start,
+                new_count,
+            )
+        )
+    return changes
+
+
+def diff_chunk(old_text: str, new_text: str, options: tuple[str, ...]) -> list[Change]:
+    """
+    Diff one pair of chunks with git and return its changes.
+
+    Raises:
+        RuntimeError: If git diff failed, timed out or could not be started
+    """
+    if old_text == new_text:
+        return []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        (tmp_path / "from.md").write_text(old_text, encoding="utf-8")
+        (tmp_path / "to.md").write_text(new_text, encoding="utf-8")
+        try:
+            result = run_command(
+                ["git", "diff", "--no-index", "--unified=0", *options, "from.md", "to.md"],
+                cwd=tmp_path,
+                check=False,
+                timeout=60,
+            )
+        except subprocess.TimeoutExpired as e:
+            raise RuntimeError(f"git diff timed out after {e.timeout}s") from e
+        except OSError as e:
+            raise RuntimeError(f"could not run git diff: {e}") from e
+    # git diff returns 1 when files differ (this is expected), 0 when identical
+    if result.returncode not in (0, 1):
+        raise RuntimeError(result.stderr.strip() or f"git diff exited with {result.returncode}")
+    return parse_changes(result.stdout)
+
+
+def _blob_id(text: str) -> str:
+    """Abbreviated git blob hash of a file's content."""
+    data = text.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()[:7]
+
+
+def _range(start: int, count: int) -> str:
+    """Format one side of a hunk header (start is 0-based)."""
+    if count == 1:
+        return str(start + 1)
+    return f"{start + 1 if count else start},{count}"
+
+
+def _emit(lines: list[str], prefix: str, start: int, end: int, out: list[str]) -> None:
+    out.extend(prefix + line for line in lines[start:end])
+    # Only the last line of a file can lack its newline
+    if start < end == len(lines) and not lines[-1].endswith("\n"):
+        out.append("\n" + NO_NEWLINE_MARKER)
+
+
+def format_unified(
+    old_lines: list[str],
+    new_lines: list[str],
+    changes: list[Change],
+    context: int = FULL_DIFF_CONTEXT,
+) -> list[str]:
+    """
+    Render changes as unified diff hunks the way git lays them out.
+
+    Changes separated by at most 2 * context unchanged lines share a hunk,
+    context lines come from the new file, and each hunk header carries the
+    nearest preceding old line that starts with a letter, "_" or "$".
+    """
+    out: list[str] = []
+    func_line = ""
+    func_searched = -1  # Old lines up to this index have been searched
+    i = 0
+    while i < len(changes):
+        j = i
+        while (
+            j + 1 < len(changes)
+            and changes[j + 1].old_start - (changes[j].old_start + changes[j].old_count)
+            <= 2 * context
+        ):
+            j += 1
+        first, last = changes[i], changes[j]
+
+        old_begin = max(first.old_start - context, 0)
+        old_end = min(last.old_start + last.old_count + context, len(old_lines))
+        new_begin = first.new_start - (first.old_start - old_begin)
+        new_end = last.new_start + last.new_count + (old_end - last.old_start - last.old_count)
+
+        for index in range(old_begin - 1, func_searched, -1):
+            first_char = old_lines[index][:1]
+            if first_char and first_char.isascii() and (first_char.isalpha() or first_char in "_$"):
+                func = old_lines[index].encode("utf-8")[:_FUNC_LINE_MAX_BYTES]
+                func_line = func.decode("utf-8", errors="ignore").rstrip()
+                break
+        func_searched = max(func_searched, old_begin - 1)
+
+        header = (
+            f"@@ -{_range(old_begin, old_end - old_begin)} "
+            f"+{_range(new_begin, new_end - new_begin)} @@"
+        )
+        out.append(f"{header} {func_line}\n" if func_line else header + "\n")
+
+        position = new_begin
+        for change in changes[i : j + 1]:
+            _emit(new_lines, " ", position, change.new_start, out)
+            _emit(old_lines, "-", change.old_start, change.old_start + change.old_count, out)
+            _emit(new_lines, "+", change.new_start, change.new_start + change.new_count, out)
+            position = change.new_start + change.new_count
+        _emit(new_lines, " ", position, new_end, out)
+        i = j + 1
+    return out
+
+
+def anchored_diff(
+    old_file: Path,
+    new_file: Path,
+    options: tuple[str, ...] = FULL_DIFF_OPTIONS,
+    context: int = FULL_DIFF_CONTEXT,
+    min_chunk_lines: int = MIN_CHUNK_LINES,
+    jobs: int | None = None,
+) -> str:
+    """
+    Diff two large markdown files chunk by chunk.
+
+    Args:
+        old_file: Source file (its path appears in the diff header as given)
+        new_file: Target file
+        options: Extra git diff options applied to every chunk
+        context: Lines of context around each hunk
+        min_chunk_lines: Minimum lines per chunk before cutting at an aligned heading
+        jobs: Number of git processes to run at once (None = executor default)
+
+    Returns:
+        Unified diff text in git's format, or "" if the files do not differ
+
+    Raises:
+        RuntimeError: If git diff failed on any chunk
+    """
+    old_text = old_file.read_text(encoding="utf-8")
+    new_text = new_file.read_text(encoding="utf-8")
+    old_lines = split_lines(old_text)
+    new_lines = split_lines(new_text)
+
+    chunks = plan_chunks(old_lines, new_lines, min_chunk_lines)
+
+    def run(chunk: tuple[int, int, int, int]) -> list[Change]:
+        old_start, old_end, new_start, new_end = chunk
+        changes = diff_chunk(
+            "".join(old_lines[old_start:old_end]), "".join(new_lines[new_start:new_end]), options
+        )
+        return [
+            Change(c.old_start + old_start, c.old_count, c.new_start + new_start, c.new_count)
+            for c in changes
+        ]
+
+    # git does the work in its own processes, so threads are enough to overlap them
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        changes = [
+            change for chunk_changes in executor.map(run, chunks) for change in chunk_changes
+        ]
+
+    if not changes:
+        return ""
+
+    old_path = old_file.as_posix()
+    new_path = new_file.as_posix()
+    header = [
+        f"diff --git a/{old_path} b/{new_path}\n",
+        f"index {_blob_id(old_text)}..{_blob_id(new_text)} 100644\n",
+        f"--- a/{old_path}\n",
+        f"+++ b/{new_path}\n",
+    ]
+    return "".join(header + format_unified(old_lines, new_lines, changes, context))
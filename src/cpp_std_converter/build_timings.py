@@ -0,0 +1,140 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Wall-clock and CPU timings for site builds.
+
+BuildTimer records how long each stage of a build takes (collection, overview
+rendering, search index, SEO files, ...) and how long every diff page took to
+render and assemble, together with the size of its input diff. The report is
+plain JSON so successive builds can be compared, and slowest_pages() gives the
+pages worth looking at first.
+
+CPU time is per process: page timings are measured inside the worker that
+rendered the page, while stage timings cover the main process only.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+TIMINGS_VERSION = 1
+
+
+@contextmanager
+def measure():
+    """Yield a dict that receives "wall" and "cpu" seconds when the block exits."""
+    result: dict[str, float] = {}
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield result
+    finally:
+        result["wall"] = round(time.perf_counter() - wall, 6)
+        result["cpu"] = round(time.process_time() - cpu, 6)
+
+
+class BuildTimer:
+    """Accumulates stage and per-page timings for one build."""
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self.pages: list[dict] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block as stage `name`; repeated stages (one per version pair) add up."""
+        entry = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+        try:
+            with measure() as elapsed:
+                yield
+        finally:
+            entry["wall"] = round(entry["wall"] + elapsed["wall"], 6)
+            entry["cpu"] = round(entry["cpu"] + elapsed["cpu"], 6)
+            entry["calls"] += 1
+
+    def add_page(
+        self, page: str, size_kb: float, steps: dict[str, dict], success: bool = True
+    ) -> None:
+        """Record one rendered page.
+
+        Args:
+            page: Page path relative to the site root
+            size_kb: Size of the page's input diff
+            steps: Step name → measure() result from the worker (e.g. "render", "assemble")
+            success: Whether the page was written
+        """
+        self.pages.append(
+            {
+                "page": page,
+                "size_kb": size_kb,
+                "wall": round(sum(step["wall"] for step in steps.values()), 6),
+                "cpu": round(sum(step["cpu"] for step in steps.values()), 6),
+                "steps": steps,
+                "success": success,
+            }
+        )
+
+    def page_steps(self) -> dict[str, dict]:
+        """Per-step totals over all pages (summed worker time, not elapsed time)."""
+        totals: dict[str, dict] = {}
+        for page in self.pages:
+            for name, step in page["steps"].items():
+                entry = totals.setdefault(name, {"wall": 0.0, "cpu": 0.0, "pages": 0})
+                entry["wall"] = round(entry["wall"] + step["wall"], 6)
+                entry["cpu"] = round(entry["cpu"] + step["cpu"], 6)
+                entry["pages"] += 1
+        return totals
+
+    def slowest_pages(self, count: int = 20) -> list[dict]:
+        """The `count` pages with the longest wall time, slowest first."""
+        return sorted(self.pages, key=lambda page: page["wall"], reverse=True)[:count]
+
+    def report(self) -> dict:
+        """Machine-readable summary of the build so far."""
+        return {
+            "version": TIMINGS_VERSION,
+            "generated": datetime.now().isoformat(timespec="seconds"),
+            "total_wall": round(time.perf_counter() - self._started, 6),
+            "stages": self.stages,
+            "page_steps": self.page_steps(),
+            "pages": sorted(self.pages, key=lambda page: page["wall"], reverse=True),
+        }
+
+    def write(self, path: Path) -> None:
+        """Write report() as JSON."""
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+
+    def format_table(self, count: int = 10) -> str:
+        """Plain-text table of the slowest pages for the console."""
+        rows = [f"  {'wall (s)':>9}  {'cpu (s)':>9}  {'diff KB':>9}  page"]
+        for page in self.slowest_pages(count):
+            rows.append(
+                f"  {page['wall']:>9.3f}  {page['cpu']:>9.3f}  {page['size_kb']:>9.1f}  "
+                f"{page['page']}"
+            )
+        return "\n".join(rows)
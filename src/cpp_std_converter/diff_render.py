@@ -0,0 +1,391 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Pure-Python side-by-side diff renderer producing diff2html markup.
+
+The site used to run diff2html-cli once per diff page, paying a Node.js startup
+for each of thousands of pages. render_side_by_side() emits the same markup as
+diff2html's side-by-side view (d2h-* classes, line-number and placeholder cells,
+<del>/<ins> word highlights on paired changed lines), so the diff2html CSS,
+Diff2HtmlUI and navigation.js keep working on pages rendered in-process.
+"""
+
+import difflib
+import re
+from dataclasses import dataclass, field
+
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+GIT_HEADER_PATTERN = re.compile(r"^diff --git a/(.*) b/(.*)$")
+
+# Words, runs of whitespace and single punctuation characters, roughly as jsdiff's
+# diffWordsWithSpace splits lines
+_WORD_PATTERN = re.compile(r"\w+|[^\S\n]+|.", re.UNICODE)
+
+_FILE_CHANGED_ICON = (
+    '<svg aria-hidden="true" class="d2h-icon d2h-changed" height="16" title="modified" '
+    'version="1.1" viewBox="0 0 14 16" width="14"><path d="M13 1H1C0.45 1 0 1.45 0 2v12c0 '
+    "0.55 0.45 1 1 1h12c0.55 0 1-0.45 1-1V2c0-0.55-0.45-1-1-1z m0 13H1V2h12v12zM4 8c0-1.66 "
+    '1.34-3 3-3s3 1.34 3 3-1.34 3-3 3-3-1.34-3-3z"></path></svg>'
+)
+
+
+@dataclass
+class DiffLine:
+    """One line of a hunk: kind is " ", "-" or "+"."""
+
+    kind: str
+    content: str
+    old_number: int | None = None
+    new_number: int | None = None
+
+
+@dataclass
+class DiffBlock:
+    """A hunk: its @@ header line and its lines."""
+
+    header: str
+    lines: list[DiffLine] = field(default_factory=list)
+
+
+@dataclass
+class DiffFile:
+    """One file of a unified diff."""
+
+    old_name: str
+    new_name: str
+    blocks: list[DiffBlock] = field(default_factory=list)
+
+
+def parse_unified_diff(text: str) -> list[DiffFile]:
+    """
+    Parse git unified diff output.
+
+    Lines before the first "diff --git" (such as the section diff headers) and
+    "\\ No newline at end of file" markers are skipped.
+    """
+    files: list[DiffFile] = []
+    current: DiffFile | None = None
+    block: DiffBlock | None = None
+    old_number = new_number = 0
+
+    for line in text.split("\n"):
+        git_header = GIT_HEADER_PATTERN.match(line)
+        if git_header:
+            current = DiffFile(git_header.group(1), git_header.group(2))
+            files.append(current)
+            block = None
+            continue
+        if current is None:
+            continue
+
+        hunk = HUNK_HEADER_PATTERN.match(line)
+        if hunk:
+            block = DiffBlock(line)
+            current.blocks.append(block)
+            old_number, new_number = int(hunk.group(1)), int(hunk.group(2))
+            continue
+        if block is None:
+            # File header lines (index, ---, +++)
+            if line.startswith("--- ") and line[4:] != "/dev/null":
+                current.old_name = line[4:].removeprefix("a/")
+            elif line.startswith("+++ ") and line[4:] != "/dev/null":
+                current.new_name = line[4:].removeprefix("b/")
+            continue
+
+        kind = line[:1]
+        if kind == " ":
+            block.lines.append(DiffLine(kind, line[1:], old_number, new_number))
+            old_number += 1
+            new_number += 1
+        elif kind == "-":
+            block.lines.append(DiffLine(kind, line[1:], old_number=old_number))
+            old_number += 1
+        elif kind == "+":
+            block.lines.append(DiffLine(kind, line[1:], new_number=new_number))
+            new_number += 1
+
+    return files
+
+
+def escape_for_html(text: str) -> str:
+    """Escape text the way diff2html does."""
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#x27;")
+        .replace("/", "&#x2F;")
+    )
+
+
+def _hash_code(text: str) -> int:
+    """Java-style 32-bit string hash, as diff2html uses for file element IDs."""
+    value = 0
+    data = text.encode("utf-16-be")  # JavaScript hashes UTF-16 code units
+    for i in range(0, len(data), 2):
+        value = (value * 31 + int.from_bytes(data[i : i + 2], "big")) & 0xFFFFFFFF
+    return value - (1 << 32) if value & 0x80000000 else value
+
+
+def file_diff_name(diff_file: DiffFile) -> str:
+    """Display name of a file: "old → new" with shared leading/trailing path parts factored out."""
+    old_name, new_name = diff_file.old_name, diff_file.new_name
+    if old_name == new_name:
+        return new_name
+
+    old_parts, new_parts = old_name.split("/"), new_name.split("/")
+    prefix: list[str] = []
+    suffix: list[str] = []
+    while len(old_parts) > 1 and len(new_parts) > 1 and old_parts[0] == new_parts[0]:
+        prefix.append(old_parts.pop(0))
+        new_parts.pop(0)
+    while len(old_parts) > 1 and len(new_parts) > 1 and old_parts[-1] == new_parts[-1]:
+        suffix.insert(0, old_parts.pop())
+        new_parts.pop()
+
+    changed = f"{'/'.join(old_parts)} → {'/'.join(new_parts)}"
+    if prefix and suffix:
+        return f"{'/'.join(prefix)}/{{{changed}}}/{'/'.join(suffix)}"
+    if prefix:
+        return f"{'/'.join(prefix)}/{{{changed}}}"
+    if suffix:
+        return f"{{{changed}}}/{'/'.join(suffix)}"
+    return changed
+
+
+def highlight_changes(old_content: str, new_content: str) -> tuple[str, str]:
+    """
+    Word-level highlight of a changed line pair.
+
+    Returns:
+        (old_html, new_html) with removed words in <del> and added words in <ins>
+    """
+    old_words = _WORD_PATTERN.findall(old_content)
+    new_words = _WORD_PATTERN.findall(new_content)
+    old_html: list[str] = []
+    new_html: list[str] = []
+    matcher = difflib.SequenceMatcher(None, old_words, new_words, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        old_part = escape_for_html("".join(old_words[i1:i2]))
+        new_part = escape_for_html("".join(new_words[j1:j2]))
+        if tag == "equal":
+            old_html.append(old_part)
+            new_html.append(new_part)
+            continue
+        if old_part:
+            old_html.append(f"<del>{old_part}</del>")
+        if new_part:
+            new_html.append(f"<ins>{new_part}</ins>")
+    return "".join(old_html), "".join(new_html)
+
+
+def _line_row(line_class: str, number: int | None, prefix: str, content: str) -> str:
+    return (
+        "<tr>\n"
+        f'    <td class="d2h-code-side-linenumber {line_class}">\n'
+        f"      {number if number is not None else ''}\n"
+        "    </td>\n"
+        f'    <td class="{line_class}">\n'
+        '        <div class="d2h-code-side-line">\n'
+        f'            <span class="d2h-code-line-prefix">{prefix}</span>\n'
+        f'            <span class="d2h-code-line-ctn">{content or "<br>"}</span>\n'
+        "        </div>\n"
+        "    </td>\n"
+        "</tr>"
+    )
+
+
+def _placeholder_row() -> str:
+    return (
+        "<tr>\n"
+        '    <td class="d2h-code-side-linenumber d2h-code-side-emptyplaceholder '
+        'd2h-cntx d2h-emptyplaceholder">\n'
+        "      \n"
+        "    </td>\n"
+        '    <td class="d2h-cntx d2h-emptyplaceholder">\n'
+        '        <div class="d2h-code-side-line d2h-code-side-emptyplaceholder">\n'
+        '            <span class="d2h-code-line-prefix">&nbsp;</span>\n'
+        '            <span class="d2h-code-line-ctn"><br></span>\n'
+        "        </div>\n"
+        "    </td>\n"
+        "</tr>"
+    )
+
+
+def _info_row(header: str) -> str:
+    return (
+        "<tr>\n"
+        '    <td class="d2h-code-side-linenumber d2h-info"></td>\n'
+        '    <td class="d2h-info">\n'
+        f'        <div class="d2h-code-side-line">{header or "&nbsp;"}</div>\n'
+        "    </td>\n"
+        "</tr>"
+    )
+
+
+def _render_changes(
+    removed: list[DiffLine], added: list[DiffLine], left: list[str], right: list[str]
+) -> None:
+    """Render a run of removed lines next to the added lines that replace them."""
+    for i in range(max(len(removed), len(added))):
+        old = removed[i] if i < len(removed) else None
+        new = added[i] if i < len(added) else None
+        if old is not None and new is not None:
+            old_html, new_html = highlight_changes(old.content, new.content)
+            left.append(_line_row("d2h-del d2h-change", old.old_number, "-", old_html))
+            right.append(_line_row("d2h-ins d2h-change", new.new_number, "+", new_html))
+            continue
+        if old is not None:
+            left.append(_line_row("d2h-del", old.old_number, "-", escape_for_html(old.content)))
+        else:
+            left.append(_placeholder_row())
+        if new is not None:
+            right.append(_line_row("d2h-ins", new.new_number, "+", escape_for_html(new.content)))
+        else:
+            right.append(_placeholder_row())
+
+
+def _render_file(diff_file: DiffFile) -> str:
+    left: list[str] = []
+    right: list[str] = []
+    for block in diff_file.blocks:
+        left.append(_info_row(escape_for_html(block.header)))
+        right.append(_info_row(""))
+
+        removed: list[DiffLine] = []
+        added: list[DiffLine] = []
+        for line in block.lines + [DiffLine(" ", "")]:
+            if line.kind == "-" and not added:
+                removed.append(line)
+                continue
+            if line.kind == "+":
+                added.append(line)
+                continue
+            if removed or added:
+                _render_changes(removed, added, left, right)
+                removed, added = [], []
+            if line.kind == "-":
+                removed.append(line)
+            elif line.old_number is not None:
+                content = escape_for_html(line.content)
+                left.append(_line_row("d2h-cntx", line.old_number, "&nbsp;", content))
+                right.append(_line_row("d2h-cntx", line.new_number, "&nbsp;", content))
+
+    if not diff_file.blocks:
+        empty = (
+            '<tr>\n    <td class="d2h-info">\n'
+            '        <div class="d2h-code-side-line">\n'
+            "            File without changes\n"
+            "        </div>\n    </td>\n</tr>"
+        )
+        left.append(empty)
+        right.append(empty)
+
+    name = file_diff_name(diff_file)
+    file_id = f"d2h-{str(_hash_code(name))[-6:]}"
+    base_name = diff_file.new_name.rsplit("/", 1)[-1]
+    language = base_name.rsplit(".", 1)[-1] if "." in base_name else ""
+    sides = "".join(
+        '        <div class="d2h-file-side-diff">\n'
+        '            <div class="d2h-code-wrapper">\n'
+        '                <table class="d2h-diff-table">\n'
+        '                    <tbody class="d2h-diff-tbody">\n'
+        f"                    {''.join(rows)}\n"
+        "                    </tbody>\n"
+        "                </table>\n"
+        "            </div>\n"
+        "        </div>\n"
+        for rows in (left, right)
+    )
+    return (
+        f'<div id="{file_id}" class="d2h-file-wrapper" data-lang="{language}">\n'
+        '    <div class="d2h-file-header">\n'
+        '      <span class="d2h-file-name-wrapper">\n'
+        f"    {_FILE_CHANGED_ICON}"
+        f'    <span class="d2h-file-name">{escape_for_html(name)}</span>\n'
+        '    <span class="d2h-tag d2h-changed d2h-changed-tag">CHANGED</span></span>\n'
+        '<label class="d2h-file-collapse">\n'
+        '    <input class="d2h-file-collapse-input" type="checkbox" name="viewed" value="viewed">\n'
+        "    Viewed\n"
+        "</label>\n"
+        "    </div>\n"
+        '    <div class="d2h-files-diff">\n'
+        f"{sides}"
+        "    </div>\n"
+        "</div>"
+    )
+
+
+def _wrap(rendered_files: list[str]) -> str:
+    content = "\n".join(rendered_files)
+    return f'<div class="d2h-wrapper d2h-auto-color-scheme">\n{content}\n</div>'
+
+
+def render_side_by_side(diff_text: str) -> str:
+    """Render a unified diff as diff2html side-by-side markup (a d2h-wrapper div)."""
+    return _wrap([_render_file(diff_file) for diff_file in parse_unified_diff(diff_text)])
+
+
+def render_side_by_side_chunks(diff_text: str, max_lines: int) -> list[str]:
+    """Render a unified diff as consecutive side-by-side parts of about max_lines each.
+
+    Parts split only between hunks, so a hunk longer than max_lines gets a part
+    of its own. A file spanning several parts repeats its header in each, with
+    d2h-file-continued added to every wrapper after the first. Each part is a
+    complete d2h-wrapper div that Diff2HtmlUI can decorate on its own.
+    """
+    # Group (file, hunks) pieces into parts, starting a new part when the next
+    # hunk would overflow the current one
+    parts: list[list[tuple[DiffFile, list[DiffBlock]]]] = []
+    part_lines = 0
+    for diff_file in parse_unified_diff(diff_text):
+        for block in diff_file.blocks or [None]:
+            size = len(block.lines) + 1 if block else 1
+            if not parts or (part_lines and part_lines + size > max_lines):
+                parts.append([])
+                part_lines = 0
+            pieces = parts[-1]
+            if not pieces or pieces[-1][0] is not diff_file:
+                pieces.append((diff_file, []))
+            if block:
+                pieces[-1][1].append(block)
+            part_lines += size
+
+    chunks = []
+    started: set[int] = set()
+    for pieces in parts:
+        rendered = []
+        for diff_file, blocks in pieces:
+            html = _render_file(DiffFile(diff_file.old_name, diff_file.new_name, blocks))
+            if id(diff_file) in started:
+                html = html.replace(
+                    'class="d2h-file-wrapper"', 'class="d2h-file-wrapper d2h-file-continued"', 1
+                )
+            started.add(id(diff_file))
+            rendered.append(html)
+        chunks.append(_wrap(rendered))
+    return chunks or [_wrap([])]
@@ -0,0 +1,321 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Storage backends for per-section diffs of a version pair.
+
+A version pair directory (diffs/<from>_to_<to>/) holds one .diff per stable name
+in by_stable_name/ and one per table in by_table/. That loose layout is what
+GitHub shows, but it means tens of thousands of small files across all pairs.
+
+The packed layout keeps the same diffs in a single SQLite database per pair
+(diffs.sqlite), keyed by kind ("by_stable_name" / "by_table") and file name.
+Both layouts share one interface, so the diff generator and the site generator
+don't care which one they are talking to, and export_loose() turns a pack back
+into the loose layout for browsing.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+PACK_FILENAME = "diffs.sqlite"
+
+DIFF_KINDS = ("by_stable_name", "by_table")
+
+# Per-pair manifest recording, for each section diff, the input hashes that
+# produced it and its statistics (so consumers never have to re-read the diff)
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+DIFF_STAT_KEYS = ("added", "removed", "hunks", "line_count", "bytes", "diff_hash")
+
+
+def load_diff_manifest(pair_dir: Path) -> dict:
+    """Load the diff manifest for a version pair (empty if missing or unreadable)."""
+    manifest_file = Path(pair_dir) / MANIFEST_FILENAME
+    try:
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def save_diff_manifest(pair_dir: Path, manifest: dict) -> None:
+    """Write the diff manifest for a version pair."""
+    manifest["version"] = MANIFEST_VERSION
+    manifest_file = Path(pair_dir) / MANIFEST_FILENAME
+    manifest_file.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def diff_stats(text: str) -> dict:
+    """
+    Summarise a section diff.
+
+    Returns:
+        Dict with added/removed line counts, hunk count, line_count (every +, - and
+        @@ line from "diff --git" on, as shown on the site), size in bytes and the
+        SHA-256 of the diff text
+    """
+    added = removed = hunks = line_count = 0
+    in_header = True
+    in_hunk = False
+    for line in text.split("\n"):
+        if in_header:
+            if not line.startswith("diff --git"):
+                continue
+            in_header = False
+        if line.startswith("@@"):
+            hunks += 1
+            line_count += 1
+            in_hunk = True
+        elif line.startswith("+"):
+            line_count += 1
+            added += in_hunk
+        elif line.startswith("-"):
+            line_count += 1
+            removed += in_hunk
+
+    data = text.encode("utf-8")
+    return {
+        "added": added,
+        "removed": removed,
+        "hunks": hunks,
+        "line_count": line_count,
+        "bytes": len(data),
+        "diff_hash": hashlib.sha256(data).hexdigest(),
+    }
+
+
+class LooseDiffStore:
+    """Diffs stored as individual <kind>/<name>.diff files."""
+
+    packed = False
+
+    def __init__(self, pair_dir: Path):
+        self.pair_dir = Path(pair_dir)
+
+    def path(self, kind: str, file_name: str) -> Path:
+        """Path of the loose diff file."""
+        return self.pair_dir / kind / file_name
+
+    def names(self, kind: str) -> list[str]:
+        """Sorted .diff file names of a kind."""
+        kind_dir = self.pair_dir / kind
+        if not kind_dir.exists():
+            return []
+        return sorted(p.name for p in kind_dir.glob("*.diff"))
+
+    def exists(self, kind: str, file_name: str) -> bool:
+        return self.path(kind, file_name).exists()
+
+    def read(self, kind: str, file_name: str) -> str | None:
+        try:
+            return self.path(kind, file_name).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def write(self, kind: str, file_name: str, text: str) -> None:
+        diff_file = self.path(kind, file_name)
+        diff_file.parent.mkdir(parents=True, exist_ok=True)
+        diff_file.write_text(text, encoding="utf-8")
+
+    def remove(self, kind: str, file_name: str) -> None:
+        self.path(kind, file_name).unlink(missing_ok=True)
+
+    def size(self, kind: str, file_name: str) -> int:
+        try:
+            return self.path(kind, file_name).stat().st_size
+        except OSError:
+            return 0
+
+    def mtime(self, kind: str, file_name: str) -> float:
+        try:
+            return self.path(kind, file_name).stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PackedDiffStore:
+    """Diffs stored as rows of a single SQLite database per version pair."""
+
+    packed = True
+
+    def __init__(self, pair_dir: Path, readonly: bool = False):
+        self.pair_dir = Path(pair_dir)
+        self.db_path = self.pair_dir / PACK_FILENAME
+        if readonly:
+            self._conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        else:
+            self.pair_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS diffs ("
+                " kind TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " body TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime REAL NOT NULL,"
+                " PRIMARY KEY (kind, name))"
+            )
+
+    def path(self, kind: str, file_name: str) -> Path:
+        """Path the diff would have in the loose layout."""
+        return self.pair_dir / kind / file_name
+
+    def names(self, kind: str) -> list[str]:
+        rows = self._conn.execute("SELECT name FROM diffs WHERE kind = ? ORDER BY name", (kind,))
+        return [name for (name,) in rows]
+
+    def exists(self, kind: str, file_name: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM diffs WHERE kind = ? AND name = ?", (kind, file_name)
+        ).fetchone()
+        return row is not None
+
+    def read(self, kind: str, file_name: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT body FROM diffs WHERE kind = ? AND name = ?", (kind, file_name)
+        ).fetchone()
+        return row[0] if row else None
+
+    def write(self, kind: str, file_name: str, text: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO diffs (kind, name, body, size, mtime) VALUES (?, ?, ?, ?, ?)",
+            (kind, file_name, text, len(text.encode("utf-8")), time.time()),
+        )
+
+    def remove(self, kind: str, file_name: str) -> None:
+        self._conn.execute("DELETE FROM diffs WHERE kind = ? AND name = ?", (kind, file_name))
+
+    def size(self, kind: str, file_name: str) -> int:
+        row = self._conn.execute(
+            "SELECT size FROM diffs WHERE kind = ? AND name = ?", (kind, file_name)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def mtime(self, kind: str, file_name: str) -> float:
+        row = self._conn.execute(
+            "SELECT mtime FROM diffs WHERE kind = ? AND name = ?", (kind, file_name)
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+DiffStore = LooseDiffStore | PackedDiffStore
+
+
+def open_diff_store(
+    pair_dir: Path, packed: bool | None = None, readonly: bool = False
+) -> DiffStore:
+    """
+    Open the diff store of a version pair.
+
+    Args:
+        pair_dir: Version pair directory (e.g., diffs/n4950_to_trunk)
+        packed: True/False to force a layout; None picks the pack if one exists
+        readonly: Open a pack read-only (safe to share between worker processes)
+
+    Returns:
+        LooseDiffStore or PackedDiffStore
+    """
+    pair_dir = Path(pair_dir)
+    if packed is None:
+        packed = (pair_dir / PACK_FILENAME).exists()
+    if packed:
+        return PackedDiffStore(pair_dir, readonly=readonly)
+    return LooseDiffStore(pair_dir)
+
+
+def export_loose(pair_dir: Path) -> int:
+    """
+    Materialise the loose .diff layout of a pair from its pack.
+
+    Loose files whose content already matches are left untouched, and loose
+    files that are not in the pack are removed.
+
+    Returns:
+        Number of files written
+    """
+    written = 0
+    loose = LooseDiffStore(pair_dir)
+    with PackedDiffStore(pair_dir, readonly=True) as pack:
+        for kind in DIFF_KINDS:
+            packed_names = set(pack.names(kind))
+            for file_name in loose.names(kind):
+                if file_name not in packed_names:
+                    loose.remove(kind, file_name)
+            for file_name in sorted(packed_names):
+                text = pack.read(kind, file_name)
+                if loose.read(kind, file_name) != text:
+                    loose.write(kind, file_name, text)
+                    written += 1
+                # Keep loose mtimes in step with the pack for mtime-based skip checks
+                mtime = pack.mtime(kind, file_name)
+                os.utime(loose.path(kind, file_name), (mtime, mtime))
+    return written
+
+
+def remove_loose(pair_dir: Path) -> int:
+    """
+    Remove the loose .diff files of a pair whose diffs now live in its pack.
+
+    Index files (README.md) in the kind directories are kept.
+
+    Returns:
+        Number of files removed
+    """
+    removed = 0
+    loose = LooseDiffStore(pair_dir)
+    for kind in DIFF_KINDS:
+        for file_name in loose.names(kind):
+            loose.remove(kind, file_name)
+            removed += 1
+    return removed
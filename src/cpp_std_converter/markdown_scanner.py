@@ -0,0 +1,358 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Single-pass structure scanner for converted markdown chapters.
+
+The diff, site and adventure generators all need the same structural facts about
+a chapter: section headings, the line spans they cover, tables with captions,
+BNF blocks, anchor IDs and [[wikilinks]]. scan_markdown() walks a chapter once
+and returns all of them; scan_markdown_file() caches the result per content hash
+so every consumer in a process shares a single scan of each file.
+scan_version_dir() combines the scans of a whole converted version into one
+anchor set and section index, so "does version X define Y" is a set lookup.
+"""
+
+import hashlib
+import io
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .utils import SECTION_HEADING_PATTERN
+
+# Table header: **Table: Caption** <a id="label">[label]</a>
+TABLE_HEADER_PATTERN = re.compile(r'^\*\*Table:\s*(.+?)\*\*\s*<a id="([^"]+)">')
+
+# Any id attribute, used for cheap "does this version define X" lookups
+ANCHOR_ID_PATTERN = re.compile(r'id="([^"]+)"')
+
+# Cross-reference wikilinks: [[stable.name]]
+WIKILINK_PATTERN = re.compile(r"\[\[([^\]]+)\]\]")
+
+ANNEX_PATTERN = re.compile(r'data-annex="true"(?:\s+data-annex-type="([^"]+)")?')
+
+BNF_FENCE_OPEN = "``` bnf"
+FENCE_CLOSE = "```"
+
+
+@dataclass(frozen=True)
+class Heading:
+    """Section heading with a stable name anchor."""
+
+    level: int  # 1-6 for H1-H6
+    title: str  # Heading title text
+    anchor: str  # HTML anchor id
+    stable_name: str  # C++ stable name (e.g., "class.copy.ctor")
+    line: int  # 1-based line number
+    annex_type: str | None = None  # "normative"/"informative" for annex headings, else None
+    is_annex: bool = False
+
+
+@dataclass(frozen=True)
+class SectionSpan:
+    """Lines covered by a section, including all of its subsections."""
+
+    stable_name: str
+    level: int
+    start_line: int  # 1-based, the heading line
+    end_line: int  # 1-based, inclusive
+
+
+@dataclass(frozen=True)
+class TableSpan:
+    """A captioned table and the lines it covers."""
+
+    label: str
+    caption: str
+    start_line: int  # 1-based, the **Table:** header line
+    end_line: int  # 1-based, inclusive
+
+
+@dataclass(frozen=True)
+class BnfBlock:
+    """Content of a ``` bnf fenced block."""
+
+    content: str
+    start_line: int  # 1-based, the opening fence line
+
+
+@dataclass(frozen=True)
+class Wikilink:
+    """A [[target]] cross-reference."""
+
+    target: str
+    line: int
+
+
+@dataclass
+class ChapterScan:
+    """Structural model of one markdown chapter."""
+
+    content_hash: str
+    lines: list[str]  # Lines including their line endings
+    headings: list[Heading] = field(default_factory=list)
+    sections: dict[str, SectionSpan] = field(default_factory=dict)
+    tables: dict[str, TableSpan] = field(default_factory=dict)
+    bnf_blocks: list[BnfBlock] = field(default_factory=list)
+    anchors: frozenset[str] = frozenset()
+    wikilinks: list[Wikilink] = field(default_factory=list)
+
+    def text(self, start_line: int, end_line: int) -> str:
+        """Return the text of an inclusive 1-based line range."""
+        return "".join(self.lines[start_line - 1 : end_line])
+
+    def section_text(self, stable_name: str) -> str:
+        """Return the full text of a section (heading plus all subsections)."""
+        span = self.sections[stable_name]
+        return self.text(span.start_line, span.end_line)
+
+    def table_text(self, label: str) -> str:
+        """Return the text of a table including its header line."""
+        span = self.tables[label]
+        return self.text(span.start_line, span.end_line)
+
+    def heading_body(self, index: int) -> str:
+        """Return the text between a heading and the next heading of any level."""
+        start = self.headings[index].line + 1
+        if index + 1 < len(self.headings):
+            end = self.headings[index + 1].line - 1
+        else:
+            end = len(self.lines)
+        return self.text(start, end)
+
+    def heading_bodies(self) -> dict[str, str]:
+        """Return stable name -> own text of each section, excluding subsections."""
+        return {heading.anchor: self.heading_body(i) for i, heading in enumerate(self.headings)}
+
+    def heading_wikilinks(self, index: int) -> list[str]:
+        """Return wikilink targets between a heading and the next heading."""
+        start = self.headings[index].line
+        end = self.headings[index + 1].line if index + 1 < len(self.headings) else None
+        return [
+            link.target
+            for link in self.wikilinks
+            if link.line > start and (end is None or link.line < end)
+        ]
+
+
+@dataclass(frozen=True)
+class VersionIndex:
+    """Anchors and section locations across all chapters of one converted version."""
+
+    name: str  # Version directory name (e.g., "n4950")
+    anchors: frozenset[str]  # Every id="..." in any chapter
+    sections: dict[str, tuple[Path, SectionSpan]]  # Stable name -> (chapter, span)
+
+    def section_text(self, stable_name: str) -> str | None:
+        """Return the full text of a section, or None if this version lacks it."""
+        entry = self.sections.get(stable_name)
+        if entry is None:
+            return None
+        chapter, span = entry
+        scan = scan_markdown_file(chapter)
+        return scan.text(span.start_line, span.end_line) if scan else None
+
+
+def scan_markdown(content: str) -> ChapterScan:
+    """
+    Scan markdown content in a single pass.
+
+    Section spans follow heading nesting: a section runs from its heading to the
+    line before the next heading at the same or a shallower level. Tables run from
+    their **Table:** header to the blank line that follows the table rows.
+
+    Args:
+        content: Markdown content of one chapter
+
+    Returns:
+        ChapterScan with headings, sections, tables, BNF blocks, anchors and wikilinks
+    """
+    # Universal newlines, matching what open(...).readlines() would return
+    lines = io.StringIO(content, newline=None).readlines()
+    scan = ChapterScan(
+        content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(), lines=lines
+    )
+
+    anchors: set[str] = set()
+    open_sections: list[tuple[int, str, int]] = []  # Stack of (level, stable_name, start_line)
+    current_table: list | None = None  # [label, caption, start_line, seen_table_rows]
+    bnf_start: int | None = None
+    bnf_lines: list[str] = []
+
+    for line_num, raw_line in enumerate(lines, 1):
+        line = raw_line.rstrip("\n")
+
+        if bnf_start is not None:
+            if line == FENCE_CLOSE:
+                scan.bnf_blocks.append(BnfBlock("\n".join(bnf_lines), bnf_start))
+                bnf_start = None
+            else:
+                bnf_lines.append(line)
+        elif line == BNF_FENCE_OPEN:
+            bnf_start = line_num
+            bnf_lines = []
+
+        if 'id="' in line:
+            anchors.update(ANCHOR_ID_PATTERN.findall(line))
+        if "[[" in line:
+            for target in WIKILINK_PATTERN.findall(line):
+                scan.wikilinks.append(Wikilink(target, line_num))
+
+        if line.startswith("#"):
+            match = SECTION_HEADING_PATTERN.match(line)
+            if match:
+                level = len(match.group(1))
+                annex = ANNEX_PATTERN.search(line)
+                heading = Heading(
+                    level=level,
+                    title=match.group(2).strip(),
+                    anchor=match.group(3),
+                    stable_name=match.group(4),
+                    line=line_num,
+                    annex_type=annex.group(1) if annex else None,
+                    is_annex=annex is not None,
+                )
+                scan.headings.append(heading)
+
+                # Close any sections at same or deeper level
+                while open_sections and open_sections[-1][0] >= level:
+                    old_level, old_name, old_start = open_sections.pop()
+                    scan.sections[old_name] = SectionSpan(
+                        old_name, old_level, old_start, line_num - 1
+                    )
+                open_sections.append((level, heading.anchor, line_num))
+
+        table_match = TABLE_HEADER_PATTERN.match(line)
+        if table_match:
+            # Close previous table if any
+            if current_table:
+                label, caption, start, _ = current_table
+                scan.tables[label] = TableSpan(label, caption, start, line_num - 1)
+            current_table = [table_match.group(2), table_match.group(1).strip(), line_num, False]
+        elif current_table:
+            stripped = line.strip()
+            if stripped.startswith("|") and "|" in stripped[1:]:
+                current_table[3] = True
+            elif stripped == "" and current_table[3]:
+                # Blank line after the table rows - table is complete
+                label, caption, start, _ = current_table
+                scan.tables[label] = TableSpan(label, caption, start, line_num)
+                current_table = None
+
+    # Close remaining open sections and table
+    while open_sections:
+        level, stable_name, start_line = open_sections.pop()
+        scan.sections[stable_name] = SectionSpan(stable_name, level, start_line, len(lines))
+    if current_table:
+        label, caption, start, _ = current_table
+        scan.tables[label] = TableSpan(label, caption, start, len(lines))
+
+    scan.anchors = frozenset(anchors)
+    return scan
+
+
+# Scans keyed by content hash, plus a (path, mtime, size) -> hash memo so that
+# repeated lookups of an unchanged file skip both the parse and the hashing.
+_scan_cache: dict[str, ChapterScan] = {}
+_path_memo: dict[tuple[str, int, int], str] = {}
+
+
+def scan_markdown_file(path: Path) -> ChapterScan | None:
+    """
+    Scan a markdown file, reusing a cached scan when its content is unchanged.
+
+    Args:
+        path: Markdown file to scan
+
+    Returns:
+        ChapterScan for the file, or None if it does not exist
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    memo_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    cached_hash = _path_memo.get(memo_key)
+    if cached_hash is not None and cached_hash in _scan_cache:
+        return _scan_cache[cached_hash]
+
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    scan = _scan_cache.get(digest)
+    if scan is None:
+        scan = scan_markdown(data.decode("utf-8"))
+        _scan_cache[digest] = scan
+    _path_memo[memo_key] = digest
+    return scan
+
+
+# Version indexes keyed by resolved directory; built once per process
+_version_cache: dict[str, VersionIndex] = {}
+
+
+def scan_version_dir(version_dir: Path) -> VersionIndex | None:
+    """
+    Index every chapter of a converted version directory in one pass.
+
+    The index is cached per directory for the life of the process (call
+    clear_scan_cache() after chapters change), so per-section lookups never
+    touch the file system.
+
+    Args:
+        version_dir: Directory of chapter markdown files (e.g., n4950/)
+
+    Returns:
+        VersionIndex for the directory, or None if it does not exist
+    """
+    if not version_dir.is_dir():
+        return None
+
+    key = str(version_dir.resolve())
+    index = _version_cache.get(key)
+    if index is not None:
+        return index
+
+    anchors: set[str] = set()
+    sections: dict[str, tuple[Path, SectionSpan]] = {}
+    for chapter in sorted(version_dir.glob("*.md")):
+        scan = scan_markdown_file(chapter)
+        if scan is None:
+            continue
+        anchors.update(scan.anchors)
+        for name, span in scan.sections.items():
+            sections.setdefault(name, (chapter, span))
+
+    index = VersionIndex(version_dir.name, frozenset(anchors), sections)
+    _version_cache[key] = index
+    return index
+
+
+def clear_scan_cache() -> None:
+    """Drop all cached scans (mainly for tests and long-running processes)."""
+    _scan_cache.clear()
+    _path_memo.clear()
+    _version_cache.clear()
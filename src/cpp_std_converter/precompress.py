@@ -0,0 +1,244 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Precompressed .gz and .br siblings for the static site.
+
+Static hosts such as nginx (gzip_static/brotli_static) serve foo.html.gz or
+foo.html.br in place of foo.html when the client accepts it, so nothing is
+compressed per request. precompress_tree() writes those siblings for every
+text asset under the site root. It keeps a manifest of the content hash each
+sibling was made from, so rebuilds recompress only changed files and remove
+siblings whose source is gone.
+
+Brotli output needs the optional ``brotli`` package; without it only .gz files
+are written.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_FILENAME = ".precompress-manifest.json"
+MANIFEST_VERSION = 1
+
+# Text assets worth compressing; fonts and images are already compressed
+TEXT_SUFFIXES = frozenset({".html", ".css", ".js", ".json", ".xml", ".txt", ".svg", ".md", ".lua"})
+
+# Below this size the compressed variant saves less than a network packet
+MIN_SIZE = 1024
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Every sibling suffix precompress_tree() may have written in some run
+KNOWN_FORMATS = ("gz", "br")
+
+
+def available_formats() -> tuple[str, ...]:
+    """Sibling suffixes that can be written with the installed modules."""
+    return ("gz", "br") if brotli is not None else ("gz",)
+
+
+def compress(data: bytes, fmt: str) -> bytes:
+    """Compress bytes as gzip ("gz", reproducible: no timestamp) or brotli ("br")."""
+    if fmt == "gz":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if fmt == "br":
+        if brotli is None:
+            raise RuntimeError("brotli output requires the 'brotli' package")
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    raise ValueError(f"Unknown compression format: {fmt}")
+
+
+def is_text_asset(path: Path) -> bool:
+    return path.suffix in TEXT_SUFFIXES
+
+
+def _compress_file(args: tuple[str, tuple[str, ...]]) -> tuple[str, str]:
+    """Write the compressed siblings of one file (worker function).
+
+    A sibling that would not be smaller than the source is removed instead of
+    written, since serving it would only cost bytes.
+
+    Returns:
+        (path, SHA-256 of the content that was compressed)
+    """
+    path_str, formats = args
+    path = Path(path_str)
+    data = path.read_bytes()
+    for fmt in formats:
+        sibling = path.with_name(f"{path.name}.{fmt}")
+        packed = compress(data, fmt)
+        if len(packed) < len(data):
+            sibling.write_bytes(packed)
+        else:
+            sibling.unlink(missing_ok=True)
+    return path_str, hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(root: Path) -> dict[str, list]:
+    """Relative path → [size, mtime_ns, sha256, formats] from the last run."""
+    try:
+        data = json.loads((root / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(root: Path, files: dict[str, list]) -> None:
+    data = {"version": MANIFEST_VERSION, "files": files}
+    (root / MANIFEST_FILENAME).write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+
+
+def _unchanged(path: Path, stat: os.stat_result, entry: list) -> bool:
+    """Whether a file still has the content its manifest entry was compressed from."""
+    size, mtime_ns, digest, _formats = entry
+    if size != stat.st_size:
+        return False
+    if mtime_ns == stat.st_mtime_ns:
+        return True
+    # Rewritten with the same bytes (e.g. a re-rendered page)
+    return hashlib.sha256(path.read_bytes()).hexdigest() == digest
+
+
+def _remove_siblings(root: Path, rel: str, formats) -> None:
+    for fmt in formats:
+        (root / f"{rel}.{fmt}").unlink(missing_ok=True)
+
+
+def iter_text_assets(root: Path):
+    """Yield text assets under root, skipping dot files and dot directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if not filename.startswith(".") and is_text_asset(path):
+                yield path
+
+
+def precompress_tree(
+    root: Path, formats: tuple[str, ...] | None = None, max_workers: int | None = None
+) -> dict[str, int]:
+    """Write .gz/.br siblings for every text asset under root, incrementally.
+
+    A file is recompressed when its size or mtime differs from the manifest and
+    its content hash does too. Siblings of files that no longer exist (or fell
+    below MIN_SIZE) are deleted, as are siblings in a format outside formats
+    (e.g. the .br files of an earlier run that had brotli installed).
+
+    Args:
+        root: Site output directory
+        formats: Sibling suffixes to write (default: available_formats())
+        max_workers: Number of compression processes (defaults to CPU count)
+
+    Returns:
+        Counts of "compressed", "unchanged" and "removed" files
+    """
+    formats = tuple(formats or available_formats())
+    previous = load_manifest(root)
+    files: dict[str, list] = {}
+    pending: list[tuple[str, tuple[str, ...]]] = []
+    stats = {"compressed": 0, "unchanged": 0, "removed": 0}
+
+    for path in iter_text_assets(root):
+        stat = path.stat()
+        if stat.st_size < MIN_SIZE:
+            continue
+        rel = path.relative_to(root).as_posix()
+        entry = previous.get(rel)
+
+        if entry and entry[3] == list(formats):
+            if _unchanged(path, stat, entry):
+                files[rel] = [stat.st_size, stat.st_mtime_ns, entry[2], list(formats)]
+                stats["unchanged"] += 1
+                continue
+        else:
+            # New to the manifest or written in other formats: drop the rest
+            _remove_siblings(root, rel, [fmt for fmt in KNOWN_FORMATS if fmt not in formats])
+
+        pending.append((str(path), formats))
+
+    if pending:
+        if len(pending) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_compress_file, pending, chunksize=8))
+        else:
+            results = [_compress_file(task) for task in pending]
+
+        for path_str, digest in results:
+            path = Path(path_str)
+            stat = path.stat()
+            rel = path.relative_to(root).as_posix()
+            files[rel] = [stat.st_size, stat.st_mtime_ns, digest, list(formats)]
+        stats["compressed"] = len(results)
+
+    # Drop siblings of files that were deleted or are no longer compressed
+    for rel, entry in previous.items():
+        if rel in files:
+            continue
+        _remove_siblings(root, rel, entry[3])
+        stats["removed"] += 1
+
+    save_manifest(root, files)
+    return stats
+
+
+def invalidate_stale(root: Path) -> int:
+    """Delete the siblings of files changed or removed since the last precompress_tree().
+
+    For builds that do not precompress: a host would otherwise keep serving
+    the old .gz/.br content of a rewritten file. The manifest keeps only the
+    entries whose siblings are still current.
+
+    Returns:
+        Number of files whose siblings were deleted
+    """
+    previous = load_manifest(root)
+    files: dict[str, list] = {}
+    for rel, entry in previous.items():
+        path = root / rel
+        try:
+            stat = path.stat()
+        except OSError:
+            stat = None
+        if stat is not None and _unchanged(path, stat, entry):
+            files[rel] = [stat.st_size, stat.st_mtime_ns, entry[2], entry[3]]
+        else:
+            _remove_siblings(root, rel, entry[3])
+
+    if previous:
+        save_manifest(root, files)
+    return len(previous) - len(files)
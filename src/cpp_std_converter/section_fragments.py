@@ -0,0 +1,181 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Prerendered per-section content fragments for the adventure game.
+
+The game shows one section in one era at a time. Rather than fetching a whole
+chapter (up to ~1 MB) and slicing and rendering it in the browser, it fetches a
+fragment holding just that section. write_section_fragments() writes one file
+per distinct fragment, named by its content hash, so a section that is the same
+in several eras is stored (and downloaded) once.
+
+Fragments are rendered to HTML with the optional ``markdown-it-py`` package,
+one heading block at a time: a section's HTML is the concatenation of its
+heading blocks, so nested sections reuse their children's rendering. Without
+the package the fragments are markdown and the game renders them as before.
+"""
+
+import hashlib
+import html
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from pathlib import Path
+
+from .markdown_scanner import WIKILINK_PATTERN, VersionIndex, scan_markdown_file
+
+try:
+    from markdown_it import MarkdownIt
+except ImportError:
+    MarkdownIt = None
+
+FRAGMENT_HASH_LENGTH = 12
+FRAGMENT_SUFFIXES = (".html", ".md")
+
+_WIKILINK_PLACEHOLDER = re.compile(r"%%WIKILINK_(\d+)%%")
+
+
+def fragment_format() -> str:
+    """ "html" when fragments can be prerendered, else "md"."""
+    return "html" if MarkdownIt is not None else "md"
+
+
+@cache
+def _markdown_renderer():
+    """CommonMark with raw HTML and GFM tables/strikethrough, like the game's marked setup."""
+    return MarkdownIt("commonmark", {"html": True}).enable(["table", "strikethrough"])
+
+
+def render_markdown(markdown: str) -> str:
+    """Render section markdown to HTML, turning [[stable.name]] into game wikilinks.
+
+    Wikilinks become the same ``<a class="wikilink" data-target=...>`` markup
+    that Game.renderMarkdown() produces, so the game binds them unchanged.
+    """
+    targets: list[str] = []
+
+    def placeholder(match: re.Match) -> str:
+        targets.append(match.group(1))
+        return f"%%WIKILINK_{len(targets) - 1}%%"
+
+    rendered = _markdown_renderer().render(WIKILINK_PATTERN.sub(placeholder, markdown))
+
+    def wikilink(match: re.Match) -> str:
+        target = html.escape(targets[int(match.group(1))])
+        return f'<a href="#" class="wikilink" data-target="{target}">[{target}]</a>'
+
+    return _WIKILINK_PLACEHOLDER.sub(wikilink, rendered)
+
+
+def _render_blocks(blocks: list[str]) -> list[str]:
+    """Render a batch of heading blocks (worker function)."""
+    return [render_markdown(block) for block in blocks]
+
+
+def _section_blocks(index: VersionIndex, stable_name: str) -> list[str] | None:
+    """Heading blocks (heading line up to the next heading) making up a section."""
+    entry = index.sections.get(stable_name)
+    if entry is None:
+        return None
+    chapter, span = entry
+    scan = scan_markdown_file(chapter)
+    if scan is None:
+        return None
+
+    starts = [h.line for h in scan.headings if span.start_line <= h.line <= span.end_line]
+    ends = [line - 1 for line in starts[1:]] + [span.end_line]
+    return [scan.text(start, end) for start, end in zip(starts, ends, strict=True)]
+
+
+def _fragment_name(content: str, fmt: str) -> str:
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:FRAGMENT_HASH_LENGTH]
+    return f"{digest}.{fmt}"
+
+
+def write_section_fragments(
+    stable_names: list[str],
+    version_indexes: list[VersionIndex],
+    output_dir: Path,
+    max_workers: int | None = None,
+) -> dict[str, dict[str, str]]:
+    """Write a fragment for every section in every version that has it.
+
+    Files are named <hash>.<html|md>; existing files are left alone and files no
+    longer referenced are removed.
+
+    Args:
+        stable_names: Sections to write (the world map's sections)
+        version_indexes: One scan_version_dir() index per era
+        output_dir: Fragment directory (e.g., data/game/sections)
+        max_workers: Rendering processes (defaults to CPU count; 1 renders in-process)
+
+    Returns:
+        Stable name → {era: fragment hash} for the sections found
+    """
+    fmt = fragment_format()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Which heading blocks make up each section in each era
+    layouts: dict[tuple[str, str], list[str]] = {}
+    for stable_name in stable_names:
+        for index in version_indexes:
+            blocks = _section_blocks(index, stable_name)
+            if blocks:
+                layouts[(stable_name, index.name)] = blocks
+
+    if fmt == "html":
+        # Render each distinct heading block once, across sections and eras
+        distinct = sorted({block for blocks in layouts.values() for block in blocks})
+        batches = [distinct[i : i + 64] for i in range(0, len(distinct), 64)]
+        if len(batches) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                rendered_batches = list(executor.map(_render_blocks, batches))
+        else:
+            rendered_batches = [_render_blocks(batch) for batch in batches]
+        rendered = dict(
+            zip(distinct, (html for batch in rendered_batches for html in batch), strict=True)
+        )
+
+    fragments: dict[str, dict[str, str]] = {}
+    current = set()
+    for (stable_name, era), blocks in layouts.items():
+        if fmt == "html":
+            content = "".join(rendered[block] for block in blocks)
+        else:
+            content = "".join(blocks).strip()
+        name = _fragment_name(content, fmt)
+        if name not in current:
+            current.add(name)
+            fragment_file = output_dir / name
+            if not fragment_file.exists():
+                fragment_file.write_text(content, encoding="utf-8")
+        fragments.setdefault(stable_name, {})[era] = name.split(".")[0]
+
+    for stale in output_dir.iterdir():
+        if stale.suffix in FRAGMENT_SUFFIXES and stale.name not in current:
+            stale.unlink()
+
+    return fragments
@@ -0,0 +1,208 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Rename and move detection for stable name sections.
+
+Between two versions of the standard, a section that was renamed (or moved to
+another chapter under a new stable name) shows up as one removed name plus one
+added name. find_renames() pairs them up by content similarity.
+
+Comparing every removed section against every added one is quadratic, so the
+candidates come from a MinHash/LSH index: each section's word shingles are
+reduced to a short MinHash signature, signatures are split into bands, and only
+sections that share a band bucket are compared. Candidate pairs are then scored
+with the exact Jaccard similarity of their shingle sets.
+"""
+
+import difflib
+import random
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+
+# Words per shingle
+SHINGLE_SIZE = 5
+
+# 16 bands of 4 rows: pairs above ~0.5 Jaccard almost always share a bucket
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+
+# Minimum Jaccard similarity for a pair to count as a rename
+DEFAULT_THRESHOLD = 0.6
+
+# Sections with fewer shingles than this are too short to match reliably
+MIN_SHINGLES = 4
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class RenameMatch:
+    """A removed stable name paired with the added name that replaced it."""
+
+    old_name: str
+    new_name: str
+    similarity: float  # Jaccard similarity of the two sections' shingle sets
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> frozenset[int]:
+    """
+    Return the set of hashed word shingles for a piece of text.
+
+    Uses crc32 rather than hash() so results are stable across processes.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < size:
+        return frozenset([zlib.crc32(" ".join(tokens).encode())]) if tokens else frozenset()
+    return frozenset(
+        zlib.crc32(" ".join(tokens[i : i + size]).encode()) for i in range(len(tokens) - size + 1)
+    )
+
+
+def jaccard(a: frozenset[int], b: frozenset[int]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    """
+    MinHash signatures bucketed by band for near-linear candidate lookup.
+
+    Signatures use one-permutation hashing: each shingle hash is mixed once and
+    routed to one of num_bands * rows_per_band bins, keeping the minimum per bin.
+    Empty bins borrow from the next non-empty bin (rotation densification). This
+    costs O(shingles) per section instead of O(shingles * signature length).
+    """
+
+    def __init__(
+        self, num_bands: int = NUM_BANDS, rows_per_band: int = ROWS_PER_BAND, seed: int = 1
+    ):
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+        self.num_bins = num_bands * rows_per_band
+        rng = random.Random(seed)
+        self._mix_a = rng.randrange(1, _MERSENNE_PRIME)
+        self._mix_b = rng.randrange(0, _MERSENNE_PRIME)
+        self._buckets: dict[tuple, list[str]] = defaultdict(list)
+
+    def signature(self, shingles: frozenset[int]) -> tuple[int, ...]:
+        """Compute the MinHash signature of a non-empty shingle set."""
+        num_bins = self.num_bins
+        a, b, prime = self._mix_a, self._mix_b, _MERSENNE_PRIME
+        bins: list[int | None] = [None] * num_bins
+        for h in shingles:
+            mixed = (a * h + b) % prime
+            slot = mixed % num_bins
+            value = mixed // num_bins
+            current = bins[slot]
+            if current is None or value < current:
+                bins[slot] = value
+
+        # Densify: an empty bin takes the next non-empty bin's value, offset past the
+        # range of real values by the distance so borrowed values only match each other
+        if None in bins:
+            original = list(bins)
+            for i in range(num_bins):
+                if original[i] is None:
+                    distance = 1
+                    while original[(i + distance) % num_bins] is None:
+                        distance += 1
+                    bins[i] = original[(i + distance) % num_bins] + distance * prime
+        return tuple(bins)
+
+    def _band_keys(self, signature: tuple[int, ...]):
+        rows = self.rows_per_band
+        for band in range(self.num_bands):
+            yield (band, signature[band * rows : (band + 1) * rows])
+
+    def insert(self, key: str, shingles: frozenset[int]) -> None:
+        """Index a shingle set under key."""
+        for band_key in self._band_keys(self.signature(shingles)):
+            self._buckets[band_key].append(key)
+
+    def query(self, shingles: frozenset[int]) -> set[str]:
+        """Return keys that share at least one band bucket with the shingle set."""
+        candidates: set[str] = set()
+        for band_key in self._band_keys(self.signature(shingles)):
+            candidates.update(self._buckets.get(band_key, ()))
+        return candidates
+
+
+def find_renames(
+    old_texts: dict[str, str],
+    new_texts: dict[str, str],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_shingles: int = MIN_SHINGLES,
+) -> list[RenameMatch]:
+    """
+    Pair removed sections with added sections that have near-identical content.
+
+    Each name is used at most once; the most similar pairs win, with ties broken
+    by how alike the stable names themselves are.
+
+    Args:
+        old_texts: Removed stable name -> section text in the old version
+        new_texts: Added stable name -> section text in the new version
+        threshold: Minimum Jaccard similarity to accept a pair
+        min_shingles: Ignore sections with fewer shingles than this
+
+    Returns:
+        List of RenameMatch, sorted by old name
+    """
+    old_shingles = {name: shingle_hashes(text) for name, text in old_texts.items()}
+    new_shingles = {name: shingle_hashes(text) for name, text in new_texts.items()}
+    old_shingles = {n: s for n, s in old_shingles.items() if len(s) >= min_shingles}
+    new_shingles = {n: s for n, s in new_shingles.items() if len(s) >= min_shingles}
+    if not old_shingles or not new_shingles:
+        return []
+
+    index = MinHashLSH()
+    for name, shingles in new_shingles.items():
+        index.insert(name, shingles)
+
+    scored = []
+    for old_name, shingles in old_shingles.items():
+        for new_name in index.query(shingles):
+            similarity = jaccard(shingles, new_shingles[new_name])
+            if similarity >= threshold:
+                name_ratio = difflib.SequenceMatcher(None, old_name, new_name).ratio()
+                scored.append((-similarity, -name_ratio, old_name, new_name, similarity))
+
+    matches = []
+    used_old: set[str] = set()
+    used_new: set[str] = set()
+    for _, _, old_name, new_name, similarity in sorted(scored):
+        if old_name in used_old or new_name in used_new:
+            continue
+        used_old.add(old_name)
+        used_new.add(new_name)
+        matches.append(RenameMatch(old_name, new_name, round(similarity, 3)))
+
+    return sorted(matches, key=lambda m: m.old_name)
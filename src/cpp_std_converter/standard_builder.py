@@ -41,6 +41,7 @@ from pathlib import Path
 
 from pylatexenc.latexwalker import LatexMacroNode, LatexWalker
 
+from .markdown_scanner import scan_markdown_file
 from .utils import cleanup_temp_files, create_temp_tex_file, ensure_dir, expand_latex_inputs
 
 
@@ -686,16 +687,6 @@ class StandardBuilder:
         toc_lines = []
         toc_lines.append("# Table of Contents\n")
 
-        # Pattern to match headings with embedded anchors
-        # Matches: ## Title <a id="label">[[label]]</a>
-        # Also matches annexes: ## Title (informative) <a id="label" data-annex="true" data-annex-type="informative">[[label]]</a>
-        heading_pattern = re.compile(
-            r'^(#{1,6})\s+(.+?)\s+<a id="([^"]+)"(?:\s+[^>]+)?>\[\[([^\]]+)\]\]</a>\s*$',
-            re.MULTILINE,
-        )
-        # Separate pattern to detect if heading is an annex and extract type
-        annex_pattern = re.compile(r'data-annex="true"(?:\s+data-annex-type="([^"]+)")?')
-
         # Track section numbers at each level
         section_numbers = [0, 0, 0, 0, 0, 0]  # Support up to H6
         annex_counter = 0  # Track annex letter (A, B, C, etc.)
@@ -703,20 +694,16 @@ class StandardBuilder:
 
         # Process files in order
         for md_file in output_files:
-            content = md_file.read_text(encoding="utf-8")
             filename = md_file.stem
 
-            for match in heading_pattern.finditer(content):
-                hashes = match.group(1)
-                title = match.group(2).strip()
-                anchor_id = match.group(3)
-                stable_name = match.group(4)
-
-                # Check if this heading is an annex (has data-annex="true")
-                full_match = match.group(0)
-                is_annex = annex_pattern.search(full_match) is not None
+            # Headings (including annex markers) come from the shared chapter scan
+            for heading in scan_markdown_file(md_file).headings:
+                title = heading.title
+                anchor_id = heading.anchor
+                stable_name = heading.stable_name
+                is_annex = heading.is_annex
 
-                level = len(hashes) - 1  # H1=0, H2=1, etc.
+                level = heading.level - 1  # H1=0, H2=1, etc.
 
                 # For annex headings at H1 level, use letter numbering
                 if is_annex and level == 0:
@@ -809,9 +796,6 @@ class StandardBuilder:
             ("depr", "Deprecated features"),
         ]
 
-        # Pattern to extract BNF code blocks: ``` bnf\n...\n```
-        bnf_pattern = re.compile(r"^``` bnf\n(.*?)\n```$", re.MULTILINE | re.DOTALL)
-
         # Collect BNF blocks by stable name
         bnf_by_file = {}
         file_by_stem = {f.stem: f for f in output_files}
@@ -819,11 +803,10 @@ class StandardBuilder:
         for stable_name, section_title in grammar_sections:
             if stable_name in file_by_stem:
                 md_file = file_by_stem[stable_name]
-                content = md_file.read_text(encoding="utf-8")
 
-                # Extract BNF blocks that contain grammar definitions
+                # Extract ``` bnf blocks that contain grammar definitions
                 # Filter out example/explanation blocks (like "behaves as if")
-                all_blocks = bnf_pattern.findall(content)
+                all_blocks = [b.content for b in scan_markdown_file(md_file).bnf_blocks]
                 blocks = [b for b in all_blocks if self._is_grammar_definition(b)]
 
                 if blocks:
@@ -0,0 +1,315 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Realm-sharded adventure world map.
+
+The game used to block startup on one world-map.json holding every section.
+shard_world_map() splits it into:
+
+- a manifest (index.json): eras, realms and their entry points, build info
+- one shard per realm (realms/<realm>.json): the realm's sections, the
+  stable name aliases of those sections, and stubs for sections in other
+  realms that they lead to (connections, parents, children and aliases), so
+  exits and timeshifts can be described before the neighbouring realm is
+  loaded (a realm is a stable name prefix, so a chapter's hierarchy spans
+  several realms)
+- a section directory (sections.json): a stub per section, loaded in the
+  background for search, goto and the parser's vocabulary
+- a navigation index (routes.json): for every pair of realms, the next realm
+  on a shortest path between them, so the game can plan a route without
+  loading (or walking) the realms in between
+
+Stubs carry only what is needed to name a section and check its eras.
+
+With compact=True the files are written without indentation, and world files
+use encode_compact(): stable names become indexes into a per-file string
+table and empty fields are left out. World.decode() in world.js reverses it.
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+WORLD_DIR = "world"
+REALMS_DIR = "realms"
+MANIFEST_FILENAME = "index.json"
+DIRECTORY_FILENAME = "sections.json"
+ROUTES_FILENAME = "routes.json"
+
+STUB_FIELDS = ("stableName", "displayName", "title", "realm", "chapter", "parent", "availableIn")
+
+COMPACT_ENCODING = "compact-1"
+
+# Section fields holding stable names (encoded as string table indexes)
+SECTION_REF_FIELDS = ("stableName", "parent", "realm")
+SECTION_REF_LIST_FIELDS = ("children",)
+SECTION_REF_MAP_FIELDS = ("connections",)
+
+# World file entries that map stable names to sections or stubs
+SECTION_COLLECTIONS = ("sections", "neighbors", "stubs")
+
+
+def section_stub(section: dict[str, Any]) -> dict[str, Any]:
+    """The fields of a section needed to list it without loading its realm."""
+    return {field: section[field] for field in STUB_FIELDS if field in section}
+
+
+def linked_sections(section: dict[str, Any]) -> list[str]:
+    """Sections one move away: connections, parent and children."""
+    linked = [target for target in section.get("connections", {}).values() if target]
+    if section.get("parent"):
+        linked.append(section["parent"])
+    linked.extend(section.get("children", []))
+    return linked
+
+
+def realm_entry(realm_key: str, realm_sections: list[str]) -> str | None:
+    """Where a realm is entered: its top-level section, else its first section."""
+    if realm_key in realm_sections:
+        return realm_key
+    return realm_sections[0] if realm_sections else None
+
+
+def shard_world_map(
+    world_map: dict[str, Any], aliases: dict[str, list[str]]
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Split a world map into a manifest, per-realm shards and a section directory.
+
+    Args:
+        world_map: Complete world map (generate_world_map() plus merged content)
+        aliases: Stable name → aliases (bidirectional)
+
+    Returns:
+        (manifest, realm key → shard, stable name → stub)
+    """
+    sections = world_map["sections"]
+
+    manifest = {
+        key: value
+        for key, value in world_map.items()
+        if key not in ("sections", "realms", "stableNameAliases")
+    }
+    manifest["realms"] = {}
+    shards = {}
+    for realm_key, realm in world_map["realms"].items():
+        realm_sections = [name for name in realm.get("sections", []) if name in sections]
+        manifest["realms"][realm_key] = {
+            **{key: value for key, value in realm.items() if key != "sections"},
+            "entry": realm_entry(realm_key, realm_sections),
+            "sectionCount": len(realm_sections),
+        }
+
+        members = set(realm_sections)
+        realm_aliases = {name: aliases[name] for name in realm_sections if aliases.get(name)}
+        outside = {target for name in realm_sections for target in linked_sections(sections[name])}
+        outside.update(alias for names in realm_aliases.values() for alias in names)
+        shards[realm_key] = {
+            "realm": realm_key,
+            "sections": {name: sections[name] for name in realm_sections},
+            "aliases": realm_aliases,
+            "neighbors": {
+                name: section_stub(sections[name])
+                for name in sorted(outside - members)
+                if name in sections
+            },
+        }
+
+    directory = {name: section_stub(section) for name, section in sections.items()}
+    return manifest, shards, directory
+
+
+class _StringTable:
+    """Assigns each distinct string an index in first-use order."""
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def ref(self, value: str) -> int:
+        if value not in self._ids:
+            self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return self._ids[value]
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == [] or value == {}
+
+
+def omit_empty(value: Any) -> Any:
+    """Recursively drop None, [] and {} values from dicts."""
+    if isinstance(value, dict):
+        return {key: omit_empty(item) for key, item in value.items() if not _is_empty(item)}
+    if isinstance(value, list):
+        return [omit_empty(item) for item in value]
+    return value
+
+
+def _encode_section(section: dict[str, Any], table: _StringTable) -> dict[str, Any]:
+    encoded = {}
+    for key, value in section.items():
+        if _is_empty(value):
+            continue
+        if key in SECTION_REF_FIELDS:
+            value = table.ref(value)
+        elif key in SECTION_REF_LIST_FIELDS:
+            value = [table.ref(name) for name in value]
+        elif key in SECTION_REF_MAP_FIELDS:
+            value = {k: table.ref(name) for k, name in value.items() if name}
+        else:
+            value = omit_empty(value)
+        encoded[key] = value
+    return encoded
+
+
+def encode_compact(data: dict[str, Any]) -> dict[str, Any]:
+    """Encode a world file (manifest, shard or directory) with a string table.
+
+    Section collections become lists of sections (keyed again by stableName
+    when decoded), stable name references become string table indexes,
+    aliases become [name, [aliases]] index pairs, and empty fields are dropped.
+    """
+    table = _StringTable()
+    encoded: dict[str, Any] = {}
+    for key, value in data.items():
+        if key in SECTION_COLLECTIONS:
+            encoded[key] = [_encode_section(section, table) for section in value.values()]
+        elif key == "aliases":
+            encoded[key] = [
+                [table.ref(name), [table.ref(alias) for alias in names]]
+                for name, names in value.items()
+            ]
+        elif not _is_empty(value):
+            encoded[key] = omit_empty(value)
+    return {"encoding": COMPACT_ENCODING, "strings": table.strings, **encoded}
+
+
+def json_text(data: Any, compact: bool = False) -> str:
+    """Serialize game data: indented, or with no whitespace when compact."""
+    if compact:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(data, indent=2)
+
+
+def realm_graph(world_map: dict[str, Any]) -> dict[str, set[str]]:
+    """Realms adjacent by a single move (connection, parent or child) from one to the other."""
+    sections = world_map["sections"]
+    adjacency: dict[str, set[str]] = {realm_key: set() for realm_key in world_map["realms"]}
+    for section in sections.values():
+        realm_key = section["realm"]
+        for target in linked_sections(section):
+            if target in sections and sections[target]["realm"] != realm_key:
+                adjacency.setdefault(realm_key, set()).add(sections[target]["realm"])
+    return adjacency
+
+
+def navigation_index(world_map: dict[str, Any]) -> dict[str, Any]:
+    """Next-hop table between realms from a breadth-first search of the realm graph.
+
+    Returns:
+        {'realms': realm keys, 'next': one row per source realm}, where
+        next[source][target] is the index of the first realm to move into
+        on a shortest path (source itself when source == target, -1 if
+        unreachable). Rows are run-length encoded as [index, count, ...].
+    """
+    adjacency = realm_graph(world_map)
+    realms = list(adjacency)
+    positions = {realm_key: position for position, realm_key in enumerate(realms)}
+    neighbors = [sorted(positions[other] for other in adjacency[realm_key]) for realm_key in realms]
+
+    rows = []
+    for source in range(len(realms)):
+        first_hop = [-1] * len(realms)
+        first_hop[source] = source
+        queue = deque()
+        for neighbor in neighbors[source]:
+            first_hop[neighbor] = neighbor
+            queue.append(neighbor)
+        while queue:
+            current = queue.popleft()
+            for neighbor in neighbors[current]:
+                if first_hop[neighbor] == -1:
+                    first_hop[neighbor] = first_hop[current]
+                    queue.append(neighbor)
+        rows.append(_run_length(first_hop))
+
+    return {"realms": realms, "next": rows}
+
+
+def _run_length(values: list[int]) -> list[int]:
+    encoded: list[int] = []
+    for value in values:
+        if encoded and encoded[-2] == value:
+            encoded[-1] += 1
+        else:
+            encoded.extend((value, 1))
+    return encoded
+
+
+def _write_json(path: Path, data: dict[str, Any], compact: bool) -> bool:
+    """Write a world file if it differs from what is on disk; True if written."""
+    content = json_text(encode_compact(data) if compact else data, compact)
+    if path.exists() and path.read_text(encoding="utf-8") == content:
+        return False
+    path.write_text(content, encoding="utf-8")
+    return True
+
+
+def write_world_shards(
+    world_map: dict[str, Any],
+    aliases: dict[str, list[str]],
+    world_dir: Path,
+    compact: bool = False,
+) -> dict[str, int]:
+    """Write the manifest, section directory, navigation index and realm shards.
+
+    Unchanged files are left alone (keeping their mtimes and precompressed
+    siblings valid) and shards of realms that no longer exist are removed.
+    With compact, files use encode_compact() and no indentation.
+
+    Returns:
+        Counts of shards 'written', 'unchanged' and 'removed'
+    """
+    manifest, shards, directory = shard_world_map(world_map, aliases)
+    realms_dir = world_dir / REALMS_DIR
+    realms_dir.mkdir(parents=True, exist_ok=True)
+
+    _write_json(world_dir / MANIFEST_FILENAME, manifest, compact)
+    _write_json(world_dir / DIRECTORY_FILENAME, {"stubs": directory}, compact)
+    _write_json(world_dir / ROUTES_FILENAME, navigation_index(world_map), compact)
+
+    counts = {"written": 0, "unchanged": 0, "removed": 0}
+    for realm_key, shard in shards.items():
+        written = _write_json(realms_dir / f"{realm_key}.json", shard, compact)
+        counts["written" if written else "unchanged"] += 1
+
+    for stale in realms_dir.glob("*.json"):
+        if stale.stem not in shards:
+            stale.unlink()
+            counts["removed"] += 1
+
+    return counts
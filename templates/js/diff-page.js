@@ -0,0 +1,8 @@
+// C++ Standard Evolution Viewer - diff page setup (scroll sync and syntax highlighting)
+
+document.addEventListener('DOMContentLoaded', () => {
+    const targetElement = document.getElementById('diff');
+    const diff2htmlUi = new Diff2HtmlUI(targetElement);
+    diff2htmlUi.synchronisedScroll();
+    diff2htmlUi.highlightCode();
+});
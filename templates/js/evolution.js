@@ -0,0 +1,118 @@
+// C++ Standard Evolution Viewer - evolution page: every version of one section from a single bundle
+
+(function() {
+    'use strict';
+
+    function element(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function showStatus(message) {
+        document.getElementById('evolution-status').textContent = message;
+    }
+
+    function renderVersions(bundle) {
+        const timeline = document.getElementById('evolution-versions');
+        timeline.appendChild(element('span', 'timeline-label', 'Versions: '));
+        bundle.versions.forEach((version, index) => {
+            if (index > 0) timeline.appendChild(document.createTextNode(' | '));
+            if (version.text) {
+                const link = element('a', null, version.name);
+                link.href = '#text-' + version.tag;
+                timeline.appendChild(link);
+            } else {
+                const missing = element('span', 'disabled', version.name);
+                missing.title = 'Not in ' + version.name;
+                timeline.appendChild(missing);
+            }
+        });
+    }
+
+    function renderDiffs(bundle) {
+        const container = document.getElementById('evolution-diffs');
+        if (bundle.diffs.length === 0) {
+            container.appendChild(element('p', null, 'This section has no changes between versions.'));
+            return;
+        }
+
+        bundle.diffs.forEach(diff => {
+            const heading = element('h2', null, diff.from + ' → ' + diff.to + ' ');
+            const link = element('a', 'evolution-diff-link', 'full page');
+            link.href = 'diffs/' + diff.slug + '/' + encodeURIComponent(bundle.file) + '.html';
+            heading.appendChild(link);
+            container.appendChild(heading);
+
+            const target = element('div', 'evolution-diff');
+            container.appendChild(target);
+            if (window.Diff2HtmlUI) {
+                const ui = new Diff2HtmlUI(target, diff.diff, {
+                    drawFileList: false,
+                    matching: 'lines',
+                    outputFormat: 'side-by-side',
+                });
+                ui.draw();
+                ui.highlightCode();
+            } else {
+                target.appendChild(element('pre', 'evolution-text', diff.diff));
+            }
+        });
+    }
+
+    function renderTexts(bundle) {
+        const section = document.getElementById('evolution-texts');
+        const firstSeen = {};
+        bundle.versions.forEach(version => {
+            if (!version.text) return;
+            const details = element('details');
+            details.id = 'text-' + version.tag;
+            const summary = element('summary', null, version.name + ' (' + version.tag + ')');
+            if (firstSeen[version.text]) {
+                summary.textContent += ' — same as ' + firstSeen[version.text];
+            } else {
+                firstSeen[version.text] = version.name;
+            }
+            details.appendChild(summary);
+            details.appendChild(element('pre', 'evolution-text', bundle.texts[version.text]));
+            section.appendChild(details);
+        });
+        section.hidden = false;
+    }
+
+    function render(bundle) {
+        document.title = '[' + bundle.name + '] Evolution - C++ Standard Evolution Viewer';
+        document.getElementById('evolution-title').textContent = '[' + bundle.name + ']';
+        renderVersions(bundle);
+        renderDiffs(bundle);
+        renderTexts(bundle);
+        showStatus('');
+
+        // Open the linked version's text when arriving with #text-<tag>
+        const target = window.location.hash && document.getElementById(window.location.hash.slice(1));
+        if (target && target.tagName === 'DETAILS') target.open = true;
+    }
+
+    document.addEventListener('DOMContentLoaded', () => {
+        const main = document.getElementById('main-content');
+        const name = new URLSearchParams(window.location.search).get('name');
+        if (!name || name.includes('/')) {
+            showStatus('No section selected.');
+            return;
+        }
+
+        fetch(main.dataset.bundles + '/' + encodeURIComponent(name) + '.json')
+            .then(response => {
+                if (!response.ok) throw new Error(response.status);
+                return response.json();
+            })
+            .then(render)
+            .catch(() => showStatus('No history found for [' + name + '].'));
+
+        window.addEventListener('hashchange', () => {
+            const target = document.getElementById(window.location.hash.slice(1));
+            if (target && target.tagName === 'DETAILS') target.open = true;
+        });
+    });
+})();
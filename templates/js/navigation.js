@@ -23,6 +23,12 @@
         // Enhance external links
         enhanceExternalLinks();
 
+        // Sync the version timeline with the published availability matrix
+        refreshTimeline();
+
+        // Fetch the remaining parts of large diffs as the reader scrolls
+        addLazyDiffChunks();
+
         // TODO: Dark mode toggle disabled - needs fix for diff2html compatibility
         // addThemeToggle();
     }
@@ -112,6 +118,128 @@
         }
     }
 
+    /**
+     * Load the remaining parts of a large diff on scroll or on click
+     *
+     * Large diff pages hold only their first part; #diff-more lists the URLs of
+     * the other parts (HTML fragments, each a complete diff2html wrapper). Parts
+     * are appended in order, then scrolled in sync and highlighted like the first.
+     */
+    function addLazyDiffChunks() {
+        const more = document.getElementById('diff-more');
+        const diff = document.getElementById('diff');
+        if (!more || !diff || !window.fetch) return;
+
+        const chunks = JSON.parse(more.dataset.chunks || '[]');
+        const button = more.querySelector('button');
+        let next = 0;
+        let loading = null;
+        let observer = null;
+
+        function updateButton() {
+            const remaining = chunks.length - next;
+            if (remaining === 0) {
+                if (observer) observer.disconnect();
+                more.remove();
+                return;
+            }
+            button.disabled = false;
+            button.textContent = `Load remaining changes (${remaining} more part${remaining === 1 ? '' : 's'})`;
+        }
+
+        function loadNext() {
+            if (loading || next >= chunks.length) return;
+
+            button.disabled = true;
+            button.textContent = 'Loading…';
+            loading = fetch(chunks[next])
+                .then(response => {
+                    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                    return response.text();
+                })
+                .then(html => {
+                    const part = document.createElement('div');
+                    part.className = 'diff-chunk';
+                    part.innerHTML = html;
+                    diff.appendChild(part);
+                    next++;
+
+                    if (window.Diff2HtmlUI) {
+                        const partUi = new Diff2HtmlUI(part);
+                        partUi.synchronisedScroll();
+                        partUi.highlightCode();
+                    }
+                })
+                .catch(err => {
+                    // Stop loading on scroll; the button stays for a manual retry
+                    console.warn('Failed to load diff part:', err);
+                    if (observer) observer.disconnect();
+                    observer = null;
+                })
+                .finally(() => {
+                    loading = null;
+                    updateButton();
+                    // Re-observe so a sentinel that is still on screen loads the next part
+                    if (observer && next < chunks.length) {
+                        observer.unobserve(more);
+                        observer.observe(more);
+                    }
+                });
+        }
+
+        button.addEventListener('click', loadNext);
+
+        if ('IntersectionObserver' in window) {
+            observer = new IntersectionObserver(entries => {
+                if (entries.some(entry => entry.isIntersecting)) loadNext();
+            }, { rootMargin: '1500px 0px' });
+            observer.observe(more);
+        }
+    }
+
+    /**
+     * Update version timeline links from availability.json
+     *
+     * Pages skipped by incremental builds keep the timeline they were rendered
+     * with; the matrix written on every build enables newly available versions
+     * and disables removed ones. Bit i of a mask is set when pairs[i] has the diff.
+     */
+    function refreshTimeline() {
+        const timeline = document.querySelector('.version-timeline[data-availability]');
+        if (!timeline || !window.fetch) return;
+
+        fetch(timeline.dataset.availability)
+            .then(response => response.ok ? response.json() : null)
+            .then(index => {
+                if (!index || !index[timeline.dataset.kind]) return;
+                const name = timeline.dataset.name;
+                const mask = index[timeline.dataset.kind][name] || 0;
+
+                timeline.querySelectorAll('[data-slug]').forEach(entry => {
+                    if (entry.classList.contains('active')) return;
+
+                    const slug = entry.dataset.slug;
+                    const bit = index.pairs.indexOf(slug);
+                    if (bit < 0) return;
+
+                    const available = (mask & (1 << bit)) !== 0;
+                    const isLink = entry.tagName === 'A';
+                    if (available === isLink) return;
+
+                    const replacement = document.createElement(available ? 'a' : 'span');
+                    if (available) {
+                        replacement.href = '../' + slug + '/' + name + '.html';
+                    } else {
+                        replacement.className = 'disabled';
+                    }
+                    replacement.dataset.slug = slug;
+                    replacement.textContent = entry.textContent;
+                    entry.replaceWith(replacement);
+                });
+            })
+            .catch(() => {});
+    }
+
     /**
      * Add smooth scrolling to anchor links
      */
@@ -0,0 +1,149 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Tests for anchored_diff module
+
+Tests anchor alignment and the chunked full-standard diff against plain git diff.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from cpp_std_converter import anchored_diff as anchored_diff_module
+from cpp_std_converter.anchored_diff import (
+    align_anchors,
+    anchored_diff,
+    diff_chunk,
+    plan_chunks,
+    split_lines,
+)
+
+
+def section(name: str, body: str) -> str:
+    return f'## {name} <a id="{name}">[[{name}]]</a>\n\n{body}\n\n'
+
+
+def paragraphs(prefix: str, count: int) -> str:
+    return "\n".join(f"{prefix} paragraph {i} text" for i in range(count))
+
+
+OLD = "".join(section(f"sec.{n}", paragraphs(n, 12)) for n in "abcdef")
+NEW = (
+    section("sec.a", paragraphs("a", 12))
+    + section("sec.c", paragraphs("c", 12))  # sec.b removed, sec.c moved up
+    + section("sec.d", paragraphs("d", 12).replace("paragraph 5", "paragraph five"))
+    + section("sec.b", paragraphs("b", 12))
+    + section("sec.e", paragraphs("e", 12) + "\nadded line")
+    + section("sec.f", paragraphs("f", 12))
+)
+
+
+def git_diff(old_file, new_file, cwd) -> str:
+    result = subprocess.run(
+        ["git", "diff", "--no-index", "--unified=3", "--ignore-all-space", old_file, new_file],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def write_pair(tmp_path, old: str, new: str):
+    (tmp_path / "full").mkdir()
+    (tmp_path / "full" / "old.md").write_text(old, encoding="utf-8")
+    (tmp_path / "full" / "new.md").write_text(new, encoding="utf-8")
+
+
+class TestAlignment:
+    """Test anchor alignment and chunk planning."""
+
+    def test_split_lines_keeps_missing_final_newline(self):
+        assert split_lines("a\nb") == ["a\n", "b"]
+        assert split_lines("a\r\nb\n") == ["a\r\n", "b\n"]
+
+    def test_moved_section_drops_out(self):
+        old_lines, new_lines = split_lines(OLD), split_lines(NEW)
+        aligned = [
+            old_lines[old_pos].split()[1] for old_pos, _ in align_anchors(old_lines, new_lines)
+        ]
+        # sec.b moved after sec.d, so it cannot split both files in order
+        assert aligned == ["sec.a", "sec.c", "sec.d", "sec.e", "sec.f"]
+
+    def test_chunks_tile_both_files(self):
+        old_lines, new_lines = split_lines(OLD), split_lines(NEW)
+        chunks = plan_chunks(old_lines, new_lines, min_lines=1)
+        assert len(chunks) == 5
+        assert chunks[0][0] == 0 and chunks[0][2] == 0
+        assert chunks[-1][1] == len(old_lines) and chunks[-1][3] == len(new_lines)
+        for before, after in zip(chunks, chunks[1:], strict=False):
+            assert before[1] == after[0] and before[3] == after[2]
+
+
+class TestAnchoredDiff:
+    """Test the chunked diff output."""
+
+    def test_single_chunk_matches_git(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        write_pair(tmp_path, OLD, NEW.replace("a paragraph 2", "a  paragraph 2") + "tail")
+        expected = git_diff("full/old.md", "full/new.md", tmp_path)
+        actual = anchored_diff(Path("full/old.md"), Path("full/new.md"), min_chunk_lines=10**9)
+        assert actual == expected
+
+    def test_chunked_diff_covers_all_changes(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        write_pair(tmp_path, OLD, NEW)
+        diff = anchored_diff(Path("full/old.md"), Path("full/new.md"), min_chunk_lines=1)
+        assert diff.startswith("diff --git a/full/old.md b/full/new.md\n")
+        assert "-d paragraph 5 text\n+d paragraph five text\n" in diff
+        assert "+added line\n" in diff
+        assert "-b paragraph 0 text\n" in diff and "+b paragraph 0 text\n" in diff
+
+    def test_identical_files(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        write_pair(tmp_path, OLD, OLD)
+        assert anchored_diff(Path("full/old.md"), Path("full/new.md")) == ""
+
+    @pytest.mark.parametrize(
+        "failure",
+        [
+            subprocess.TimeoutExpired(["git"], 60),
+            FileNotFoundError("git"),
+            subprocess.CompletedProcess(["git"], 128, "", "fatal: bad revision\n"),
+            subprocess.CompletedProcess(["git"], 129, "", ""),
+        ],
+    )
+    def test_git_failures_raise(self, monkeypatch, failure):
+        def fake_run_command(*_args, **_kwargs):
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+
+        monkeypatch.setattr(anchored_diff_module, "run_command", fake_run_command)
+        # A failed chunk must not be mistaken for an identical one
+        with pytest.raises(RuntimeError):
+            diff_chunk("a\n", "b\n", ())
@@ -0,0 +1,85 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""Tests for build stage and page timings."""
+
+import json
+
+from cpp_std_converter.build_timings import BuildTimer, measure
+
+
+def test_measure_fills_wall_and_cpu():
+    with measure() as elapsed:
+        sum(range(10000))
+    assert set(elapsed) == {"wall", "cpu"}
+    assert elapsed["wall"] >= 0 and elapsed["cpu"] >= 0
+
+
+def test_repeated_stages_accumulate():
+    timer = BuildTimer()
+    for _ in range(3):
+        with timer.stage("overview"):
+            pass
+    with timer.stage("seo"):
+        pass
+
+    assert list(timer.stages) == ["overview", "seo"]
+    assert timer.stages["overview"]["calls"] == 3
+
+
+def test_stage_is_recorded_when_block_raises():
+    timer = BuildTimer()
+    try:
+        with timer.stage("collection"):
+            raise ValueError
+    except ValueError:
+        pass
+    assert timer.stages["collection"]["calls"] == 1
+
+
+def test_pages_sorted_slowest_first(tmp_path):
+    timer = BuildTimer()
+
+    def step(wall):
+        return {"wall": wall, "cpu": wall / 2}
+
+    timer.add_page("diffs/a/fast.html", 1.0, {"render": step(0.1), "assemble": step(0.1)})
+    timer.add_page("diffs/a/slow.html", 90.5, {"render": step(2.0), "assemble": step(0.5)})
+    timer.add_page("diffs/a/failed.html", 3.0, {"render": step(0.3)}, success=False)
+
+    assert [page["page"] for page in timer.slowest_pages(2)] == [
+        "diffs/a/slow.html",
+        "diffs/a/failed.html",
+    ]
+    assert timer.slowest_pages(1)[0]["wall"] == 2.5
+    assert timer.page_steps()["assemble"] == {"wall": 0.6, "cpu": 0.3, "pages": 2}
+
+    timer.write(tmp_path / "timings.json")
+    report = json.loads((tmp_path / "timings.json").read_text())
+    assert report["pages"][0]["size_kb"] == 90.5
+    assert report["pages"][1]["success"] is False
+
+    table = timer.format_table(1).splitlines()
+    assert len(table) == 2 and table[1].endswith("diffs/a/slow.html")
@@ -0,0 +1,126 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Tests for diff_render module
+
+Tests the in-process renderer that produces diff2html side-by-side markup.
+"""
+
+from cpp_std_converter.diff_render import (
+    file_diff_name,
+    highlight_changes,
+    parse_unified_diff,
+    render_side_by_side,
+    render_side_by_side_chunks,
+)
+
+DIFF = """\
+# Diff for [alg.copy]
+# Stable name: alg.copy
+
+diff --git a/from.md b/to.md
+index 1111111..2222222 100644
+--- a/from.md
++++ b/to.md
+@@ -1,4 +1,4 @@ Algorithms
+ context line
+-Copies <a> range
++Copies <b> range
++extra line
+-gone line
+ tail
+"""
+
+
+class TestParse:
+    """Test unified diff parsing."""
+
+    def test_files_blocks_and_numbers(self):
+        files = parse_unified_diff(DIFF)
+        assert len(files) == 1
+        assert (files[0].old_name, files[0].new_name) == ("from.md", "to.md")
+        lines = files[0].blocks[0].lines
+        assert [line.kind for line in lines] == [" ", "-", "+", "+", "-", " "]
+        assert (lines[-1].old_number, lines[-1].new_number) == (4, 4)
+        assert lines[3].new_number == 3
+
+    def test_file_diff_name(self):
+        files = parse_unified_diff(DIFF)
+        assert file_diff_name(files[0]) == "from.md → to.md"
+        files[0].old_name, files[0].new_name = "a/x/f.md", "a/y/f.md"
+        assert file_diff_name(files[0]) == "a/{x → y}/f.md"
+
+
+class TestRender:
+    """Test the diff2html-compatible markup."""
+
+    def test_word_highlight_is_escaped(self):
+        old_html, new_html = highlight_changes("Copies <a> range", "Copies <b> range")
+        assert old_html == "Copies &lt;<del>a</del>&gt; range"
+        assert new_html == "Copies &lt;<ins>b</ins>&gt; range"
+
+    def test_side_by_side_rows_line_up(self):
+        html = render_side_by_side(DIFF)
+        assert html.startswith('<div class="d2h-wrapper d2h-auto-color-scheme">')
+        left, right = html.split('<div class="d2h-file-side-diff">')[1:]
+        assert left.count("<tr>") == right.count("<tr>")
+        # Each row carries its class on both the line-number and the content cell
+        assert left.count("d2h-del d2h-change") == 2
+        assert right.count("d2h-ins d2h-change") == 2
+        # "extra line" and "gone line" have no partner, so each side gets one placeholder
+        assert left.count('<td class="d2h-cntx d2h-emptyplaceholder">') == 1
+        assert right.count('<td class="d2h-cntx d2h-emptyplaceholder">') == 1
+        assert "@@ -1,4 +1,4 @@ Algorithms" in left
+
+    def test_empty_diff(self):
+        assert render_side_by_side("# Diff for [x]\n") == (
+            '<div class="d2h-wrapper d2h-auto-color-scheme">\n\n</div>'
+        )
+
+
+class TestChunks:
+    """Test splitting large diffs into separately loaded parts."""
+
+    HUNKS = DIFF + "".join(f"@@ -{n},2 +{n},2 @@\n-old {n}\n+new {n}\n" for n in range(10, 100, 10))
+
+    def test_small_diff_is_one_part(self):
+        assert render_side_by_side_chunks(DIFF, 100) == [render_side_by_side(DIFF)]
+
+    def test_parts_split_between_hunks(self):
+        chunks = render_side_by_side_chunks(self.HUNKS, 7)
+
+        # The 7-line first hunk fills a part; the 3-line hunks pair up
+        assert len(chunks) == 6
+        assert all(chunk.startswith('<div class="d2h-wrapper') for chunk in chunks)
+        # Every hunk appears exactly once across the parts
+        assert sum(chunk.count("@@ -") for chunk in chunks) == 10
+        assert "d2h-file-continued" not in chunks[0]
+        assert all("d2h-file-continued" in chunk for chunk in chunks[1:])
+
+    def test_oversized_hunk_gets_own_part(self):
+        chunks = render_side_by_side_chunks(DIFF, 1)
+        assert len(chunks) == 1
+        assert chunks[0].count("@@ -1,4") == 1
@@ -25,6 +25,7 @@
 
 """Tests for generate_diffs.py script."""
 
+import subprocess
 import sys
 import tempfile
 from pathlib import Path
@@ -471,5 +472,226 @@ class TestFindCommonChapters:
                     generate_diffs.find_common_chapters("n3337", "nonexistent")
 
 
+class TestDiffCache:
+    """Test the content-hash keyed diff cache."""
+
+    def test_content_hash_treats_none_as_empty(self):
+        """Test that missing content hashes like empty content."""
+        assert generate_diffs.content_hash(None) == generate_diffs.content_hash("")
+        assert generate_diffs.content_hash("a") != generate_diffs.content_hash("b")
+
+    def test_cache_roundtrip(self):
+        """Test storing and retrieving a diff body."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = generate_diffs.DiffCache(Path(tmpdir))
+            assert cache.get("aaa", "bbb") is None
+            cache.put("aaa", "bbb", "@@ -1 +1 @@\n-old\n+new\n")
+            assert cache.get("aaa", "bbb") == "@@ -1 +1 @@\n-old\n+new\n"
+            assert cache.get("bbb", "aaa") is None
+            assert cache.hits == 1
+            assert cache.misses == 2
+
+    def test_cached_body_reused_with_new_header(self):
+        """Test that a cache hit rewrites only the per-file header."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = Path(tmpdir)
+            cache = generate_diffs.DiffCache(tmpdir / "cache")
+
+            first = tmpdir / "alg.copy.diff"
+            second = tmpdir / "alg.move.diff"
+            assert generate_diffs.generate_stable_name_diff(
+                "alg.copy", "old line\n", "new line\n", first, cache=cache
+            )
+            assert generate_diffs.generate_stable_name_diff(
+                "alg.move", "old line\n", "new line\n", second, cache=cache
+            )
+
+            assert cache.misses == 1
+            assert cache.hits == 1
+
+            first_text = first.read_text(encoding="utf-8")
+            second_text = second.read_text(encoding="utf-8")
+            assert first_text.startswith("# Diff for [alg.copy]\n")
+            assert second_text.startswith("# Diff for [alg.move]\n")
+            assert "+new line" in second_text
+            assert first_text.split("\n", 3)[3] == second_text.split("\n", 3)[3]
+
+    def test_diff_body_is_independent_of_temp_paths(self):
+        """Test that identical inputs always produce identical diff bodies."""
+        first = generate_diffs.compute_section_diff("a\n", "b\n")
+        second = generate_diffs.compute_section_diff("a\n", "b\n")
+        assert first == second
+        assert "a/from.md" in first
+
+    def test_failed_diff_is_not_cached(self, monkeypatch):
+        """Test that a git failure or timeout returns None and caches nothing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = generate_diffs.DiffCache(Path(tmpdir))
+
+            def timeout(*args, **kwargs):
+                raise subprocess.TimeoutExpired(args[0], 30)
+
+            monkeypatch.setattr(generate_diffs, "run_command", timeout)
+            assert generate_diffs.compute_section_diff("a\n", "b\n", cache) is None
+
+            failed = subprocess.CompletedProcess([], 128, stdout="", stderr="error: oops")
+            monkeypatch.setattr(generate_diffs, "run_command", lambda *a, **k: failed)
+            assert generate_diffs.compute_section_diff("a\n", "b\n", cache) is None
+
+            key = (generate_diffs.content_hash("a\n"), generate_diffs.content_hash("b\n"))
+            assert cache.get(*key) is None
+
+
+class TestManifestInvalidation:
+    """Test manifest-driven skip checks for stable name and table diffs."""
+
+    @staticmethod
+    def _write_versions(root: Path, old_body: str, new_body: str, extra: str = "") -> None:
+        (root / "va").mkdir(exist_ok=True)
+        (root / "vb").mkdir(exist_ok=True)
+        (root / "va" / "ch.md").write_text(
+            '# Chapter <a id="ch">[[ch]]</a>\n\n'
+            '## One <a id="ch.one">[[ch.one]]</a>\n\n'
+            f"{old_body}\n\n"
+            '## Two <a id="ch.two">[[ch.two]]</a>\n\nsame\n',
+            encoding="utf-8",
+        )
+        (root / "vb" / "ch.md").write_text(
+            '# Chapter <a id="ch">[[ch]]</a>\n\n'
+            '## One <a id="ch.one">[[ch.one]]</a>\n\n'
+            f"{new_body}\n\n"
+            '## Two <a id="ch.two">[[ch.two]]</a>\n\nsame\n',
+            encoding="utf-8",
+        )
+        (root / "vb" / "meta.md").write_text(extra, encoding="utf-8")
+
+    def test_unchanged_inputs_are_skipped(self, tmp_path, monkeypatch):
+        """Test that touching an unrelated chapter does not regenerate diffs."""
+        monkeypatch.chdir(tmp_path)
+        self._write_versions(tmp_path, "old", "new")
+        out = tmp_path / "out"
+
+        assert generate_diffs.generate_stable_name_diffs("va", "vb", out) == 2
+        manifest = generate_diffs.load_diff_manifest(out)
+        assert set(manifest["by_stable_name"]) == {"ch", "ch.one"}
+
+        # Mark the existing diff, then change an unrelated chapter
+        one_diff = out / "by_stable_name" / "ch.one.diff"
+        one_diff.write_text("sentinel", encoding="utf-8")
+        self._write_versions(tmp_path, "old", "new", extra="touched")
+
+        generate_diffs.generate_stable_name_diffs("va", "vb", out)
+        assert one_diff.read_text(encoding="utf-8") == "sentinel"
+
+        # Changing the section's own content regenerates it
+        self._write_versions(tmp_path, "old", "newer")
+        generate_diffs.generate_stable_name_diffs("va", "vb", out)
+        assert "+newer" in one_diff.read_text(encoding="utf-8")
+
+    def test_stale_diffs_are_removed(self, tmp_path, monkeypatch):
+        """Test that diffs for sections that no longer differ are deleted."""
+        monkeypatch.chdir(tmp_path)
+        self._write_versions(tmp_path, "old", "new")
+        out = tmp_path / "out"
+        generate_diffs.generate_stable_name_diffs("va", "vb", out)
+        (out / "by_stable_name" / "vanished.diff").write_text("old", encoding="utf-8")
+
+        self._write_versions(tmp_path, "same body", "same body")
+        assert generate_diffs.generate_stable_name_diffs("va", "vb", out) == 0
+
+        assert not list((out / "by_stable_name").glob("*.diff"))
+        assert generate_diffs.load_diff_manifest(out)["by_stable_name"] == {}
+
+    def test_manifest_records_diff_stats(self, tmp_path, monkeypatch):
+        """Test that each manifest entry carries the statistics of its diff."""
+        monkeypatch.chdir(tmp_path)
+        self._write_versions(tmp_path, "old", "new")
+        out = tmp_path / "out"
+        generate_diffs.generate_stable_name_diffs("va", "vb", out)
+
+        entry = generate_diffs.load_diff_manifest(out)["by_stable_name"]["ch.one"]
+        text = (out / "by_stable_name" / "ch.one.diff").read_text(encoding="utf-8")
+        assert entry["added"] == 1
+        assert entry["removed"] == 1
+        assert entry["hunks"] == 1
+        assert entry["bytes"] == len(text.encode("utf-8"))
+        assert entry == {**entry, **generate_diffs.diff_stats(text)}
+
+
+class TestRenameDetection:
+    """Test that renamed sections are diffed against their old name."""
+
+    def test_renamed_section_records_moved_from(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        body = "The quick brown fox jumps over the lazy dog near the river bank today."
+        (tmp_path / "va").mkdir()
+        (tmp_path / "vb").mkdir()
+        (tmp_path / "va" / "ch.md").write_text(
+            f'# Chapter <a id="ch">[[ch]]</a>\n\n## Old <a id="ch.old_name">[[ch.old_name]]</a>\n\n{body}\n',
+            encoding="utf-8",
+        )
+        (tmp_path / "vb" / "ch.md").write_text(
+            f'# Chapter <a id="ch">[[ch]]</a>\n\n## New <a id="ch.new">[[ch.new]]</a>\n\n{body}\n',
+            encoding="utf-8",
+        )
+        out = tmp_path / "out"
+        generate_diffs.generate_stable_name_diffs("va", "vb", out)
+
+        entry = generate_diffs.load_diff_manifest(out)["by_stable_name"]["ch.new"]
+        assert entry["moved_from"] == "ch.old_name"
+        diff = (out / "by_stable_name" / "ch.new.diff").read_text(encoding="utf-8")
+        assert "# Moved from: ch.old_name" in diff
+        assert "+" + body not in diff
+        readme = (out / "by_stable_name" / "README.md").read_text(encoding="utf-8")
+        assert "moved from `[ch.old_name]`" in readme
+
+
+class TestPackedStore:
+    """Test the packed (diffs.sqlite) layout and the loose exporter."""
+
+    def test_packed_round_trip(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        TestManifestInvalidation._write_versions(tmp_path, "old", "new")
+        loose_out = tmp_path / "loose"
+        packed_out = tmp_path / "packed"
+
+        generate_diffs.generate_stable_name_diffs("va", "vb", loose_out)
+        with generate_diffs.open_diff_store(packed_out, packed=True) as store:
+            assert generate_diffs.generate_stable_name_diffs("va", "vb", packed_out, store=store)
+            assert store.names("by_stable_name") == ["ch.diff", "ch.one.diff"]
+
+        assert (packed_out / generate_diffs.PACK_FILENAME).exists()
+        assert not list((packed_out / "by_stable_name").glob("*.diff"))
+
+        # Unchanged inputs are skipped when the diff is already in the pack
+        with generate_diffs.open_diff_store(packed_out, packed=True) as store:
+            mtime = store.mtime("by_stable_name", "ch.one.diff")
+            generate_diffs.generate_stable_name_diffs("va", "vb", packed_out, store=store)
+            assert store.mtime("by_stable_name", "ch.one.diff") == mtime
+
+        assert generate_diffs.export_loose(packed_out) == 2
+        for name in ("ch.diff", "ch.one.diff"):
+            assert (packed_out / "by_stable_name" / name).read_text(encoding="utf-8") == (
+                loose_out / "by_stable_name" / name
+            ).read_text(encoding="utf-8")
+
+    def test_remove_loose_keeps_pack_and_readme(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        TestManifestInvalidation._write_versions(tmp_path, "old", "new")
+        out = tmp_path / "out"
+
+        # A pair generated loose, then switched to the pack
+        generate_diffs.generate_stable_name_diffs("va", "vb", out)
+        (out / "by_stable_name" / "README.md").write_text("index\n", encoding="utf-8")
+        with generate_diffs.open_diff_store(out, packed=True) as store:
+            generate_diffs.generate_stable_name_diffs("va", "vb", out, store=store)
+
+        assert generate_diffs.remove_loose(out) == 2
+        assert not list((out / "by_stable_name").glob("*.diff"))
+        assert (out / "by_stable_name" / "README.md").exists()
+        with generate_diffs.open_diff_store(out, packed=True, readonly=True) as store:
+            assert store.names("by_stable_name") == ["ch.diff", "ch.one.diff"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -26,8 +26,10 @@
 """Tests for generate_html_site.py script."""
 
 import json
+import os
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -446,6 +448,755 @@ class TestGenerateSearchIndex:
                     assert "keywords" in entry
                     assert isinstance(entry["keywords"], list)
 
+    def test_generate_search_index_shards(self, tmp_path):
+        """Test that postings are sharded by prefix and weighted by TF-IDF."""
+        diffs = {
+            "array": "+void push_back();\n+void push_back(int);\n+void resize();\n",
+            "vector": "+void resize();\n+void reserve();\n",
+        }
+        stable_names = []
+        for name, text in diffs.items():
+            (tmp_path / f"{name}.diff").write_text(text)
+            stable_names.append({"name": name, "path": tmp_path / f"{name}.diff"})
+        (tmp_path / "tab.alloc.diff").write_text("-allocate\n")
+        tables = [
+            {
+                "label": "tab.alloc",
+                "caption": "Allocator requirements",
+                "path": tmp_path / "tab.alloc.diff",
+            }
+        ]
+
+        generate_html_site.generate_search_index(
+            stable_names, tmp_path, "test-slug", tables=tables, max_workers=1
+        )
+
+        documents = json.loads((tmp_path / "test-slug_search_index.json").read_text())
+        assert [doc["name"] for doc in documents] == ["array", "vector", "tab.alloc"]
+        assert documents[0]["keywords"][0] == "push_back"
+
+        shard = json.loads((tmp_path / "test-slug_search" / "re.json").read_text())
+        assert set(shard) == {"resize", "reserve", "requirements"}
+        # "reserve" is unique to vector, so it outweighs the shared "resize"
+        weights = dict(shard["resize"])
+        assert weights.keys() == {0, 1}
+        assert dict(shard["reserve"])[1] > weights[1]
+        assert dict(shard["requirements"]).keys() == {2}
+
+        # The overview page loads only names and types with the shards
+        slim = json.loads((tmp_path / "test-slug_search" / "documents.json").read_text())
+        assert slim == [
+            {"name": "array", "type": "section"},
+            {"name": "vector", "type": "section"},
+            {"name": "tab.alloc", "type": "table"},
+        ]
+
+    def test_unchanged_search_index_is_skipped(self, tmp_path):
+        """Test that a pair whose diff hashes are unchanged is not re-indexed."""
+        (tmp_path / "array.diff").write_text("+void push_back();\n")
+        stable_names = [{"name": "array", "path": tmp_path / "array.diff", "diff_hash": "a"}]
+
+        def pair_stats():
+            return [{"slug": "test-slug", "search": (stable_names, [], tmp_path)}]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hashes = generate_html_site.generate_search_indexes(pair_stats(), executor)
+            documents = tmp_path / "test-slug_search" / "documents.json"
+            mtime = documents.stat().st_mtime_ns
+            os.utime(documents, ns=(0, 0))
+
+            stats = pair_stats()
+            assert generate_html_site.generate_search_indexes(stats, executor, hashes) == hashes
+            assert documents.stat().st_mtime_ns == 0
+            assert "search" not in stats[0]
+
+            stable_names[0]["diff_hash"] = "b"
+            changed = generate_html_site.generate_search_indexes(pair_stats(), executor, hashes)
+            assert changed["test-slug"] != hashes["test-slug"]
+            assert documents.stat().st_mtime_ns >= mtime
+
+    def test_keywords_ranked_by_frequency(self):
+        """Test that truncation keeps the most frequent identifiers, not the first alphabetically."""
+        text = "".join(f"+aaa_{i:03d}\n" for i in range(200)) + "+zzz_common\n" * 5
+        keywords = generate_html_site.extract_diff_text_keywords(text)
+
+        assert len(keywords) == generate_html_site.SEARCH_KEYWORD_LIMIT
+        assert keywords[0] == "zzz_common"
+
+
+class TestPackedDiffs:
+    """Test that the site reads diffs from a diffs.sqlite pack."""
+
+    def test_collect_from_pack(self, tmp_path):
+        from src.cpp_std_converter.diff_store import open_diff_store
+
+        pair_dir = tmp_path / "n4950_to_trunk"
+        (pair_dir / "by_stable_name").mkdir(parents=True)
+        text = "# Diff for [array]\n# Stable name: array\n\ndiff --git a/from.md b/to.md\n+new\n"
+        with open_diff_store(pair_dir, packed=True) as store:
+            store.write("by_stable_name", "array.diff", text)
+
+        items = generate_html_site.collect_stable_names(pair_dir / "by_stable_name")
+        assert [item["name"] for item in items] == ["array"]
+        assert items[0]["line_count"] == 1
+        assert generate_html_site.load_diff_text(items[0]) == text
+        with generate_html_site.diff_input_file(items[0]) as diff_file:
+            assert diff_file.read_text(encoding="utf-8") == text
+
+    def test_parse_diff_header(self):
+        header = generate_html_site.parse_diff_header(
+            "# Diff for table [tab:x]\n# Table label: tab:x\n# Caption: Caption: here\n\n+a: b\n"
+        )
+        assert header["Table label"] == "tab:x"
+        assert header["Caption"] == "Caption: here"
+
+
+class TestManifestStats:
+    """Test that diff listings come from manifest.json stats when available."""
+
+    def test_collect_uses_manifest_stats(self, tmp_path):
+        from src.cpp_std_converter.diff_store import LooseDiffStore, diff_stats, save_diff_manifest
+
+        pair_dir = tmp_path / "n4950_to_trunk"
+        text = "# Diff for table [tab:x]\n# Table label: tab:x\n\ndiff --git a/f b/t\n+a\n-b\n"
+        LooseDiffStore(pair_dir).write("by_table", "tab_x.diff", text)
+        entry = {"file": "tab_x.diff", "caption": "Caption from manifest", **diff_stats(text)}
+        save_diff_manifest(pair_dir, {"by_table": {"tab:x": entry}})
+
+        items = generate_html_site.collect_tables(pair_dir / "by_table")
+        assert [(item["label"], item["caption"]) for item in items] == [
+            ("tab:x", "Caption from manifest")
+        ]
+        assert items[0]["line_count"] == 2
+        assert items[0]["file"] == "tab_x"
+
+    def test_falls_back_without_stats(self, tmp_path):
+        from src.cpp_std_converter.diff_store import LooseDiffStore, save_diff_manifest
+
+        pair_dir = tmp_path / "n4950_to_trunk"
+        text = "# Diff for [array]\n# Stable name: array\n\ndiff --git a/f b/t\n+new\n"
+        LooseDiffStore(pair_dir).write("by_stable_name", "array.diff", text)
+        save_diff_manifest(pair_dir, {"by_stable_name": {"array": {"file": "array.diff"}}})
+
+        items = generate_html_site.collect_stable_names(pair_dir / "by_stable_name")
+        assert [item["name"] for item in items] == ["array"]
+        assert items[0]["line_count"] == 1
+
+
+class TestDiffPageAssembly:
+    """Test that diff pages are assembled from the page template."""
+
+    @staticmethod
+    def _context(**overrides):
+        context = {
+            "title": "[array] - C++23 → Trunk",
+            "stable_name": "array",
+            "stable_name_file": "array",
+            "from_version": "C++23",
+            "to_version": "Trunk",
+            "from_tag": "n4950",
+            "to_tag": "trunk",
+            "version_slug": "cpp23-to-trunk",
+            "file_size_kb": 120.5,
+            "line_count": 12,
+            "stable_name_availability": {"cpp11-to-cpp14": True},
+            "episode_correlations": [{"episode": 42, "youtube_url": "https://y/42"}],
+        }
+        context.update(overrides)
+        return context
+
+    def test_page_wraps_diff_markup(self):
+        from jinja2 import Environment, FileSystemLoader
+
+        env = Environment(loader=FileSystemLoader("templates"))
+        diff_html = '<div class="d2h-wrapper"><span>a &lt; b</span></div>'
+        page = generate_html_site.assemble_diff_page(
+            diff_html, Path("array.html"), self._context(), env
+        )
+
+        assert '<div id="main-content"><div id="diff">\n' + diff_html in page
+        assert "<title>[array] - C++23 → Trunk</title>" in page
+        assert 'href="../cpp23-to-trunk/array.html" class="active"' in page
+        assert 'href="../cpp11-to-cpp14/array.html"' in page
+        assert '<span class="disabled" data-slug="cpp14-to-cpp17">C++14→C++17</span>' in page
+        assert "badge size-badge large" in page
+        assert "Large diff (120.5 KB)" in page
+        assert ">Ep 42</a>" in page
+        assert "https://timsong-cpp.github.io/cppwp/n4950/array" in page
+        assert "author-banner" in page and "author-footer" in page
+        assert "https://cppstdmd.com/diffs/cpp23-to-trunk/array.html" in page
+
+    def test_page_escapes_context(self):
+        from jinja2 import Environment, FileSystemLoader
+
+        env = Environment(loader=FileSystemLoader("templates"))
+        page = generate_html_site.assemble_diff_page(
+            "", Path("x.html"), self._context(title="<b>&</b>"), env
+        )
+        assert "<title>&lt;b&gt;&amp;&lt;/b&gt;</title>" in page
+
+    def test_extract_diff_fragment(self):
+        page = (
+            "<html><body><h1>Diff to HTML</h1>\n"
+            '<div id="diff">\n<div class="d2h-wrapper"><div>x</div></div>\n</div>\n'
+            "</body></html>"
+        )
+        fragment = generate_html_site.extract_diff_fragment(page)
+        assert fragment.strip() == '<div class="d2h-wrapper"><div>x</div></div>'
+
+    def test_large_diff_is_split_into_parts(self, tmp_path, monkeypatch):
+        diff = tmp_path / "array.diff"
+        diff.write_text(
+            "diff --git a/f b/t\n--- a/f\n+++ b/t\n"
+            + "".join(f"@@ -{n},1 +{n},1 @@\n-old {n}\n+new {n}\n" for n in range(1, 40, 2))
+        )
+        monkeypatch.setattr(generate_html_site, "DIFF_CHUNK_LINES", 10)
+        item = {"name": "array", "file": "array", "path": diff}
+        out_dir = tmp_path / "site" / "diffs" / "cpp23-to-trunk"
+
+        success, _name, _message, steps = generate_html_site.generate_single_diff(
+            (item, str(out_dir), self._context(), "templates")
+        )
+
+        assert success
+        assert set(steps) == {"render", "assemble"}
+        page = (out_dir / "array.html").read_text()
+        parts = sorted((out_dir / "array.chunks").iterdir())
+        # 20 three-line hunks, three per part: the page holds one part, 6 are fragments
+        assert [part.name for part in parts] == [f"{n}.html" for n in range(1, 7)]
+        assert 'id="diff-more"' in page
+        assert "array.chunks/6.html" in page
+        assert "@@ -1,1 +1,1 @@" in page and "@@ -39,1" not in page
+        assert "@@ -39,1 +39,1 @@" in parts[-1].read_text()
+
+    def test_page_uses_published_assets(self):
+        from jinja2 import Environment, FileSystemLoader
+
+        env = Environment(loader=FileSystemLoader("templates"))
+        assets = dict(generate_html_site.DEFAULT_DIFF_PAGE_ASSETS, custom_css="css/custom.abc.css")
+        page = generate_html_site.assemble_diff_page(
+            "<div></div>",
+            Path("site/diffs/cpp23-to-trunk/tables/tab.html"),
+            self._context(page_assets=assets, is_table=True),
+            env,
+        )
+
+        # Table pages sit one level deeper than section pages
+        assert 'href="../../../css/custom.abc.css"' in page
+        assert 'src="../../../js/diff-page.js"' in page
+        assert 'href="../../../index.html"' in page
+        assert 'src="https://cdn.jsdelivr.net/npm/diff2html/' in page
+        assert "addEventListener('DOMContentLoaded'" not in page
+
+
+class TestPageAssets:
+    """Test the content-hashed assets shared by diff pages."""
+
+    def test_publish_keeps_stale_hashes_until_pruned(self, tmp_path):
+        source = tmp_path / "custom.css"
+        source.write_text("a {}")
+        other = tmp_path / "custom-print.css"
+        other.write_text("p {}")
+        site = tmp_path / "site"
+
+        first = generate_html_site.publish_hashed_asset(source, site, "css")
+        source.write_text("b {}")
+        second = generate_html_site.publish_hashed_asset(source, site, "css")
+        kept = generate_html_site.publish_hashed_asset(other, site, "css")
+
+        assert first != second
+        assert second.startswith("css/custom.") and second.endswith(".css")
+        assert generate_html_site.publish_hashed_asset(source, site, "css") == second
+        # Pages from a partial build may still link the first copy
+        assert (site / first).exists()
+
+        assets = {"custom_css": second, "print_css": kept, "cdn": "https://example.com/a.css"}
+        assert generate_html_site.prune_hashed_assets(site, assets) == 1
+        assert sorted(p.name for p in (site / "css").iterdir()) == sorted(
+            [second.split("/")[1], kept.split("/")[1]]
+        )
+
+    def test_publish_diff_page_assets(self, tmp_path, monkeypatch):
+        node_modules = tmp_path / "node_modules"
+        bundle = node_modules / "diff2html" / "bundles" / "js" / "diff2html-ui.min.js"
+        bundle.parent.mkdir(parents=True)
+        bundle.write_text("var Diff2HtmlUI;")
+        theme = node_modules / "highlight.js" / "styles" / "github.min.css"
+        theme.parent.mkdir(parents=True)
+        theme.write_text(".hljs{}")
+        monkeypatch.setattr(generate_html_site, "node_modules_dirs", lambda: (node_modules,))
+
+        site = tmp_path / "site"
+        assets = generate_html_site.publish_diff_page_assets(site, Path("templates"))
+
+        assert assets["diff2html_js"].startswith("js/diff2html-ui.min.")
+        assert (site / assets["diff2html_js"]).read_text() == "var Diff2HtmlUI;"
+        # Published with the site's stylesheets, not under the package's styles/
+        assert assets["highlight_css"].startswith("css/github.min.")
+        assert not (site / "styles").exists()
+        # Not installed locally: stays on the CDN
+        assert assets["diff2html_css"].startswith("https://")
+        assert (site / assets["custom_css"]).read_bytes() == Path(
+            "templates/css/custom.css"
+        ).read_bytes()
+        assert (site / assets["diff_page_js"]).exists()
+
+
+class TestSharedPagePool:
+    """Test the single page-rendering pool shared by all version pairs."""
+
+    def test_page_environment_is_cached(self):
+        """Workers reuse one environment and its compiled templates."""
+        generate_html_site.init_page_worker("templates")
+        env = generate_html_site.page_environment("templates")
+
+        assert generate_html_site.page_environment("templates") is env
+        assert env.get_template("diff_page.html") is env.get_template("diff_page.html")
+
+    def test_largest_diffs_submitted_first(self, monkeypatch):
+        """Pages from all pairs share one queue ordered by diff size."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        submitted = []
+
+        def fake_single_diff(task):
+            submitted.append(task[0]["name"])
+            return (task[0]["name"] != "broken", task[0]["name"], "success")
+
+        monkeypatch.setattr(generate_html_site, "generate_single_diff", fake_single_diff)
+
+        def task(name, size_kb):
+            return ({"name": name, "file": name, "size_kb": size_kb}, "out", {}, "templates")
+
+        pairs = [
+            {
+                "slug": "cpp11-to-cpp14",
+                "from_name": "C++11",
+                "to_name": "C++14",
+                "table_count": 1,
+                "tasks": [task("small", 1.0), task("broken", 3.0)],
+                "table_tasks": [task("tab:x", 2.0)],
+            },
+            {
+                "slug": "cpp14-to-cpp17",
+                "from_name": "C++14",
+                "to_name": "C++17",
+                "tasks": [task("huge", 50.0)],
+            },
+        ]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            generate_html_site.render_diff_pages(pairs, executor)
+
+        assert submitted == ["huge", "broken", "tab:x", "small"]
+        assert pairs[0]["count"] == 1
+        assert pairs[1]["count"] == 1
+        assert "tasks" not in pairs[0] and "table_tasks" not in pairs[0]
+
+    def test_page_timings_recorded(self, monkeypatch):
+        """Worker step timings reach the build timer with the page's diff size."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from cpp_std_converter.build_timings import BuildTimer
+
+        steps = {"render": {"wall": 0.5, "cpu": 0.4}, "assemble": {"wall": 0.1, "cpu": 0.1}}
+        monkeypatch.setattr(
+            generate_html_site,
+            "generate_single_diff",
+            lambda task: (True, task[0]["name"], "success", steps),
+        )
+        pair = {
+            "slug": "cpp23-to-trunk",
+            "from_name": "C++23",
+            "to_name": "Trunk",
+            "tasks": [({"name": "array", "file": "array", "size_kb": 12.5}, "out", {}, "t")],
+        }
+
+        timer = BuildTimer()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            generate_html_site.render_diff_pages([pair], executor, timer=timer)
+
+        assert timer.pages[0]["page"] == "out/array.html"
+        assert timer.pages[0]["size_kb"] == 12.5
+        assert timer.pages[0]["wall"] == 0.6
+
+
+class TestStatisticsTimings:
+    """Test the optional build timings section of statistics.html."""
+
+    def render(self, tmp_path, timer):
+        from jinja2 import Environment, FileSystemLoader
+
+        env = Environment(loader=FileSystemLoader("templates"))
+        generate_html_site.generate_statistics_page(tmp_path, env, {"version_pairs": []}, timer)
+        return (tmp_path / "statistics.html").read_text()
+
+    def test_section_only_with_timer(self, tmp_path):
+        from cpp_std_converter.build_timings import BuildTimer
+
+        assert "Build Timings" not in self.render(tmp_path, None)
+
+        timer = BuildTimer()
+        with timer.stage("search index"):
+            pass
+        step = {"wall": 1.25, "cpu": 1.0}
+        timer.add_page("diffs/cpp23-to-trunk/array.html", 42.0, {"render": step})
+        page = self.render(tmp_path, timer)
+
+        assert "Build Timings" in page
+        assert "<td>search index</td>" in page
+        assert 'href="diffs/cpp23-to-trunk/array.html"' in page
+        assert "1.250 s" in page
+
+
+class TestPreviewServer:
+    """Test the on-demand renderer behind --serve."""
+
+    def make_site(self, tmp_path, monkeypatch):
+        templates = Path("templates").resolve()
+        monkeypatch.chdir(tmp_path)
+        section_dir = tmp_path / "diffs" / "n4950_to_trunk" / "by_stable_name"
+        section_dir.mkdir(parents=True)
+        (section_dir / "array.diff").write_text(
+            "Stable name: array\ndiff --git a/f b/t\n--- a/f\n+++ b/t\n"
+            "@@ -1,1 +1,1 @@\n-old array\n+new array\n"
+        )
+        static = tmp_path / "site" / "versions"
+        static.mkdir(parents=True)
+        (static / "cpp23-to-trunk_search_index.json").write_text("{}")
+        return generate_html_site.PreviewSite(tmp_path / "site", templates), section_dir
+
+    def test_pages_rendered_and_cached(self, tmp_path, monkeypatch):
+        site, section_dir = self.make_site(tmp_path, monkeypatch)
+
+        page = site.get("diffs/cpp23-to-trunk/array.html")
+        assert b"<title>[array] - C++23 \xe2\x86\x92 Trunk</title>" in page
+        assert site.get("diffs/cpp23-to-trunk/array.html") == page
+        assert (site.renders, site.hits) == (1, 1)
+        assert b"array.html" in site.get("versions/cpp23-to-trunk.html")
+
+        # Rewriting the diff invalidates the cached page
+        diff = section_dir / "array.diff"
+        diff.write_text(diff.read_text().replace("new array", "newer array"))
+        os.utime(diff, ns=(0, diff.stat().st_mtime_ns + 10**9))
+        assert site.get("diffs/cpp23-to-trunk/array.html") != page
+        assert site.renders == 3
+        assert not (tmp_path / "site" / "diffs").exists()
+
+    def test_unknown_paths_and_static_files(self, tmp_path, monkeypatch):
+        site, _ = self.make_site(tmp_path, monkeypatch)
+
+        assert site.get("diffs/cpp23-to-trunk/missing.html") is None
+        assert site.get("diffs/no-such-pair/array.html") is None
+        assert site.get("diffs/cpp23-to-trunk/array.chunks/3.html") is None
+        assert site.static_file("css/custom.css") == site.templates_dir / "css" / "custom.css"
+        assert site.static_file("versions/cpp23-to-trunk_search_index.json") is not None
+        # Page templates themselves are never served
+        assert site.static_file("diff_page.html") is None
+
+    def test_http_handler(self, tmp_path, monkeypatch):
+        import threading
+        import urllib.error
+        import urllib.request
+        from http.server import ThreadingHTTPServer
+
+        site, _ = self.make_site(tmp_path, monkeypatch)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), generate_html_site.PreviewRequestHandler)
+        server.site = site
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with urllib.request.urlopen(f"{base}/availability.json") as response:
+                assert json.loads(response.read())["sections"] == {"array": 16}
+                assert response.headers["Cache-Control"] == "no-store"
+            with urllib.request.urlopen(f"{base}/diffs/cpp23-to-trunk/array.html") as response:
+                assert response.headers["Content-Type"] == "text/html; charset=utf-8"
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f"{base}/diffs/cpp23-to-trunk/nope.html")
+            assert error.value.code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestEvolutionBundles:
+    """Test the per-stable-name bundles behind evolution.html."""
+
+    PAIRS = [
+        ("v1", "v2", "C++11", "C++14", "cpp11-to-cpp14"),
+        ("v2", "v3", "C++14", "C++17", "cpp14-to-cpp17"),
+    ]
+
+    def make_tree(self, tmp_path):
+        section = '# Life <a id="basic.life">[[basic.life]]</a>\n\n{}\n'
+        for tag, body in [("v1", "Old text."), ("v2", "New text."), ("v3", "New text.")]:
+            (tmp_path / tag).mkdir()
+            (tmp_path / tag / "basic.md").write_text(section.format(body))
+        diff_dir = tmp_path / "diffs" / "v1_to_v2" / "by_stable_name"
+        diff_dir.mkdir(parents=True)
+        (diff_dir / "basic.life.diff").write_text("-Old text.\n+New text.\n")
+
+    def test_bundle_dedups_texts(self, tmp_path):
+        self.make_tree(tmp_path)
+        sections = [{"name": "basic.life", "file": "basic.life"}] * 2
+        site = tmp_path / "site"
+
+        written = generate_html_site.generate_evolution_bundles(
+            site, sections, self.PAIRS, tmp_path / "diffs", tmp_path
+        )
+
+        assert written == 1
+        bundle = json.loads((site / "evolution" / "basic.life.json").read_text())
+        assert bundle["name"] == "basic.life"
+        assert [v["name"] for v in bundle["versions"]] == ["C++11", "C++14", "C++17"]
+        # C++14 and C++17 share one copy of the unchanged text
+        hashes = [v["text"] for v in bundle["versions"]]
+        assert hashes[1] == hashes[2] != hashes[0]
+        assert len(bundle["texts"]) == 2
+        assert "New text." in bundle["texts"][hashes[1]]
+        assert bundle["diffs"] == [
+            {
+                "slug": "cpp11-to-cpp14",
+                "from": "C++11",
+                "to": "C++14",
+                "diff": "-Old text.\n+New text.\n",
+            }
+        ]
+
+    def test_unchanged_bundles_kept_and_stale_pruned(self, tmp_path):
+        self.make_tree(tmp_path)
+        site = tmp_path / "site"
+        (site / "evolution").mkdir(parents=True)
+        (site / "evolution" / "gone.json").write_text("{}")
+        sections = [{"name": "basic.life", "file": "basic.life"}]
+
+        args = (site, sections, self.PAIRS, tmp_path / "diffs", tmp_path)
+        assert generate_html_site.generate_evolution_bundles(*args) == 1
+        assert (site / "evolution" / "gone.json").exists()
+        assert generate_html_site.generate_evolution_bundles(*args, prune=True) == 0
+        assert [p.name for p in (site / "evolution").iterdir()] == ["basic.life.json"]
+
+    def test_missing_section_is_null(self, tmp_path):
+        self.make_tree(tmp_path)
+        bundle = generate_html_site.build_evolution_bundle(
+            "basic.death", "basic.death", self.PAIRS, {}, tmp_path
+        )
+        assert [v["text"] for v in bundle["versions"]] == [None, None, None]
+        assert bundle["texts"] == {} and bundle["diffs"] == []
+
+
+class TestAvailabilityIndex:
+    """Test the availability matrix built from one scan of the diff directories."""
+
+    PAIRS = [
+        ("n3337", "n4140", "C++11", "C++14", "cpp11-to-cpp14"),
+        ("n4140", "n4659", "C++14", "C++17", "cpp14-to-cpp17"),
+        ("n4659", "n4861", "C++17", "C++20", "cpp17-to-cpp20"),
+    ]
+
+    def make_diffs(self, base):
+        for pair_dir, kind, name in [
+            ("n3337_to_n4140", "by_stable_name", "alg.copy"),
+            ("n4659_to_n4861", "by_stable_name", "alg.copy"),
+            ("n4659_to_n4861", "by_stable_name", "concepts"),
+            ("n4140_to_n4659", "by_table", "tab.support"),
+        ]:
+            (base / pair_dir / kind).mkdir(parents=True, exist_ok=True)
+            (base / pair_dir / kind / f"{name}.diff").write_text("diff\n")
+
+    def test_masks_and_availability(self, tmp_path):
+        self.make_diffs(tmp_path)
+
+        index = generate_html_site.availability_index(str(tmp_path), tuple(self.PAIRS))
+        assert index["by_stable_name"] == {"alg.copy": 0b101, "concepts": 0b100}
+        assert index["by_table"] == {"tab.support": 0b010}
+
+        availability = generate_html_site.build_stable_name_availability(
+            "alg.copy", self.PAIRS, tmp_path
+        )
+        assert availability == {
+            "cpp11-to-cpp14": True,
+            "cpp14-to-cpp17": False,
+            "cpp17-to-cpp20": True,
+        }
+        assert not any(
+            generate_html_site.build_table_availability("missing", self.PAIRS, tmp_path).values()
+        )
+
+    def test_write_availability_json(self, tmp_path):
+        diffs = tmp_path / "diffs"
+        self.make_diffs(diffs)
+
+        written = generate_html_site.write_availability_json(tmp_path, self.PAIRS, diffs)
+
+        data = json.loads(written.read_text())
+        assert written.name == generate_html_site.AVAILABILITY_FILENAME
+        assert data["pairs"] == [pair[4] for pair in self.PAIRS]
+        assert data["sections"]["alg.copy"] == 0b101
+        assert data["tables"] == {"tab.support": 0b010}
+
+
+class TestBuildManifest:
+    """Test incremental diff page rendering driven by the build manifest."""
+
+    def make_pair(self, site, names, sha="0123456789abcdef"):
+        from src.cpp_std_converter.diff_store import LooseDiffStore
+
+        pair_dir = site.parent / "diffs" / "n4950_to_trunk"
+        tasks = []
+        for name in names:
+            text = f"# Diff for [{name}]\n# Stable name: {name}\n\ndiff --git a/f b/t\n+{name}\n"
+            LooseDiffStore(pair_dir).write("by_stable_name", f"{name}.diff", text)
+        for item in generate_html_site.collect_stable_names(pair_dir / "by_stable_name"):
+            context = {
+                "stable_name": item["name"],
+                "generated_date": "2024-01-01",
+                "cppstdmd_sha": sha,
+                "cppstdmd_short_sha": sha[:7],
+            }
+            context["input_hash"] = generate_html_site.page_input_hash(item, context, "templates")
+            tasks.append((item, str(site / "diffs" / "cpp23-to-trunk"), context, "templates"))
+        return {"slug": "cpp23-to-trunk", "from_name": "C++23", "to_name": "Trunk", "tasks": tasks}
+
+    def render(self, site, pair, previous, monkeypatch):
+        from concurrent.futures import ThreadPoolExecutor
+
+        rendered = []
+
+        def fake_single_diff(task):
+            item, out_dir, _context, _templates = task
+            Path(out_dir).mkdir(parents=True, exist_ok=True)
+            (Path(out_dir) / f"{item['file']}.html").write_text("page")
+            rendered.append(item["name"])
+            return (True, item["name"], "success")
+
+        monkeypatch.setattr(generate_html_site, "generate_single_diff", fake_single_diff)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pages = generate_html_site.render_diff_pages([pair], executor, previous, site)
+        return pages, rendered
+
+    def test_unchanged_pages_are_skipped(self, tmp_path, monkeypatch):
+        site = tmp_path / "site"
+        pages, rendered = self.render(
+            site, self.make_pair(site, ["array", "vector"]), {}, monkeypatch
+        )
+        assert sorted(rendered) == ["array", "vector"]
+        generate_html_site.save_build_manifest(site, pages)
+
+        previous = generate_html_site.load_build_manifest(site)
+        assert previous == pages
+        pair = self.make_pair(site, ["array", "vector"])
+        pages, rendered = self.render(site, pair, previous, monkeypatch)
+        assert rendered == []
+        assert pair["count"] == 2
+
+        # Changing a diff or the rendering context re-renders just that page
+        pair = self.make_pair(site, ["array", "vector"])
+        item, _out_dir, context, _templates = pair["tasks"][1]
+        context["episode_correlations"] = [{"episode": 1}]
+        context["input_hash"] = generate_html_site.page_input_hash(item, context, "templates")
+        pages, rendered = self.render(site, pair, previous, monkeypatch)
+        assert rendered == ["vector"]
+
+    def test_new_repository_commit_skips_every_page(self, tmp_path, monkeypatch):
+        site = tmp_path / "site"
+        previous, _ = self.render(site, self.make_pair(site, ["array", "vector"]), {}, monkeypatch)
+        dates = generate_html_site.page_change_dates(previous, {}, {}, "2024-01-01")
+
+        # Same diffs after an unrelated commit (e.g. a README edit)
+        pair = self.make_pair(site, ["array", "vector"], sha="fedcba9876543210")
+        pages, rendered = self.render(site, pair, previous, monkeypatch)
+
+        assert rendered == []
+        assert pages == previous
+        assert generate_html_site.page_change_dates(pages, previous, dates, "2024-02-01") == dates
+
+    def test_input_hash_ignores_generated_date(self):
+        item = {"diff_hash": "abc"}
+        hash_a = generate_html_site.page_input_hash(item, {"generated_date": "a"}, "templates")
+        hash_b = generate_html_site.page_input_hash(item, {"generated_date": "b"}, "templates")
+        assert hash_a == hash_b
+        assert hash_a != generate_html_site.page_input_hash(
+            {"diff_hash": "def"}, {"generated_date": "a"}, "templates"
+        )
+
+    def test_prune_stale_pages(self, tmp_path, monkeypatch):
+        site = tmp_path / "site"
+        previous, _ = self.render(site, self.make_pair(site, ["array", "vector"]), {}, monkeypatch)
+        (site / "diffs" / "old-pair").mkdir()
+        (site / "diffs" / "old-pair" / "array.html").write_text("page")
+        previous["diffs/old-pair/array.html"] = "hash"
+
+        current = {
+            page: h for page, h in previous.items() if "vector" not in page and "old" not in page
+        }
+        removed = generate_html_site.prune_stale_pages(site, previous, current)
+
+        assert removed == 2
+        assert (site / "diffs" / "cpp23-to-trunk" / "array.html").exists()
+        assert not (site / "diffs" / "cpp23-to-trunk" / "vector.html").exists()
+        assert not (site / "diffs" / "old-pair").exists()
+
+
+class TestSitemap:
+    """Test the streaming sitemap writer."""
+
+    def test_single_file_is_sitemap_xml(self, tmp_path):
+        with generate_html_site.SitemapWriter(tmp_path, "https://example.com") as sitemap:
+            sitemap.add("", "1.0", "weekly")
+            sitemap.add("diffs/a&b.html", "0.6", "monthly", "2024-05-01")
+
+        content = (tmp_path / "sitemap.xml").read_text()
+        assert content.startswith('<?xml version="1.0" encoding="UTF-8"?>\n<urlset')
+        assert "<loc>https://example.com/diffs/a&amp;b.html</loc>" in content
+        assert "<lastmod>2024-05-01</lastmod>" in content
+        assert content.count("<lastmod>") == 1
+        assert not list(tmp_path.glob("sitemap-*.xml"))
+
+    def test_splits_into_index(self, tmp_path):
+        (tmp_path / "sitemap-9.xml").write_text("stale")
+
+        with generate_html_site.SitemapWriter(tmp_path, "https://x.org", max_urls=2) as sitemap:
+            for n in range(5):
+                sitemap.add(f"p{n}.html", "0.6", "monthly", f"2024-01-0{n + 1}")
+
+        assert sitemap.url_count == 5
+        assert sorted(p.name for p in tmp_path.glob("sitemap-*.xml")) == [
+            "sitemap-1.xml",
+            "sitemap-2.xml",
+            "sitemap-3.xml",
+        ]
+        index = (tmp_path / "sitemap.xml").read_text()
+        assert "<sitemapindex" in index
+        assert "<loc>https://x.org/sitemap-3.xml</loc>" in index
+        assert "<lastmod>2024-01-04</lastmod>" in index
+        assert (tmp_path / "sitemap-3.xml").read_text().count("<url>") == 1
+
+    def test_diff_pages_come_from_build_manifest(self, tmp_path):
+        pages = {"diffs/cpp11-to-cpp14/array.html": "h1", "diffs/cpp11-to-cpp14/bad.html": ""}
+        changed = generate_html_site.page_change_dates(
+            pages, {"diffs/cpp11-to-cpp14/array.html": "h1"}, {}, "2024-02-02"
+        )
+        generate_html_site.save_build_manifest(tmp_path, pages, changed)
+
+        generate_html_site.generate_seo_files(tmp_path, {}, base_url="https://x.org")
+
+        content = (tmp_path / "sitemap.xml").read_text()
+        assert "https://x.org/diffs/cpp11-to-cpp14/array.html</loc>\n" in content
+        assert "<lastmod>2024-02-02</lastmod>" in content
+        assert "bad.html" not in content
+        assert "Sitemap: https://x.org/sitemap.xml" in (tmp_path / "robots.txt").read_text()
+
+    def test_change_dates_survive_unchanged_pages(self):
+        dates = generate_html_site.page_change_dates(
+            {"a.html": "same", "b.html": "new"},
+            {"a.html": "same", "b.html": "old"},
+            {"a.html": "2023-01-01", "b.html": "2023-01-01"},
+            "2024-06-30",
+        )
+        assert dates == {"a.html": "2023-01-01", "b.html": "2024-06-30"}
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,156 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Tests for markdown_scanner module
+
+Tests the single-pass chapter scanner shared by the diff, site and adventure generators.
+"""
+
+from cpp_std_converter.markdown_scanner import (
+    clear_scan_cache,
+    scan_markdown,
+    scan_markdown_file,
+    scan_version_dir,
+)
+
+CHAPTER = """\
+# Algorithms <a id="alg">[[alg]]</a>
+
+See [[alg.copy]] and [[iterators]].
+
+## Copy <a id="alg.copy">[[alg.copy]]</a>
+
+Copies `<initializer_list>` ranges.
+
+**Table: Copy requirements** <a id="tab:copy">[tab:copy]</a>
+
+| Expression | Effect |
+| --- | --- |
+| `copy(a)` | copies |
+
+``` bnf
+copy-expression:
+    'copy' expression
+```
+
+## Find <a id="alg.find">[[alg.find]]</a>
+
+Uses [[alg.copy]].
+"""
+
+
+class TestScanMarkdown:
+    """Test the structural model produced by scan_markdown()."""
+
+    def test_headings(self):
+        scan = scan_markdown(CHAPTER)
+        assert [(h.level, h.stable_name, h.line) for h in scan.headings] == [
+            (1, "alg", 1),
+            (2, "alg.copy", 5),
+            (2, "alg.find", 20),
+        ]
+        assert scan.headings[1].title == "Copy"
+
+    def test_section_spans_nest(self):
+        scan = scan_markdown(CHAPTER)
+        assert scan.sections["alg"].end_line == 22
+        assert scan.sections["alg.copy"].end_line == 19
+        assert "Copies" in scan.section_text("alg.copy")
+        assert "Uses" not in scan.section_text("alg.copy")
+
+    def test_tables(self):
+        scan = scan_markdown(CHAPTER)
+        table = scan.tables["tab:copy"]
+        assert table.caption == "Copy requirements"
+        assert scan.table_text("tab:copy").rstrip().endswith("| `copy(a)` | copies |")
+
+    def test_bnf_blocks(self):
+        scan = scan_markdown(CHAPTER)
+        assert [b.content for b in scan.bnf_blocks] == ["copy-expression:\n    'copy' expression"]
+
+    def test_anchors_and_wikilinks(self):
+        scan = scan_markdown(CHAPTER)
+        assert {"alg", "alg.copy", "alg.find", "tab:copy"} <= scan.anchors
+        # Only links in the body count, not the heading's own [[stable.name]]
+        assert sorted(scan.heading_wikilinks(0)) == ["alg.copy", "iterators"]
+        assert scan.heading_wikilinks(2) == ["alg.copy"]
+
+    def test_annex_heading(self):
+        content = (
+            '# Compatibility <a id="diff" data-annex="true" '
+            'data-annex-type="informative">[[diff]]</a>\n'
+        )
+        heading = scan_markdown(content).headings[0]
+        assert heading.is_annex
+        assert heading.annex_type == "informative"
+
+
+class TestScanMarkdownFile:
+    """Test file scanning and the content-hash cache."""
+
+    def test_missing_file(self, tmp_path):
+        assert scan_markdown_file(tmp_path / "missing.md") is None
+
+    def test_identical_content_shares_scan(self, tmp_path):
+        clear_scan_cache()
+        (tmp_path / "a.md").write_text(CHAPTER, encoding="utf-8")
+        (tmp_path / "b.md").write_text(CHAPTER, encoding="utf-8")
+        assert scan_markdown_file(tmp_path / "a.md") is scan_markdown_file(tmp_path / "b.md")
+
+    def test_rescan_after_change(self, tmp_path):
+        clear_scan_cache()
+        md_file = tmp_path / "a.md"
+        md_file.write_text(CHAPTER, encoding="utf-8")
+        first = scan_markdown_file(md_file)
+        md_file.write_text(CHAPTER + '\n## Sort <a id="alg.sort">[[alg.sort]]</a>\n')
+        second = scan_markdown_file(md_file)
+        assert second is not first
+        assert "alg.sort" in second.sections
+
+
+class TestScanVersionDir:
+    """Test the per-version anchor set and section index."""
+
+    def test_index_covers_all_chapters(self, tmp_path):
+        clear_scan_cache()
+        version = tmp_path / "n4950"
+        version.mkdir()
+        (version / "algorithms.md").write_text(CHAPTER, encoding="utf-8")
+        (version / "iterators.md").write_text('# Iterators <a id="iterators">[[iterators]]</a>\n')
+
+        index = scan_version_dir(version)
+
+        assert index.name == "n4950"
+        assert {"alg.copy", "tab:copy", "iterators"} <= index.anchors
+        assert index.sections["iterators"][0] == version / "iterators.md"
+        assert index.section_text("alg.find") == (
+            '## Find <a id="alg.find">[[alg.find]]</a>\n\nUses [[alg.copy]].\n'
+        )
+        assert index.section_text("alg.sort") is None
+        assert scan_version_dir(version) is index
+
+    def test_missing_dir(self, tmp_path):
+        assert scan_version_dir(tmp_path / "n3337") is None
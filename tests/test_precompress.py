@@ -0,0 +1,125 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""Tests for precompressed site assets."""
+
+import gzip
+import os
+
+from cpp_std_converter import precompress
+from cpp_std_converter.precompress import MANIFEST_FILENAME, invalidate_stale, precompress_tree
+
+
+def write_asset(path, size=4096, fill="a"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"<p>{fill * size}</p>\n", encoding="utf-8")
+    return path
+
+
+class TestPrecompressTree:
+    def test_writes_gzip_siblings_for_text_assets(self, tmp_path):
+        page = write_asset(tmp_path / "diffs" / "array.html")
+        write_asset(tmp_path / "fonts" / "font.woff2")
+        write_asset(tmp_path / "tiny.json", size=10)
+
+        result = precompress_tree(tmp_path, ("gz",), max_workers=1)
+
+        assert result == {"compressed": 1, "unchanged": 0, "removed": 0}
+        assert gzip.decompress((tmp_path / "diffs" / "array.html.gz").read_bytes()) == (
+            page.read_bytes()
+        )
+        assert not (tmp_path / "fonts" / "font.woff2.gz").exists()
+        assert not (tmp_path / "tiny.json.gz").exists()
+        assert (tmp_path / MANIFEST_FILENAME).exists()
+
+    def test_only_changed_files_are_recompressed(self, tmp_path):
+        write_asset(tmp_path / "a.html")
+        changed = write_asset(tmp_path / "b.html")
+        rewritten = write_asset(tmp_path / "c.html")
+        precompress_tree(tmp_path, ("gz",), max_workers=1)
+
+        write_asset(changed, fill="b")
+        # Same bytes with a new mtime (e.g. a re-rendered page) count as unchanged
+        write_asset(rewritten)
+        stat = rewritten.stat()
+        os.utime(rewritten, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        result = precompress_tree(tmp_path, ("gz",), max_workers=1)
+
+        assert result == {"compressed": 1, "unchanged": 2, "removed": 0}
+        assert gzip.decompress((tmp_path / "b.html.gz").read_bytes()) == changed.read_bytes()
+
+    def test_removes_siblings_of_deleted_files(self, tmp_path):
+        page = write_asset(tmp_path / "old.html")
+        precompress_tree(tmp_path, ("gz",), max_workers=1)
+
+        page.unlink()
+        result = precompress_tree(tmp_path, ("gz",), max_workers=1)
+
+        assert result["removed"] == 1
+        assert not (tmp_path / "old.html.gz").exists()
+
+    def test_removes_siblings_in_formats_no_longer_written(self, tmp_path):
+        write_asset(tmp_path / "page.html")
+        # Left by an earlier run that had brotli installed
+        stale = tmp_path / "page.html.br"
+        stale.write_bytes(b"old")
+
+        precompress_tree(tmp_path, ("gz",), max_workers=1)
+
+        assert not stale.exists()
+        assert (tmp_path / "page.html.gz").exists()
+
+    def test_invalidate_stale_drops_siblings_of_changed_files(self, tmp_path):
+        kept = write_asset(tmp_path / "a.html")
+        changed = write_asset(tmp_path / "b.html")
+        removed = write_asset(tmp_path / "c.html")
+        precompress_tree(tmp_path, ("gz",), max_workers=1)
+
+        write_asset(changed, fill="b")
+        removed.unlink()
+
+        assert invalidate_stale(tmp_path) == 2
+        assert (tmp_path / "a.html.gz").exists()
+        assert not (tmp_path / "b.html.gz").exists()
+        assert not (tmp_path / "c.html.gz").exists()
+
+        # The next precompressing build rewrites only what was invalidated
+        result = precompress_tree(tmp_path, ("gz",), max_workers=1)
+        assert result == {"compressed": 1, "unchanged": 1, "removed": 0}
+        assert gzip.decompress((tmp_path / "b.html.gz").read_bytes()) == changed.read_bytes()
+        assert kept.exists()
+
+    def test_incompressible_files_get_no_sibling(self, tmp_path):
+        noise = tmp_path / "noise.json"
+        noise.write_bytes(os.urandom(4096))
+
+        precompress_tree(tmp_path, ("gz",), max_workers=1)
+
+        assert not (tmp_path / "noise.json.gz").exists()
+
+    def test_brotli_is_optional(self):
+        assert precompress.available_formats()[0] == "gz"
+        assert ("br" in precompress.available_formats()) == (precompress.brotli is not None)
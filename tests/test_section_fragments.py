@@ -0,0 +1,122 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""Tests for section_fragments module"""
+
+import pytest
+
+from cpp_std_converter import section_fragments
+from cpp_std_converter.markdown_scanner import clear_scan_cache, scan_version_dir
+from cpp_std_converter.section_fragments import render_markdown, write_section_fragments
+
+CHAPTER = """\
+# Algorithms <a id="alg">[[alg]]</a>
+
+Intro.
+
+## Copy <a id="alg.copy">[[alg.copy]]</a>
+
+Copies {text}.
+
+## Find <a id="alg.find">[[alg.find]]</a>
+
+Uses [[alg.copy]].
+"""
+
+
+def make_versions(tmp_path, texts):
+    clear_scan_cache()
+    indexes = []
+    for name, text in texts.items():
+        version = tmp_path / name
+        version.mkdir()
+        (version / "algorithms.md").write_text(CHAPTER.format(text=text), encoding="utf-8")
+        indexes.append(scan_version_dir(version))
+    return indexes
+
+
+class TestRenderMarkdown:
+    """Test prerendering section markdown."""
+
+    def test_wikilinks(self):
+        pytest.importorskip("markdown_it")
+        html = render_markdown("See [[alg.copy]] and `x < y`.")
+        assert '<a href="#" class="wikilink" data-target="alg.copy">[alg.copy]</a>' in html
+        assert "<code>x &lt; y</code>" in html
+
+    def test_tables(self):
+        pytest.importorskip("markdown_it")
+        html = render_markdown("| a | b |\n|---|---|\n| 1 | 2 |\n")
+        assert "<table>" in html
+
+
+class TestWriteSectionFragments:
+    """Test per-era fragment files."""
+
+    def test_dedup_across_eras(self, tmp_path):
+        indexes = make_versions(tmp_path, {"n4861": "ranges", "n4950": "ranges", "trunk": "more"})
+        out = tmp_path / "sections"
+
+        fragments = write_section_fragments(["alg.copy", "alg.find"], indexes, out, max_workers=1)
+
+        copy = fragments["alg.copy"]
+        assert copy["n4861"] == copy["n4950"] != copy["trunk"]
+        assert len(set(fragments["alg.find"].values())) == 1
+        assert len(list(out.iterdir())) == 3
+
+    def test_parent_includes_children(self, tmp_path):
+        indexes = make_versions(tmp_path, {"n4950": "ranges"})
+        out = tmp_path / "sections"
+
+        fragments = write_section_fragments(["alg"], indexes, out, max_workers=1)
+
+        [fragment] = out.glob(f"{fragments['alg']['n4950']}.*")
+        content = fragment.read_text(encoding="utf-8")
+        assert "Intro." in content and "Copies ranges." in content and "alg.find" in content
+
+    def test_markdown_fallback(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(section_fragments, "MarkdownIt", None)
+        indexes = make_versions(tmp_path, {"n4950": "ranges"})
+        out = tmp_path / "sections"
+
+        fragments = write_section_fragments(["alg.find"], indexes, out)
+
+        fragment = out / f"{fragments['alg.find']['n4950']}.md"
+        assert fragment.read_text(encoding="utf-8") == (
+            '## Find <a id="alg.find">[[alg.find]]</a>\n\nUses [[alg.copy]].'
+        )
+
+    def test_prunes_stale_and_skips_missing(self, tmp_path):
+        indexes = make_versions(tmp_path, {"n4950": "ranges"})
+        out = tmp_path / "sections"
+        out.mkdir()
+        (out / "000000000000.html").write_text("old")
+        (out / "notes.txt").write_text("keep")
+
+        fragments = write_section_fragments(["alg.copy", "alg.sort"], indexes, out, max_workers=1)
+
+        assert "alg.sort" not in fragments
+        assert not (out / "000000000000.html").exists()
+        assert (out / "notes.txt").exists()
@@ -0,0 +1,89 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""
+Tests for similarity module
+
+Tests MinHash/LSH based rename and move detection between versions.
+"""
+
+from cpp_std_converter.similarity import MinHashLSH, find_renames, jaccard, shingle_hashes
+
+ARRAY_TEXT = (
+    "The header defines a class template for storing fixed-size sequences of objects. "
+    "An array is a contiguous container and supports random access iterators."
+)
+VECTOR_TEXT = (
+    "A vector is a sequence container that supports amortized constant time insert and "
+    "erase operations at the end, with storage handled automatically."
+)
+
+
+class TestShingles:
+    def test_identical_text(self):
+        assert jaccard(shingle_hashes(ARRAY_TEXT), shingle_hashes(ARRAY_TEXT)) == 1.0
+
+    def test_case_and_punctuation_ignored(self):
+        assert shingle_hashes(ARRAY_TEXT) == shingle_hashes(ARRAY_TEXT.upper().replace(".", ""))
+
+    def test_empty_text(self):
+        assert shingle_hashes("") == frozenset()
+        assert jaccard(frozenset(), frozenset()) == 0.0
+
+
+class TestMinHashLSH:
+    def test_identical_sets_collide(self):
+        index = MinHashLSH()
+        index.insert("array", shingle_hashes(ARRAY_TEXT))
+        index.insert("vector", shingle_hashes(VECTOR_TEXT))
+        assert index.query(shingle_hashes(ARRAY_TEXT)) == {"array"}
+
+    def test_signature_is_deterministic(self):
+        shingles = shingle_hashes(VECTOR_TEXT)
+        assert MinHashLSH().signature(shingles) == MinHashLSH().signature(shingles)
+
+
+class TestFindRenames:
+    def test_pairs_renamed_sections(self):
+        matches = find_renames(
+            {"array.overview": ARRAY_TEXT, "vector.old": VECTOR_TEXT},
+            {"vector.overview": VECTOR_TEXT + " Extra sentence.", "array.general": ARRAY_TEXT},
+        )
+        assert [(m.old_name, m.new_name) for m in matches] == [
+            ("array.overview", "array.general"),
+            ("vector.old", "vector.overview"),
+        ]
+        assert matches[0].similarity == 1.0
+
+    def test_unrelated_sections_not_paired(self):
+        assert find_renames({"array": ARRAY_TEXT}, {"vector": VECTOR_TEXT}) == []
+
+    def test_each_name_used_once(self):
+        matches = find_renames(
+            {"array.overview": ARRAY_TEXT},
+            {"zzz": ARRAY_TEXT, "array.general": ARRAY_TEXT},
+        )
+        # Ties go to the more similar stable name
+        assert [m.new_name for m in matches] == ["array.general"]
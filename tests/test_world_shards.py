@@ -0,0 +1,209 @@
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# For more information, please refer to <https://unlicense.org>
+
+"""Tests for world_shards module"""
+
+import json
+
+from cpp_std_converter.world_shards import (
+    encode_compact,
+    navigation_index,
+    shard_world_map,
+    write_world_shards,
+)
+
+
+def section(name, chapter, connections=None, available=("n4950",)):
+    return {
+        "stableName": name,
+        "displayName": name.title(),
+        "title": name,
+        "realm": name.split(".")[0],
+        "chapter": chapter,
+        "parent": name.rsplit(".", 1)[0] if "." in name else None,
+        "children": [],
+        "connections": connections or {},
+        "availableIn": list(available),
+        "npcs": [],
+    }
+
+
+def make_world():
+    sections = {
+        "basic": section("basic", "basic", {"east": "expr"}),
+        "basic.life": section("basic.life", "basic"),
+        "expr": section("expr", "expr", {"west": "basic"}),
+        "expr.old": section("expr.old", "expr", available=("n3337",)),
+        "over": section("over", "expr"),
+    }
+    # A chapter's hierarchy can span realms
+    sections["over"]["parent"] = "expr"
+    sections["expr"]["children"] = ["over"]
+    realms = {
+        "basic": {"name": "The Foundations", "sections": ["basic", "basic.life"]},
+        "expr": {"name": "Expression Fields", "sections": ["expr", "expr.old"]},
+        "over": {"name": "Overload Observatory", "sections": ["over"]},
+    }
+    world_map = {
+        "version": "1.0.0",
+        "eras": {"n4950": "C++23"},
+        "stableNameAliases": {},
+        "realms": realms,
+        "sections": sections,
+    }
+    return world_map, {"basic.life": ["expr.old"], "expr.old": ["basic.life"]}
+
+
+class TestShardWorldMap:
+    """Test splitting the world map."""
+
+    def test_manifest(self):
+        world_map, aliases = make_world()
+        manifest, _, _ = shard_world_map(world_map, aliases)
+
+        assert set(manifest) == {"version", "eras", "realms"}
+        assert manifest["realms"]["basic"] == {
+            "name": "The Foundations",
+            "entry": "basic",
+            "sectionCount": 2,
+        }
+
+    def test_shards_carry_aliases_and_neighbors(self):
+        world_map, aliases = make_world()
+        _, shards, _ = shard_world_map(world_map, aliases)
+
+        basic = shards["basic"]
+        assert list(basic["sections"]) == ["basic", "basic.life"]
+        assert basic["aliases"] == {"basic.life": ["expr.old"]}
+        assert set(basic["neighbors"]) == {"expr", "expr.old"}
+        assert basic["neighbors"]["expr.old"] == {
+            "stableName": "expr.old",
+            "displayName": "Expr.Old",
+            "title": "expr.old",
+            "realm": "expr",
+            "chapter": "expr",
+            "parent": "expr",
+            "availableIn": ["n3337"],
+        }
+
+    def test_cross_realm_hierarchy(self):
+        world_map, aliases = make_world()
+        _, shards, _ = shard_world_map(world_map, aliases)
+
+        assert "over" in shards["expr"]["neighbors"]
+        assert set(shards["over"]["neighbors"]) == {"expr"}
+
+    def test_directory(self):
+        world_map, aliases = make_world()
+        _, _, directory = shard_world_map(world_map, aliases)
+
+        assert list(directory) == ["basic", "basic.life", "expr", "expr.old", "over"]
+        assert "connections" not in directory["basic"]
+
+
+def expand(row):
+    return [value for value, count in zip(row[::2], row[1::2], strict=True) for _ in range(count)]
+
+
+class TestNavigationIndex:
+    """Test the realm next-hop table."""
+
+    def test_next_hops(self):
+        world_map, _ = make_world()
+        index = navigation_index(world_map)
+
+        assert index["realms"] == ["basic", "expr", "over"]
+        basic, expr, over = (expand(row) for row in index["next"])
+        assert basic == [0, 1, 1]  # over is reached through expr
+        assert expr == [0, 1, 2]
+        assert over == [1, 1, 2]
+
+    def test_unreachable(self):
+        world_map, _ = make_world()
+        world_map["realms"]["lone"] = {"name": "Lone", "sections": []}
+
+        index = navigation_index(world_map)
+
+        assert expand(index["next"][0]) == [0, 1, 1, -1]
+        assert expand(index["next"][3]) == [-1, -1, -1, 3]
+
+
+class TestWriteWorldShards:
+    """Test writing shards to disk."""
+
+    def test_write_skip_and_prune(self, tmp_path):
+        world_map, aliases = make_world()
+        (tmp_path / "realms").mkdir()
+        (tmp_path / "realms" / "gone.json").write_text("{}")
+
+        first = write_world_shards(world_map, aliases, tmp_path)
+        second = write_world_shards(world_map, aliases, tmp_path)
+
+        assert first == {"written": 3, "unchanged": 0, "removed": 1}
+        assert second == {"written": 0, "unchanged": 3, "removed": 0}
+        manifest = json.loads((tmp_path / "index.json").read_text())
+        assert manifest["realms"]["expr"]["entry"] == "expr"
+        directory = json.loads((tmp_path / "sections.json").read_text())
+        assert list(directory["stubs"]) == ["basic", "basic.life", "expr", "expr.old", "over"]
+        routes = json.loads((tmp_path / "routes.json").read_text())
+        assert routes["realms"] == ["basic", "expr", "over"]
+
+    def test_compact(self, tmp_path):
+        world_map, aliases = make_world()
+        write_world_shards(world_map, aliases, tmp_path, compact=True)
+
+        content = (tmp_path / "realms" / "expr.json").read_text()
+        assert "\n" not in content
+        shard = json.loads(content)
+        assert shard["encoding"] == "compact-1"
+        assert shard["strings"][shard["sections"][0]["stableName"]] == "expr"
+
+
+class TestEncodeCompact:
+    """Test the string table encoding."""
+
+    def test_references_use_string_table(self):
+        world_map, aliases = make_world()
+        _, shards, _ = shard_world_map(world_map, aliases)
+
+        encoded = encode_compact(shards["basic"])
+        strings = encoded["strings"]
+        basic, life = encoded["sections"]
+
+        assert strings[basic["stableName"]] == "basic"
+        assert strings[life["parent"]] == "basic"
+        assert strings[basic["connections"]["east"]] == "expr"
+        assert [[strings[n], [strings[a] for a in names]] for n, names in encoded["aliases"]] == [
+            ["basic.life", ["expr.old"]]
+        ]
+        assert strings.count("basic") == 1
+
+    def test_omits_empty_fields(self):
+        sections = {"a": {"stableName": "a", "parent": None, "children": [], "npcs": []}}
+        encoded = encode_compact({"realm": "a", "sections": sections, "aliases": {}})
+
+        assert encoded["sections"] == [{"stableName": 0}]
+        assert encoded["aliases"] == []
+        assert encoded["realm"] == "a"